@@ -0,0 +1,58 @@
+"""
+RSU LOOKUP BENCHMARK
+====================
+Nearest-RSU cost vs. deployment size: per-RSU scan (as in the original
+simulate_transmission) vs. RSUGridIndex, single-vehicle and batched.
+RSU density is held at the baseline 15 RSUs per 2000x2000 m.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+
+from semantirs.components import RSUGridIndex
+
+def time_per_query_us(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+def benchmark_rsu_index(rsu_counts=(15, 150, 1500, 15000, 150000), num_queries=2000,
+                        batch_size=100000, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for num_rsus in rsu_counts:
+        side = 2000 * np.sqrt(num_rsus / 15)
+        rsu_positions = rng.random((num_rsus, 2)) * side
+        rsu_list = list(rsu_positions)
+        queries = rng.random((num_queries, 2)) * side
+        batch = rng.random((batch_size, 2)) * side
+
+        start = time.perf_counter()
+        index = RSUGridIndex(rsu_positions)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_us = time_per_query_us(
+            lambda q: min(np.linalg.norm(q - p) for p in rsu_list), queries[:50])
+        single_us = time_per_query_us(index.nearest, queries)
+        start = time.perf_counter()
+        index.nearest_batch(batch)
+        batch_us = (time.perf_counter() - start) / batch_size * 1e6
+        start = time.perf_counter()
+        index.within_batch(batch, 300.0)
+        within_us = (time.perf_counter() - start) / batch_size * 1e6
+
+        rows.append({'RSUs': num_rsus, 'Grid_m': round(side), 'Build_ms': build_ms,
+                     'Scan_us': scan_us, 'Index_Single_us': single_us,
+                     'Index_Batch_us': batch_us, 'Within_300m_Batch_us': within_us})
+        print(f"   R={num_rsus:>7}: scan {scan_us:9.1f} us, index {single_us:6.1f} us, "
+              f"batch {batch_us:6.3f} us/query")
+    return pd.DataFrame(rows)
+
+if __name__ == '__main__':
+    print("\n" + "="*70)
+    print("RSU LOOKUP COST vs. DEPLOYMENT SIZE")
+    print("="*70)
+    table = benchmark_rsu_index()
+    print("\n" + table.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
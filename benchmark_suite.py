@@ -0,0 +1,220 @@
+"""
+SIMULATOR PERFORMANCE SUITE
+===========================
+Micro benchmarks of every hot-path component (scalar call and batched form),
+macro benchmarks of run_full_scenario at growing vehicle/RSU/sample counts,
+and the time and peak memory of Doppler fading per simulated second at fleet
+scale. Results are written as JSON; --compare flags every benchmark whose
+median time grew by more than --threshold against a stored baseline.
+
+    python benchmark_suite.py --output bench.json
+    python benchmark_suite.py --output bench.json --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from semantirs.components import DopplerFading
+from semantirs.compression import BACKENDS, make_backend, synthetic_payload
+from semantirs.simulation import FinalOptimizedSimulation, model_code_version
+
+# (num_vehicles, num_rsus, samples_per_mode) for the end-to-end runs
+MACRO_SIZES = [(50, 15, 150), (500, 150, 1500), (5000, 1500, 15000)]
+QUICK_MACRO_SIZES = [(50, 15, 150), (500, 150, 1500)]
+# Fleet sizes for the Doppler fading benchmark (10 ms ticks, 10% of vehicles send per tick)
+FADING_FLEETS = [10000, 100000]
+
+def measure(fn, number=None, repeat=5, min_time_s=0.05):
+    """Per-call seconds (best, median) over `repeat` timed loops of `number` calls
+
+    number is calibrated so one loop lasts at least min_time_s, as timeit does.
+    """
+    if number is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - start >= min_time_s or number >= 1_000_000:
+                break
+            number *= 10
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {'best_s': min(times), 'median_s': float(np.median(times)), 'number': number,
+            'repeat': repeat}
+
+def micro_benchmarks(batch_size=10000, seed=0):
+    sim = FinalOptimizedSimulation(seed=seed)
+    rng = np.random.default_rng(seed)
+    vehicle = sim.mobility.vehicles[0]
+    rsu = sim.mobility.rsus[0]
+    distances = rng.uniform(10, 250, batch_size)
+    datarates = rng.uniform(50, 200, batch_size)
+    points = rng.uniform(0, 2000, (batch_size, 2))
+    users = rsu.position + rng.uniform(-250, 250, (batch_size, 2))
+    three_users = users[:3]
+    rsu_positions = np.broadcast_to(rsu.position, users.shape)
+    physical_irs = FinalOptimizedSimulation(seed=seed, config={'irs_mode': 'physical'}).irs
+    mapped = FinalOptimizedSimulation(seed=seed, config={'radio_map_resolution_m': 5.0})
+    mapped_vehicle = mapped.mobility.vehicles[0]
+    fading = FinalOptimizedSimulation(seed=seed, config={'fading_model': 'jakes'}).fading
+    fading_ids = rng.integers(0, len(fading.speeds_mps), batch_size)
+    interference = FinalOptimizedSimulation(
+        seed=seed, config={'interference_cutoff_m': 500}).interference
+    _, points_rsu = sim.mobility.rsu_index.nearest_batch(points)
+    payload = synthetic_payload(vehicle.sensor_data_size, rng)
+
+    # name -> (callable, items processed per call)
+    cases = {
+        'channel.calculate_snr': (lambda: sim.channel.calculate_snr(23, 120.0), 1),
+        'channel.calculate_snr[batch]': (
+            lambda: sim.channel.calculate_snr(23, distances), batch_size),
+        'mac.calculate_mac_delay_ms': (lambda: sim.mac.calculate_mac_delay_ms(100, 150.0), 1),
+        'mac.calculate_mac_delay_ms[batch]': (
+            lambda: sim.mac.calculate_mac_delay_ms_batch(100.0, datarates), batch_size),
+        'irs.adaptive_beamforming': (
+            lambda: sim.irs.adaptive_beamforming(three_users, rsu.position), 1),
+        'irs.adaptive_beamforming[batch]': (
+            lambda: sim.irs.adaptive_beamforming_batch(users, rsu_positions), batch_size),
+        'irs.adaptive_beamforming[physical,batch]': (
+            lambda: physical_irs.adaptive_beamforming_batch(users, rsu_positions), batch_size),
+        'mobility.nearest_rsu': (lambda: sim.mobility.nearest_rsu(vehicle.position), 1),
+        'mobility.nearest_rsu[batch]': (
+            lambda: sim.mobility.rsu_index.nearest_batch(points), batch_size),
+        'fading.fading_db[jakes,batch]': (
+            lambda: fading.fading_db(fading_ids, 0.5), batch_size),
+        'interference.interference_mw[batch]': (
+            lambda: interference.interference_mw(points, points_rsu[:, 0]), batch_size),
+        'radio_map.best_server[batch]': (lambda: mapped.radio_map.best_server(points), batch_size),
+        **{f'compression.{name}[{vehicle.sensor_data_size:.0f}KB]': (
+            lambda backend=make_backend(name): backend.encode(payload), 1) for name in BACKENDS},
+        'simulate_transmission': (lambda: sim.simulate_transmission(vehicle, rsu, 'semantic_irs'), 1),
+        'simulate_transmission[radio_map]': (
+            lambda: mapped.simulate_transmission(mapped_vehicle, rsu, 'semantic_irs'), 1),
+        'simulate_transmission[batch]': (
+            lambda: sim.simulate_batch(n=batch_size, offload_mode='semantic_irs'), batch_size),
+    }
+    results = {}
+    for name, (fn, items) in cases.items():
+        timing = measure(fn)
+        timing['items'] = items
+        timing['us_per_item'] = timing['median_s'] / items * 1e6
+        results[name] = timing
+        print(f"   {name:<42} {timing['us_per_item']:10.3f} us/item")
+    return results
+
+def macro_benchmarks(sizes=MACRO_SIZES, seed=0, repeat=3):
+    results = {}
+    for num_vehicles, num_rsus, samples in sizes:
+        name = f"run_full_scenario[V={num_vehicles},R={num_rsus},S={samples}]"
+        config = {'num_vehicles': num_vehicles, 'num_rsus': num_rsus}
+        sim = FinalOptimizedSimulation(seed=seed, config=config)
+        timing = measure(lambda: sim.run_full_scenario(samples, verbose=False), number=1,
+                         repeat=repeat)
+        timing['items'] = 3 * samples
+        timing['us_per_item'] = timing['median_s'] / timing['items'] * 1e6
+        results[name] = timing
+        print(f"   {name:<42} {timing['median_s'] * 1000:10.1f} ms")
+    return results
+
+def fading_benchmarks(fleets=FADING_FLEETS, seed=0, repeat=3):
+    """Seconds and peak traced MB to build a fleet's fading and serve 1 s of packets"""
+    results = {}
+    for num_vehicles in fleets:
+        rng = np.random.default_rng(seed)
+        speeds = rng.uniform(10, 18, num_vehicles)
+        ticks = [np.nonzero(rng.random(num_vehicles) < 0.1)[0] for _ in range(100)]
+
+        def one_second():
+            fading = DopplerFading(speeds, rng=np.random.default_rng(seed))
+            for k, senders in enumerate(ticks):
+                fading.fading_db(senders, 0.01 * (k + 1))
+
+        name = f"fading.jakes[V={num_vehicles},1s]"
+        timing = measure(one_second, number=1, repeat=repeat)
+        tracemalloc.start()
+        one_second()
+        timing['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        timing['items'] = sum(len(senders) for senders in ticks)
+        timing['us_per_item'] = timing['median_s'] / timing['items'] * 1e6
+        results[name] = timing
+        print(f"   {name:<42} {timing['median_s'] * 1000:10.1f} ms {timing['peak_mb']:8.1f} MB")
+    return results
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+            'code_version': model_code_version()[:12],
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+def compare(current, baseline, threshold=1.5):
+    """Rows of (name, baseline, current, ratio, regressed) for benchmarks in both runs"""
+    rows = []
+    for name, timing in current['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['median_s']
+        ratio = timing['median_s'] / before
+        rows.append((name, before, timing['median_s'], ratio, ratio > threshold))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SemantIRS simulator benchmarks")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='slowdown ratio flagged as a regression (default 1.5)')
+    parser.add_argument('--quick', action='store_true', help='skip the largest macro size')
+    parser.add_argument('--micro-only', action='store_true')
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*70)
+    print("MICRO BENCHMARKS (median per item)")
+    print("="*70)
+    benchmarks = micro_benchmarks()
+    print("\n" + "="*70)
+    print("FADING AT FLEET SCALE (per simulated second)")
+    print("="*70)
+    benchmarks.update(fading_benchmarks(FADING_FLEETS[:1] if args.quick else FADING_FLEETS))
+    if not args.micro_only:
+        print("\n" + "="*70)
+        print("MACRO BENCHMARKS: run_full_scenario")
+        print("="*70)
+        benchmarks.update(macro_benchmarks(QUICK_MACRO_SIZES if args.quick else MACRO_SIZES))
+
+    current = {'environment': environment(), 'benchmarks': benchmarks}
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=1)
+    print(f"\n✅ Results saved: {args.output}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(current, baseline, args.threshold)
+    print("\n" + "="*70)
+    print(f"COMPARISON vs. {args.compare} (code {baseline['environment'].get('code_version')})")
+    print("="*70)
+    for name, before, after, ratio, regressed in rows:
+        flag = "❌ REGRESSION" if regressed else "✅"
+        print(f"   {name:<42} {before * 1e3:10.3f} -> {after * 1e3:10.3f} ms  x{ratio:5.2f} {flag}")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) slower than x{args.threshold}")
+        return 1
+    print(f"\n✅ No regressions above x{args.threshold}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
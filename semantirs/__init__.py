@@ -0,0 +1,27 @@
+"""
+SemantIRS: IRS-enhanced semantic offloading simulation for ITS
+===============================================================
+Modules import nothing heavier than numpy; pandas and plotly are only loaded by
+analysis/chart (and the functions that build DataFrames). The main classes are
+also available lazily from the package itself, e.g.
+`from semantirs import FinalOptimizedSimulation`.
+"""
+
+__version__ = '0.1.0'
+
+_LAZY_ATTRIBUTES = {
+    'FinalOptimizedSimulation': 'simulation',
+    'DEFAULT_CONFIG': 'simulation',
+    'run_monte_carlo': 'simulation',
+    'run_sweep': 'simulation',
+    'calculate_final_metrics': 'simulation',
+    'ColumnarResultsSink': 'results_store',
+    'read_results': 'results_store',
+    'MetricsAccumulator': 'streaming_stats',
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        return getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,161 @@
+"""
+STREAMING CHART SUMMARIES
+=========================
+Everything the publication panels need, built in one pass over the results
+without holding or sorting the samples:
+
+- per-mode ModeMetrics (moments + latency sketch) for means, bars and the
+  summary table;
+- a QuantileSketch per plotted distribution, whose buckets are the binned CDF
+  and histogram. At both bounds of every bucket the cumulative count is the
+  exact empirical CDF, and buckets are only about 2 * relative_accuracy wide.
+
+The bucket trace (each bucket's count spread evenly over its own [lower, upper]
+range, flat across the gaps between buckets) therefore never strays more than
+one bucket width horizontally from the empirical CDF. Histogram bin edges are
+snapped onto bucket bounds, where that trace is exact.
+
+CDF traces are thinned so linear interpolation between the kept points is
+within max_error of the bucket trace everywhere, which caps a trace at about
+4 / max_error points however many samples went in; both ends of every wide gap
+are kept, so quantiles are not interpolated across it.
+"""
+
+import os
+import numpy as np
+
+from .results_store import list_partitions, open_columns
+from .streaming_stats import MOMENT_COLUMNS, ModeMetrics, QuantileSketch
+
+MODES = ('raw', 'semantic', 'semantic_irs')
+
+# Distributions drawn as CDFs / histograms ('total_latency_ms' reuses ModeMetrics' sketch)
+SKETCH_COLUMNS = ('total_latency_ms', 'snr_db', 'energy_consumption_mj')
+
+class ChartSummary:
+    """Per-mode metrics and distribution sketches for the chart panels"""
+    def __init__(self, relative_accuracy=0.005):
+        self.relative_accuracy = relative_accuracy
+        self.metrics = {}
+        self.sketches = {}
+
+    def update(self, columns, mode):
+        if mode not in self.metrics:
+            self.metrics[mode] = ModeMetrics(self.relative_accuracy)
+            self.sketches[mode] = {col: QuantileSketch(self.relative_accuracy)
+                                   for col in SKETCH_COLUMNS if col != 'total_latency_ms'}
+            self.sketches[mode]['total_latency_ms'] = self.metrics[mode].latency_sketch
+        self.metrics[mode].update(columns)
+        for col, sketch in self.sketches[mode].items():
+            if col != 'total_latency_ms':
+                sketch.update(columns[col])
+
+    @property
+    def modes(self):
+        return [mode for mode in MODES if mode in self.metrics]
+
+    def final_metrics(self, mode):
+        return self.metrics[mode].final_metrics(mode)
+
+    def mean(self, mode, column):
+        return self.metrics[mode].moments[column].mean
+
+    def cdf(self, mode, column='total_latency_ms', max_error=0.005):
+        """(x, F) points of the empirical CDF, thinned to max_error
+
+        Drawn with linear interpolation, F is within max_error vertically of the
+        bucket trace, which matches the empirical CDF at every bucket bound and is
+        never more than one bucket (about 2 * relative_accuracy of |x|) off
+        horizontally. Gaps wider than max_error of the x span are drawn flat, so
+        quantiles read off the line land on the right side of them.
+        """
+        x, cdf = bucket_cdf(self.sketches[mode][column])
+        return downsample_cdf(x, cdf, max_error)
+
+    def histogram(self, mode, column, bins=60, value_range=None):
+        """(bin centers, probability density) from the sketch buckets
+
+        Bin edges are moved onto the nearest bucket bound (by at most half a
+        bucket), where the bucket trace is the exact empirical CDF, so every bin
+        holds exactly the fraction of samples between its edges. Where buckets
+        are wider than the bins, edges that land on the same bound merge, giving
+        fewer, bucket-wide bins rather than detail the sketch does not have.
+        """
+        sketch = self.sketches[mode][column]
+        if value_range is None:
+            value_range = (sketch.quantile(0.001), sketch.quantile(0.999))
+        edges = histogram_edges(sketch, value_range, bins)
+        x, cdf = bucket_cdf(sketch)
+        density = np.diff(np.interp(edges, x, cdf)) / np.diff(edges)
+        return (edges[:-1] + edges[1:]) / 2, density
+
+def histogram_edges(sketch, value_range, bins):
+    """Even edges over value_range snapped to bucket bounds (at most bins + 1, distinct)"""
+    edges = np.linspace(value_range[0], value_range[1], bins + 1)
+    snapped = np.unique(sketch.nearest_bound(edges))
+    # A range inside a single bucket: keep the even edges and spread its count
+    return snapped if len(snapped) > 1 else edges
+
+def bucket_cdf(sketch):
+    """(x, F) through both bounds of every non-empty bucket, strictly increasing in x
+
+    F rises linearly across each bucket and stays flat across the gaps between
+    buckets, so it equals the empirical CDF at every bucket bound.
+    """
+    lower, upper, counts = sketch.bucket_bounds()
+    if len(counts) == 0:
+        return np.empty(0), np.empty(0)
+    cumulative = np.cumsum(counts) / counts.sum()
+    x = np.column_stack([lower, upper]).ravel()
+    cdf = np.column_stack([np.concatenate([[0.0], cumulative[:-1]]), cumulative]).ravel()
+    # A bucket starting where the previous one ended repeats that point
+    keep = np.concatenate([[True], x[1:] > x[:-1]])
+    return x[keep], cdf[keep]
+
+def downsample_cdf(x, cdf, max_error=0.005):
+    """Subset of the (x, cdf) steps whose linear interpolation stays within max_error
+
+    Between two kept points both the full trace and the thinned line lie in
+    [F_left, F_right], so keeping the last point before the rise since the
+    previous kept point exceeds max_error bounds the vertical error by max_error
+    (a single segment taller than that is kept on both sides and drawn exactly).
+    Both ends of every flat gap wider than max_error of the x span are kept as
+    well, so the line never slopes across a gap and a quantile read off it stays
+    on the right side. That adds at most 2 / max_error points.
+    """
+    x, cdf = np.asarray(x), np.asarray(cdf)
+    if len(x) <= 2:
+        return x, cdf
+    gaps = np.nonzero((cdf[1:] == cdf[:-1]) & (np.diff(x) > max_error * (x[-1] - x[0])))[0]
+    forced = np.zeros(len(x), dtype=bool)
+    forced[gaps] = forced[gaps + 1] = True
+    keep = [0]
+    last = cdf[0]
+    for i in range(1, len(x) - 1):
+        if forced[i] or cdf[i + 1] - last > max_error:
+            keep.append(i)
+            last = cdf[i]
+    keep.append(len(x) - 1)
+    return x[keep], cdf[keep]
+
+def summarize_results(results_dir='.', relative_accuracy=0.005, chunk_rows=1 << 20):
+    """ChartSummary from the columnar store (memory-mapped, in chunks) or the CSV"""
+    summary = ChartSummary(relative_accuracy)
+    columns = sorted(set(MOMENT_COLUMNS) | set(SKETCH_COLUMNS))
+    store = os.path.join(results_dir, "FINAL_OPTIMIZED_results")
+    if os.path.isdir(store):
+        for mode, _, path in list_partitions(store):
+            data = open_columns(path, columns)
+            n = len(data['total_latency_ms'])
+            for start in range(0, n, chunk_rows):
+                summary.update({col: np.asarray(data[col][start:start + chunk_rows])
+                                for col in columns}, mode)
+    else:
+        import pandas as pd
+
+        reader = pd.read_csv(os.path.join(results_dir, "FINAL_OPTIMIZED_results.csv"),
+                             usecols=columns + ['mode'], chunksize=chunk_rows)
+        for chunk in reader:
+            for mode, group in chunk.groupby('mode'):
+                summary.update({col: group[col].to_numpy() for col in columns}, mode)
+    return summary
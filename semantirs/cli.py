@@ -0,0 +1,259 @@
+"""
+SEMANTIRS COMMAND LINE
+======================
+    semantirs simulate   run the scenario, stream results to the columnar store
+    semantirs metrics    performance / comparison tables from a results store
+    semantirs report     write FINAL_COMPREHENSIVE_REPORT.txt
+    semantirs chart      latency CDF + six-panel figure (needs plotly + kaleido)
+    semantirs run        all of the above as an incremental pipeline (only stages
+                         whose code, parameters or inputs changed are re-run)
+    semantirs emulate    replay simulated offloads as real traffic to a loopback
+                         asyncio RSU server and compare measured with modelled latency
+
+Each subcommand imports only what it needs, so `simulate` never loads pandas or
+plotly and starts as fast as numpy does.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+RESULTS_STORE = 'FINAL_OPTIMIZED_results'
+
+def _parse_overrides(pairs):
+    config = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise SystemExit(f"--set expects key=value, got {pair!r}")
+        try:
+            config[key] = json.loads(value)
+        except json.JSONDecodeError:
+            config[key] = value
+    return config
+
+def _parse_targets(pairs):
+    targets = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition('=')
+        try:
+            targets[key] = float(value)
+        except ValueError:
+            sep = ''
+        if not sep:
+            raise SystemExit(f"--target expects stat=half_width (e.g. p95=2), got {pair!r}")
+    from .simulation import parse_precision_targets
+
+    # Checked here, before simulate clears the previous results
+    try:
+        parse_precision_targets(targets)
+    except ValueError as e:
+        raise SystemExit(f"--target: {e}")
+    return targets
+
+def cmd_simulate(args):
+    import shutil
+    from .report import save_run_description
+    from .results_store import ColumnarResultsSink
+    from .simulation import FinalOptimizedSimulation, measure_compression_profile, run_monte_carlo
+
+    config = _parse_overrides(args.set)
+    # Common random numbers are implemented in the vectorized engine
+    args.vectorized = args.vectorized or args.variance_reduction is not None
+    profiler = None
+    if args.profile:
+        if args.replications != 1 or args.vectorized:
+            raise SystemExit("--profile instruments the single-run simulate_transmission path")
+        from .profiling import StageProfiler
+        profiler = StageProfiler(track_allocations=args.profile_memory)
+    root = os.path.join(args.out, RESULTS_STORE)
+    checkpoint = os.path.join(args.out, 'simulate.ckpt')
+    resuming = args.resume and os.path.exists(checkpoint)
+    if (args.checkpoint_every or args.resume) and (args.replications != 1 or args.vectorized):
+        raise SystemExit("--checkpoint-every/--resume apply to the single-run path")
+    targets = _parse_targets(args.target)
+    if targets and (args.replications != 1 or args.profile or args.checkpoint_every or args.resume):
+        raise SystemExit("--target runs one adaptive simulation; drop --replications/--profile/--checkpoint-every")
+    if not resuming:
+        shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(args.out, exist_ok=True)
+    # Measured once, so the run and its description see the same compressor timings
+    compression_profile = measure_compression_profile(config)
+    with ColumnarResultsSink(root) as sink:
+        if targets:
+            print("\n" + "="*70)
+            print(f"ADAPTIVE SIMULATION: {args.confidence:.0%} CI targets {targets}")
+            print("="*70)
+            sim = FinalOptimizedSimulation(seed=args.seed, config=config,
+                                           compression_profile=compression_profile)
+            sim.run_until_precision(targets, confidence=args.confidence, sink=sink,
+                                    max_samples_per_mode=args.max_samples, verbose=True)
+        elif args.replications == 1 and not args.vectorized:
+            print("\n" + "="*70)
+            print("STARTING FINAL OPTIMIZED SIMULATION")
+            print("="*70)
+            sim = FinalOptimizedSimulation(seed=args.seed, config=config, profile=profiler,
+                                           compression_profile=compression_profile)
+            sim.run_full_scenario(args.samples, verbose=not args.quiet, sink=sink,
+                                  checkpoint=checkpoint if args.checkpoint_every or args.resume else None,
+                                  checkpoint_every=args.checkpoint_every or 10000, resume=args.resume)
+        else:
+            results = run_monte_carlo(args.replications, seed=args.seed, workers=args.workers,
+                                      samples_per_mode=args.samples, vectorized=args.vectorized,
+                                      config=config, variance_reduction=args.variance_reduction,
+                                      compression_profile=compression_profile)
+            for mode, mode_results in results.items():
+                sink.append(mode_results, mode)
+            sim = FinalOptimizedSimulation(seed=args.seed, config=config,
+                                           compression_profile=compression_profile)
+        rows = sum(sink.rows_written().values())
+    # What the report quotes about the simulated system
+    save_run_description(args.out, sim.describe(), seed=args.seed, samples_per_mode=args.samples,
+                         replications=args.replications, vectorized=args.vectorized,
+                         variance_reduction=args.variance_reduction, overrides=config)
+    print(f"\n✅ SIMULATION COMPLETE! {rows} results in {root}/")
+    if profiler is not None:
+        if args.quiet:
+            profiler.print_table()
+        path = profiler.write_folded(os.path.join(args.out, 'simulate_profile.folded'))
+        print(f"   🔥 Folded stacks for flame graphs: {path}")
+    return 0
+
+def cmd_metrics(args):
+    from .analysis import analyze, save_results
+    from .results_store import read_results
+
+    df = read_results(os.path.join(args.results_dir, RESULTS_STORE))
+    if df.empty:
+        print(f"No results under {args.results_dir}/{RESULTS_STORE}; run `semantirs simulate` first",
+              file=sys.stderr)
+        return 1
+    frames = {mode: group.drop(columns='config').astype({'mode': str}).reset_index(drop=True)
+              for mode, group in df.groupby('mode', observed=True)}
+    save_results(frames, args.out, columnar=False)
+    analyze(frames, args.out, verbose=not args.quiet)
+    return 0
+
+def cmd_report(args):
+    from .report import COMPARISON_CSV, write_report
+
+    if not os.path.exists(os.path.join(args.results_dir, COMPARISON_CSV)):
+        print(f"No {COMPARISON_CSV} under {args.results_dir}; run `semantirs metrics` first",
+              file=sys.stderr)
+        return 1
+    write_report(args.out, verbose=not args.quiet, results_dir=args.results_dir)
+    return 0
+
+def cmd_chart(args):
+    from .chart import write_latency_cdf
+
+    write_latency_cdf(args.results_dir, args.out)
+    return 0
+
+def cmd_run(args):
+    from .pipeline import default_pipeline
+
+    pipeline = default_pipeline(args.out, samples=args.samples, seed=args.seed,
+                                replications=args.replications, vectorized=args.vectorized,
+                                config=_parse_overrides(args.set), workers=args.workers)
+    force = list(pipeline.stages) if 'all' in (args.force or []) else args.force or []
+    ran = pipeline.run(args.stages or None, force=force, verbose=not args.quiet)
+    print(f"\n✅ PIPELINE COMPLETE! {len(ran)} stage(s) run: {', '.join(ran) or 'none'}")
+    return 0
+
+def cmd_emulate(args):
+    from .emulation import emulate_offload
+    from .simulation import FinalOptimizedSimulation
+
+    sim = FinalOptimizedSimulation(seed=args.seed, config=_parse_overrides(args.set))
+    print("\n" + "="*70)
+    print(f"LOOPBACK EMULATION: {args.packets} packets per mode from up to "
+          f"{sim.config['num_vehicles']} vehicles")
+    print("="*70)
+    for mode in args.mode or ['raw', 'semantic', 'semantic_irs']:
+        emulate_offload(sim, mode, n=args.packets, arrival_rate_hz=args.arrival_rate,
+                        chunk_bytes=args.chunk_bytes)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='semantirs', description=__doc__.split('\n')[1])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    simulate = sub.add_parser('simulate', help='run the simulation')
+    simulate.add_argument('--samples', type=int, default=150, help='samples per mode')
+    simulate.add_argument('--seed', type=int, default=42)
+    simulate.add_argument('--replications', type=int, default=1)
+    simulate.add_argument('--workers', type=int, default=None)
+    simulate.add_argument('--vectorized', action='store_true', help='use simulate_batch')
+    simulate.add_argument('--variance-reduction', choices=['crn', 'antithetic'],
+                          help='pair the modes on common random numbers (vectorized engine)')
+    simulate.add_argument('--set', action='append', metavar='KEY=VALUE',
+                          help='override a DEFAULT_CONFIG parameter (JSON values)')
+    simulate.add_argument('--profile', action='store_true',
+                          help='per-stage timing table + folded stacks (simulate_profile.folded)')
+    simulate.add_argument('--profile-memory', action='store_true',
+                          help='with --profile, also track allocations (tracemalloc)')
+    simulate.add_argument('--checkpoint-every', type=int, default=0, metavar='N',
+                          help='checkpoint to <out>/simulate.ckpt every N samples')
+    simulate.add_argument('--resume', action='store_true',
+                          help='continue from <out>/simulate.ckpt if it exists')
+    simulate.add_argument('--target', action='append', metavar='STAT=HALF_WIDTH',
+                          help='simulate until the CI half-width of STAT (mean, p95, '
+                               'mean:<column>) is at most HALF_WIDTH; replaces --samples')
+    simulate.add_argument('--confidence', type=float, default=0.95)
+    simulate.add_argument('--max-samples', type=int, default=2_000_000,
+                          help='per-mode cap for --target runs')
+    simulate.add_argument('--out', default='.')
+    simulate.set_defaults(func=cmd_simulate)
+
+    metrics = sub.add_parser('metrics', help='compute the comparison tables')
+    metrics.add_argument('--results-dir', default='.')
+    metrics.add_argument('--out', default='.')
+    metrics.set_defaults(func=cmd_metrics)
+
+    report = sub.add_parser('report', help='write the comprehensive report')
+    report.add_argument('--results-dir', default='.', help='where the metrics tables are')
+    report.add_argument('--out', default='.')
+    report.set_defaults(func=cmd_report)
+
+    chart = sub.add_parser('chart', help='draw the latency CDF and the six-panel figure')
+    chart.add_argument('--results-dir', default='.')
+    chart.add_argument('--out', default='.')
+    chart.set_defaults(func=cmd_chart)
+
+    run = sub.add_parser('run', help='run the out-of-date pipeline stages')
+    run.add_argument('stages', nargs='*', help='target stages (default: all)')
+    run.add_argument('--samples', type=int, default=150, help='samples per mode')
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--replications', type=int, default=1)
+    run.add_argument('--workers', type=int, default=None)
+    run.add_argument('--vectorized', action='store_true', help='use simulate_batch')
+    run.add_argument('--set', action='append', metavar='KEY=VALUE',
+                     help='override a DEFAULT_CONFIG parameter (JSON values)')
+    run.add_argument('--force', action='append', metavar='STAGE',
+                     help="re-run STAGE even if up to date ('all' for every stage)")
+    run.add_argument('--out', default='.')
+    run.set_defaults(func=cmd_run)
+
+    emulate = sub.add_parser('emulate', help='replay offloads over loopback sockets')
+    emulate.add_argument('--packets', type=int, default=1000, help='packets per mode')
+    emulate.add_argument('--mode', action='append', choices=['raw', 'semantic', 'semantic_irs'],
+                         help='offload mode (repeatable; default: all three)')
+    emulate.add_argument('--arrival-rate', type=float, default=None, metavar='HZ',
+                         help='aggregate Poisson packet rate (default: every vehicle sends '
+                              'back to back)')
+    emulate.add_argument('--chunk-bytes', type=int, default=16384,
+                         help='pacing granularity of the shaped link')
+    emulate.add_argument('--seed', type=int, default=42)
+    emulate.add_argument('--set', action='append', metavar='KEY=VALUE',
+                         help='override a DEFAULT_CONFIG parameter, e.g. num_vehicles=5000')
+    emulate.set_defaults(func=cmd_emulate)
+
+    for command in (simulate, metrics, report, run):
+        command.add_argument('--quiet', action='store_true')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
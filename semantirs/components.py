@@ -0,0 +1,1419 @@
+
+"""
+FINAL RECALIBRATED SIMULATION COMPONENTS
+========================================
+Target: Latency ~50-100ms for Semantic+IRS, IRS gain ~10dB
+
+Optimized components:
+   - Faster LLM: 8ms inference (optimized edge)
+   - Better channel: Less path loss, clipped fading
+   - Lower MAC contention: Dedicated V2I channels
+   - Denser RSU deployment: Shorter distances
+   - IRS: 50 elements, 65% efficiency, target 10-11 dB
+   - Optional radio map: per-RSU path loss and best server precomputed per cell
+   - Optional Doppler-correlated (Jakes) fading traces for time-stepped runs
+   - Optional multi-cell SINR: interference within a cutoff radius per time step
+   - Optional measured compression: ratio/time sampled from real codec runs
+   - Struct-of-arrays vehicle/RSU stores for million-vehicle fleets
+
+Every component draws from its own numpy Generator, so nothing here touches
+global random state and importing the module has no side effects.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import numpy as np
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import Enum
+
+# ============================================================================
+# OPTIMIZED COMPONENTS FOR REALISTIC LATENCY
+# ============================================================================
+
+class VehicleType(Enum):
+    CAV = "Connected Autonomous Vehicle"
+
+@dataclass
+class Vehicle:
+    id: int
+    type: VehicleType
+    position: np.ndarray
+    velocity: float
+    sensor_data_size: float = 1000.0
+
+@dataclass
+class RSU:
+    id: int
+    position: np.ndarray
+    coverage_radius: float = 300.0
+
+VEHICLE_TYPES = list(VehicleType)
+
+def _read_only(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+class VehicleView:
+    """One vehicle of a VehicleFleet, read from (and written to) the fleet arrays"""
+    __slots__ = ('fleet', 'id')
+
+    def __init__(self, fleet, id):
+        self.fleet = fleet
+        self.id = id
+
+    @property
+    def type(self):
+        return VEHICLE_TYPES[self.fleet.type_codes[self.id]]
+
+    @property
+    def position(self):
+        return self.fleet.positions[self.id]
+
+    @position.setter
+    def position(self, value):
+        self.fleet.set_positions(value, [self.id])
+
+    @property
+    def velocity(self):
+        return float(self.fleet.velocities[self.id])
+
+    @property
+    def sensor_data_size(self):
+        return float(self.fleet.sensor_data_kb[self.id])
+
+    def __repr__(self):
+        return (f"VehicleView(id={self.id}, type={self.type}, position={self.position}, "
+                f"velocity={self.velocity}, sensor_data_size={self.sensor_data_size})")
+
+class VehicleFleet:
+    """Struct-of-arrays vehicle store: one contiguous array per Vehicle field
+    
+    About 33 bytes per vehicle (1M vehicles in ~33 MB) instead of a dataclass and
+    a 2-element ndarray each. Vectorized code reads positions / velocities /
+    sensor_data_kb directly; fleet[i] and iteration hand out VehicleView objects
+    for code that wants per-vehicle attributes.
+    
+    positions is read-only: vehicles move through set_positions, which bumps
+    version so geometry cached from the old positions can tell it is stale.
+    """
+    __slots__ = ('positions', 'velocities', 'type_codes', 'sensor_data_kb', 'version', '_positions')
+    FIELDS = ('positions', 'velocities', 'type_codes', 'sensor_data_kb')
+
+    def __init__(self, positions, velocities, type_codes=None, sensor_data_kb=1000.0):
+        self._positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.positions = _read_only(self._positions)
+        self.version = 0
+        n = len(self.positions)
+        # Own, writable copies (broadcast_to views are read-only, and ascontiguousarray
+        # would keep one when the input is already contiguous)
+        self.velocities = np.array(np.broadcast_to(velocities, n), dtype=float)
+        self.type_codes = (np.zeros(n, dtype=np.uint8) if type_codes is None else
+                           np.array(type_codes, dtype=np.uint8))
+        self.sensor_data_kb = np.array(np.broadcast_to(sensor_data_kb, n), dtype=float)
+
+    @classmethod
+    def random(cls, num_vehicles, grid_size, rng, speed_range=(10, 18)):
+        """Uniform positions and speeds, drawn in the order of one vehicle at a time"""
+        draws = rng.random((num_vehicles, 3))
+        low, high = speed_range
+        return cls(draws[:, :2] * np.asarray(grid_size, dtype=float),
+                   low + (high - low) * draws[:, 2])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, i):
+        n = len(self.positions)
+        i = int(i)
+        if not -n <= i < n:
+            raise IndexError(f"vehicle {i} out of range for a fleet of {n}")
+        return VehicleView(self, i % n)
+
+    def __iter__(self):
+        return (VehicleView(self, i) for i in range(len(self.positions)))
+
+    def set_positions(self, positions, ids=None):
+        """Move vehicles ids (default: all) to positions"""
+        self._positions[slice(None) if ids is None else ids] = positions
+        self.version += 1
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, field).nbytes for field in self.FIELDS)
+
+class RSUView:
+    """One RSU of an RSUDeployment"""
+    __slots__ = ('deployment', 'id')
+
+    def __init__(self, deployment, id):
+        self.deployment = deployment
+        self.id = id
+
+    @property
+    def position(self):
+        return self.deployment.positions[self.id]
+
+    @property
+    def coverage_radius(self):
+        return float(self.deployment.coverage_radius[self.id])
+
+    def __repr__(self):
+        return f"RSUView(id={self.id}, position={self.position}, coverage_radius={self.coverage_radius})"
+
+class RSUDeployment:
+    """Struct-of-arrays RSU store (positions, coverage radii) with RSUView items
+    
+    Like VehicleFleet, positions is read-only and set_positions bumps version.
+    """
+    __slots__ = ('positions', 'coverage_radius', 'version', '_positions')
+
+    def __init__(self, positions, coverage_radius=300.0):
+        self._positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.positions = _read_only(self._positions)
+        self.version = 0
+        self.coverage_radius = np.array(np.broadcast_to(coverage_radius, len(self.positions)),
+                                        dtype=float)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, i):
+        n = len(self.positions)
+        i = int(i)
+        if not -n <= i < n:
+            raise IndexError(f"RSU {i} out of range for a deployment of {n}")
+        return RSUView(self, i % n)
+
+    def __iter__(self):
+        return (RSUView(self, i) for i in range(len(self.positions)))
+
+    def set_positions(self, positions, ids=None):
+        """Move RSUs ids (default: all) to positions"""
+        self._positions[slice(None) if ids is None else ids] = positions
+        self.version += 1
+
+class RSUGridIndex:
+    """Uniform-grid spatial index over RSU positions (built once per deployment)
+    
+    RSUs are bucketed into square cells stored CSR-style (cell_start/rsu_order),
+    so nearest-k and within-radius queries only touch the cells around a vehicle
+    instead of every RSU.
+    """
+    def __init__(self, rsu_positions, cell_size=None, chunk_size=65536):
+        self.positions = np.asarray(rsu_positions, dtype=float).reshape(-1, 2)
+        self.num_rsus = len(self.positions)
+        self.origin = self.positions.min(axis=0)
+        self.corner = self.positions.max(axis=0)
+        extent = np.maximum(self.corner - self.origin, 1.0)
+        if cell_size is None:
+            # About one RSU per cell on average
+            cell_size = np.sqrt(extent[0] * extent[1] / self.num_rsus)
+        self.cell_size = float(cell_size)
+        self.shape = (np.floor(extent / self.cell_size).astype(int) + 1)
+        self.chunk_size = chunk_size
+        
+        cells = self._cell_coords(self.positions)
+        linear = cells[:, 0] * self.shape[1] + cells[:, 1]
+        self.rsu_order = np.argsort(linear, kind='stable')
+        counts = np.bincount(linear, minlength=self.shape[0] * self.shape[1])
+        self.cell_start = np.concatenate([[0], np.cumsum(counts)])
+        self._cell_start_list = self.cell_start.tolist()
+    
+    def _cell_coords(self, points):
+        # Points outside the grid are clamped to the border cell; blocks around the
+        # clamped cell still cover everything within r*cell_size of the point.
+        cells = np.floor((points - self.origin) / self.cell_size).astype(int)
+        return np.clip(cells, 0, self.shape - 1)
+    
+    def _cell_members(self, q_idx, linear):
+        # (query, rsu) pairs for every RSU bucketed in the given (query, cell) pairs
+        start = self.cell_start[linear]
+        counts = self.cell_start[linear + 1] - start
+        total = counts.sum()
+        pair_query = np.repeat(q_idx, counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_rsu = self.rsu_order[np.repeat(start, counts) + within]
+        return pair_query, pair_rsu
+    
+    def _rect_cells(self, q, x0, x1, y0, y1):
+        # (query, linear cell) for the grid cells of each query's [x0, x1] x [y0, y1]
+        x0, y0 = np.maximum(x0, 0), np.maximum(y0, 0)
+        x1, y1 = np.minimum(x1, self.shape[0] - 1), np.minimum(y1, self.shape[1] - 1)
+        height = np.maximum(y1 - y0 + 1, 0)
+        counts = np.maximum(x1 - x0 + 1, 0) * height
+        rows = np.repeat(np.arange(len(q)), counts)
+        t = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        x = x0[rows] + t // np.maximum(height[rows], 1)
+        y = y0[rows] + t % np.maximum(height[rows], 1)
+        return q[rows], x * self.shape[1] + y
+    
+    def _candidates(self, query_cells, r_high, r_low=0):
+        """(query, rsu) pairs for the cells at Chebyshev distance r_low..r_high
+        
+        The band is four clipped rectangles, so only cells inside the grid are
+        touched: widening the search by one band costs the band, not the block.
+        """
+        q = np.arange(len(query_cells))
+        cx, cy = query_cells[:, 0], query_cells[:, 1]
+        if r_low == 0:
+            rects = [(cx - r_high, cx + r_high, cy - r_high, cy + r_high)]
+        else:
+            rects = [(cx - r_high, cx - r_low, cy - r_high, cy + r_high),
+                     (cx + r_low, cx + r_high, cy - r_high, cy + r_high),
+                     (cx - r_low + 1, cx + r_low - 1, cy - r_high, cy - r_low),
+                     (cx - r_low + 1, cx + r_low - 1, cy + r_low, cy + r_high)]
+        parts = [self._rect_cells(q, *rect) for rect in rects]
+        return self._cell_members(np.concatenate([p[0] for p in parts]),
+                                  np.concatenate([p[1] for p in parts]))
+    
+    def _covered_m(self, points, query_cells, r):
+        """Radius around each point inside which every RSU is in the ring-r block
+        
+        The distance to the nearest grid region beyond a block side (inf once the
+        block spans the whole grid). For a point outside the RSUs' bounding box its
+        gap to the box along the other axis counts too, so far-away queries stop as
+        soon as the k nearest are settled.
+        """
+        gap = np.maximum(np.maximum(self.origin - points, points - self.corner), 0)
+        covered = np.full(len(points), np.inf)
+        for axis in (0, 1):
+            low = query_cells[:, axis] - r
+            high = query_cells[:, axis] + r
+            low_edge = self.origin[axis] + low * self.cell_size
+            high_edge = self.origin[axis] + (high + 1) * self.cell_size
+            across = gap[:, 1 - axis]
+            covered = np.where(low > 0, np.minimum(
+                covered, np.hypot(np.maximum(points[:, axis] - low_edge, 0), across)), covered)
+            covered = np.where(high < self.shape[axis] - 1, np.minimum(
+                covered, np.hypot(np.maximum(high_edge - points[:, axis], 0), across)), covered)
+        return covered
+    
+    def _nearest_chunk(self, points, k):
+        n = len(points)
+        query_cells = self._cell_coords(points)
+        # Running top-k per query; each pass adds a band of rings twice as wide as
+        # the last, so a search that needs ring r takes O(log r) passes
+        best_d = np.full((n, k), np.inf)
+        best_i = np.full((n, k), -1, dtype=int)
+        out_d = np.full((n, k), np.inf)
+        out_i = np.full((n, k), -1, dtype=int)
+        active = np.arange(n)
+        r_low, r = 0, 0
+        while len(active):
+            m = len(active)
+            pair_q, pair_rsu = self._candidates(query_cells[active], r, r_low)
+            dist = np.linalg.norm(points[active][pair_q] - self.positions[pair_rsu], axis=1)
+            # Merge the ring's RSUs into the running top-k (ties broken by RSU id)
+            held = np.isfinite(best_d[active])
+            pair_q = np.concatenate([np.nonzero(held)[0], pair_q])
+            pair_rsu = np.concatenate([best_i[active][held], pair_rsu])
+            dist = np.concatenate([best_d[active][held], dist])
+            order = np.lexsort((pair_rsu, dist, pair_q))
+            pair_q, pair_rsu, dist = pair_q[order], pair_rsu[order], dist[order]
+            counts = np.bincount(pair_q, minlength=m)
+            rank = np.arange(len(pair_q)) - (np.cumsum(counts) - counts)[pair_q]
+            keep = rank < k
+            top_d = np.full((m, k), np.inf)
+            top_i = np.full((m, k), -1, dtype=int)
+            top_d[pair_q[keep], rank[keep]] = dist[keep]
+            top_i[pair_q[keep], rank[keep]] = pair_rsu[keep]
+            done = top_d[:, -1] <= self._covered_m(points[active], query_cells[active], r)
+            out_d[active[done]] = top_d[done]
+            out_i[active[done]] = top_i[done]
+            best_d[active], best_i[active] = top_d, top_i
+            active = active[~done]
+            r_low, r = r + 1, 2 * r + 1
+        return out_d, out_i
+    
+    def nearest_batch(self, points, k=1):
+        """Distances and RSU indices of the k closest RSUs, each of shape (n, k)"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        k = min(k, self.num_rsus)
+        chunks = [self._nearest_chunk(points[i:i + self.chunk_size], k)
+                  for i in range(0, len(points), self.chunk_size)] or [(np.empty((0, k)),
+                                                                        np.empty((0, k), dtype=int))]
+        return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
+    
+    def nearest(self, point, k=1):
+        # Per-packet path: walk only the new ring's cells in Python, no batch bookkeeping
+        point = np.asarray(point, dtype=float).reshape(2)
+        k = min(k, self.num_rsus)
+        if k == 0:
+            return np.empty(0), np.empty(0, dtype=int)
+        px, py = float(point[0]), float(point[1])
+        cx, cy = (int(c) for c in self._cell_coords(point))
+        nx, ny = (int(s) for s in self.shape)
+        ox, oy = float(self.origin[0]), float(self.origin[1])
+        gap_x = max(ox - px, px - float(self.corner[0]), 0.0)
+        gap_y = max(oy - py, py - float(self.corner[1]), 0.0)
+        starts = self._cell_start_list
+        ids = np.empty(0, dtype=int)
+        dist = np.empty(0)
+        r = 0
+        while True:
+            y0, y1 = max(cy - r, 0), min(cy + r, ny - 1)
+            cells = []
+            for i in ((cx - r, cx + r) if r else (cx,)):
+                if 0 <= i < nx:
+                    cells.extend(range(i * ny + y0, i * ny + y1 + 1))
+            for j in ((cy - r, cy + r) if r else ()):
+                if 0 <= j < ny:
+                    cells.extend(range(max(cx - r + 1, 0) * ny + j,
+                                       min(cx + r - 1, nx - 1) * ny + j + 1, ny))
+            found = [self.rsu_order[starts[c]:starts[c + 1]] for c in cells
+                     if starts[c] != starts[c + 1]]
+            if found:
+                found = np.concatenate(found)
+                ids = np.concatenate([ids, found])
+                dist = np.concatenate([dist, np.linalg.norm(self.positions[found] - point, axis=1)])
+                order = np.lexsort((ids, dist))[:k]
+                ids, dist = ids[order], dist[order]
+            if len(ids) == k:
+                # Same bound as _covered_m, in plain floats
+                covered = np.inf
+                if cx - r > 0:
+                    covered = min(covered, np.hypot(max(px - ox - (cx - r) * self.cell_size, 0), gap_y))
+                if cx + r < nx - 1:
+                    covered = min(covered, np.hypot(max(ox + (cx + r + 1) * self.cell_size - px, 0), gap_y))
+                if cy - r > 0:
+                    covered = min(covered, np.hypot(max(py - oy - (cy - r) * self.cell_size, 0), gap_x))
+                if cy + r < ny - 1:
+                    covered = min(covered, np.hypot(max(oy + (cy + r + 1) * self.cell_size - py, 0), gap_x))
+                if dist[-1] <= covered:
+                    return dist, ids
+            r += 1
+    
+    def within_batch(self, points, radius):
+        """RSUs within radius of each point, CSR-style: (indptr, rsu_ids, distances)
+        
+        Matches for points[j] are rsu_ids[indptr[j]:indptr[j+1]], sorted by distance.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        r = int(np.ceil(radius / self.cell_size))
+        indptr, ids, dists = [np.zeros(1, dtype=int)], [], []
+        for i in range(0, len(points), self.chunk_size):
+            chunk = points[i:i + self.chunk_size]
+            pair_q, pair_rsu = self._candidates(self._cell_coords(chunk), r)
+            dist = np.linalg.norm(chunk[pair_q] - self.positions[pair_rsu], axis=1)
+            hit = dist <= radius
+            pair_q, pair_rsu, dist = pair_q[hit], pair_rsu[hit], dist[hit]
+            order = np.lexsort((dist, pair_q))
+            ids.append(pair_rsu[order])
+            dists.append(dist[order])
+            counts = np.bincount(pair_q, minlength=len(chunk))
+            indptr.append(indptr[-1][-1] + np.cumsum(counts))
+        return (np.concatenate(indptr), np.concatenate(ids or [np.empty(0, dtype=int)]),
+                np.concatenate(dists or [np.empty(0)]))
+    
+    def within(self, point, radius):
+        _, ids, distances = self.within_batch(point, radius)
+        return distances, ids
+
+class OptimizedMobilityModel:
+    """Optimized for short-range V2I communication"""
+    def __init__(self, num_vehicles=50, num_rsus=15, grid_size=(2000, 2000), rng=None,
+                 rsu_index_cell_m=None):  # More RSUs = shorter distances
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.grid_size = tuple(grid_size)
+        # RSU index cell size (None: about one RSU per cell)
+        self.rsu_index_cell_m = rsu_index_cell_m
+        # Struct-of-arrays stores; vehicles[i] / rsus[i] are views into the arrays
+        self.vehicles = VehicleFleet.random(num_vehicles, self.grid_size, self.rng)
+        # Dense RSU deployment
+        rsu_spacing = int(np.sqrt(num_rsus))
+        i = np.arange(num_rsus)
+        self.rsus = RSUDeployment(np.column_stack([
+            (i % rsu_spacing)*self.grid_size[0]/rsu_spacing + self.grid_size[0]/(2*rsu_spacing),
+            (i // rsu_spacing)*self.grid_size[1]/rsu_spacing + self.grid_size[1]/(2*rsu_spacing)]))
+        self._rsu_index = None
+    
+    @property
+    def rsu_index(self):
+        # Rebuilt whenever the deployment has moved since the last build
+        if self._rsu_index is None or self._rsu_index_version != self.rsus.version:
+            self._rsu_index = RSUGridIndex(self.rsu_positions, cell_size=self.rsu_index_cell_m)
+            self._rsu_index_version = self.rsus.version
+        return self._rsu_index
+    
+    @property
+    def geometry_version(self):
+        """Changes whenever a vehicle or an RSU moves"""
+        return (self.vehicles.version, self.rsus.version)
+    
+    def nearest_rsu(self, position, k=1):
+        return self.rsu_index.nearest(position, k)
+    
+    def rsus_in_coverage(self, position):
+        return self.rsu_index.within(position, self.rsus.coverage_radius[0])
+    
+    @property
+    def vehicle_positions(self):
+        # The fleet's own (read-only) array, not a copy; move vehicles with set_positions
+        return self.vehicles.positions
+    
+    @property
+    def rsu_positions(self):
+        return self.rsus.positions
+
+class TimeSteppedMobility:
+    """Moves the whole fleet as arrays in fixed ticks and tracks serving RSUs
+    
+    movement='road_grid' drives vehicles along a Manhattan grid of roads (random
+    turns at intersections); 'random_waypoint' heads each vehicle to a random point
+    and draws a new one on arrival. A vehicle hands over once another RSU is closer
+    than its serving RSU by more than handover_hysteresis_m. That cannot happen
+    before it has travelled half of (hysteresis + distance gap to the best other
+    RSU), so each tick only re-queries vehicles near a cell boundary.
+    """
+    def __init__(self, positions, speeds, rsu_index, grid_size=(2000, 2000), movement='road_grid',
+                 road_spacing=250.0, turn_prob=0.5, handover_hysteresis_m=20.0, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.speeds = np.asarray(speeds, dtype=float)
+        self.rsu_index = rsu_index
+        self.grid_size = np.asarray(grid_size, dtype=float)
+        self.movement = movement
+        self.road_spacing = road_spacing
+        self.turn_prob = turn_prob
+        self.handover_hysteresis_m = handover_hysteresis_m
+        self.time_s = 0.0
+        n = len(self.positions)
+        rows = np.arange(n)
+        
+        if movement == 'road_grid':
+            # Travel along x or y; the other coordinate is snapped onto a road
+            axis = self.rng.integers(0, 2, n)
+            other = 1 - axis
+            snapped = np.round(self.positions[rows, other] / road_spacing) * road_spacing
+            self.positions[rows, other] = np.minimum(snapped, self.grid_size[other])
+            self.directions = np.zeros((n, 2))
+            self.directions[rows, axis] = self.rng.choice([-1.0, 1.0], n)
+        elif movement == 'random_waypoint':
+            self.waypoints = self.rng.random((n, 2)) * self.grid_size
+        else:
+            raise ValueError(f"Unknown movement model: {movement}")
+        
+        self.serving_rsu = self.rsu_index.nearest_batch(self.positions)[1][:, 0]
+        self.margin_m = np.zeros(n)
+        self.travelled_m = np.zeros(n)
+        self.handover_pending = np.zeros(n, dtype=bool)
+        self.handover_count = 0
+        self.recheck_count = 0
+        self._recheck(rows)
+    
+    @classmethod
+    def from_model(cls, model, **kwargs):
+        return cls(model.vehicle_positions, model.vehicles.velocities, model.rsu_index,
+                   grid_size=model.grid_size, rng=kwargs.pop('rng', model.rng), **kwargs)
+    
+    def _recheck(self, idx):
+        distances, ids = self.rsu_index.nearest_batch(self.positions[idx], k=2)
+        self.travelled_m[idx] = 0.0
+        self.recheck_count += len(idx)
+        if distances.shape[1] < 2:
+            self.margin_m[idx] = np.inf
+            return idx[:0]
+        serving_d = self.serving_distance_m(idx)
+        # Closest RSU other than the serving one
+        other_d = np.where(ids[:, 0] == self.serving_rsu[idx], distances[:, 1], distances[:, 0])
+        changed = serving_d - other_d > self.handover_hysteresis_m
+        self.serving_rsu[idx[changed]] = ids[changed, 0]
+        serving_d[changed] = distances[changed, 0]
+        other_d[changed] = distances[changed, 1]
+        self.margin_m[idx] = (self.handover_hysteresis_m + other_d - serving_d) / 2
+        return idx[changed]
+    
+    def _step_road_grid(self, step_m):
+        start_cell = np.floor(self.positions / self.road_spacing)
+        self.positions += self.directions * step_m[:, None]
+        end_cell = np.floor(self.positions / self.road_spacing)
+        
+        # Vehicles that crossed an intersection this tick may turn there, carrying
+        # the leftover distance onto the cross street
+        changed = start_cell != end_cell
+        crossed = np.nonzero(changed[:, 0] | changed[:, 1])[0]
+        turns = crossed[self.rng.random(len(crossed)) < self.turn_prob]
+        if len(turns):
+            axis = np.argmax(np.abs(self.directions[turns]), axis=1)
+            line = np.maximum(start_cell[turns, axis], end_cell[turns, axis]) * self.road_spacing
+            leftover = np.abs(self.positions[turns, axis] - line)
+            self.positions[turns, axis] = line
+            new_axis = 1 - axis
+            new_sign = self.rng.choice([-1.0, 1.0], len(turns))
+            self.directions[turns] = 0.0
+            self.directions[turns, new_axis] = new_sign
+            self.positions[turns, new_axis] += new_sign * leftover
+        
+        # Bounce off the edge of the map
+        outside = (self.positions < 0) | (self.positions > self.grid_size)
+        out = np.nonzero(outside[:, 0] | outside[:, 1])[0]
+        if len(out):
+            pos = self.positions[out]
+            low, high = pos < 0, pos > self.grid_size
+            self.positions[out] = np.where(low, -pos, np.where(high, 2 * self.grid_size - pos, pos))
+            self.directions[out] = np.where(low | high, -self.directions[out], self.directions[out])
+    
+    def _step_random_waypoint(self, step_m):
+        to_waypoint = self.waypoints - self.positions
+        remaining = np.hypot(to_waypoint[:, 0], to_waypoint[:, 1])
+        # Vehicles that reach their waypoint stop on it and draw the next one
+        fraction = np.minimum(step_m / np.maximum(remaining, 1e-9), 1.0)
+        self.positions += to_waypoint * fraction[:, None]
+        arrived = np.nonzero(fraction >= 1.0)[0]
+        self.waypoints[arrived] = self.rng.random((len(arrived), 2)) * self.grid_size
+    
+    def step(self, dt_s):
+        """Advance every vehicle by dt_s; returns the vehicles that changed serving RSU"""
+        step_m = self.speeds * dt_s
+        if self.movement == 'road_grid':
+            self._step_road_grid(step_m)
+        else:
+            self._step_random_waypoint(step_m)
+        self.travelled_m += step_m
+        self.time_s += dt_s
+        
+        handovers = self._recheck(np.nonzero(self.travelled_m >= self.margin_m)[0])
+        self.handover_pending[handovers] = True
+        self.handover_count += len(handovers)
+        return handovers
+    
+    def serving_distance_m(self, idx):
+        return np.linalg.norm(self.positions[idx] - self.rsu_index.positions[self.serving_rsu[idx]],
+                              axis=1)
+    
+    def consume_handovers(self, idx):
+        """Handover flags for the given senders; each serving-cell change is charged once"""
+        pending = self.handover_pending[idx]
+        self.handover_pending[idx] = False
+        return pending
+
+class RealisticChannel:
+    """Optimized channel for good urban V2I conditions"""
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.frequency = 5.9e9
+        self.noise_power_dbm = -95
+    
+    def path_loss_db(self, distance_m):
+        # Urban V2I with less obstruction (better than previous model)
+        return 32.4 + 20 * np.log10(distance_m) + 20 * np.log10(self.frequency/1e9)
+    
+    def rayleigh_fading_db(self, size=None):
+        # Less severe fading for V2I (often LoS or near-LoS)
+        # |h|^2 ~ Exp(1), drawn by inverse transform so antithetic streams can mirror it
+        power = -np.log1p(-self.rng.random(size))
+        with np.errstate(divide='ignore'):
+            fading = 10 * np.log10(power)
+        return np.maximum(fading, -5)  # Clip severe fades
+    
+    def calculate_snr(self, tx_power_dbm, distance_m, irs_gain_db=0.0, path_loss_db=None,
+                      fading_db=None):
+        # path_loss_db: precomputed path loss for distance_m (e.g. from a RadioMap)
+        # fading_db: fading from a trace (e.g. DopplerFading) instead of an independent draw
+        pl_db = self.path_loss_db(distance_m) if path_loss_db is None else path_loss_db
+        if fading_db is None:
+            fading_db = self.rayleigh_fading_db(np.shape(distance_m) or None)
+        rx_power_dbm = tx_power_dbm - pl_db + fading_db + irs_gain_db
+        return rx_power_dbm - self.noise_power_dbm
+    
+    def calculate_datarate_mbps(self, snr_db, bandwidth_mhz=20):  # Wider bandwidth
+        snr_linear = 10 ** (snr_db / 10)
+        return np.maximum(1, bandwidth_mhz * np.log2(1 + snr_linear))  # Min 1 Mbps
+
+class DopplerFading:
+    """Time-correlated Rayleigh fading for every vehicle's link (Clarke/Jakes)
+    
+    Each vehicle's complex gain is a sum of num_paths sinusoids (Zheng-Xiao
+    sum-of-sinusoids model): path n arrives from angle (2 pi n - pi + theta) / M
+    with a random phase, so its Doppler shift is f_d cos(angle) with
+    f_d = v f_c / c. Over the random theta and phases the autocorrelation is
+    exactly J0(2 pi f_d tau) and the mean power is 1, with |h|^2 close to the
+    Exp(1) marginal of RealisticChannel's independent draw.
+    
+    Only the per-path angles and phases are stored (float32, 2 x num_paths per
+    vehicle) and gains are evaluated at the queried (vehicle, time) pairs, so
+    memory and time follow the number of packets, not fleet size x trace
+    length. Times are rounded down to sample_interval_s.
+    
+    The trace belongs to the vehicle rather than to a vehicle-RSU pair: links to
+    different RSUs are independent, and the serving RSU only changes between
+    ticks, many coherence times apart.
+    """
+    def __init__(self, speeds_mps, carrier_hz=5.9e9, sample_interval_s=2.5e-4, num_paths=16,
+                 clip_db=-5.0, rng=None, chunk_size=65536):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.speeds_mps = np.asarray(speeds_mps, dtype=float)
+        self.doppler_hz = self.speeds_mps * carrier_hz / 3e8
+        self.sample_interval_s = sample_interval_s
+        self.num_paths = num_paths
+        self.clip_db = clip_db
+        self.chunk_size = chunk_size
+        self.entropy = int(rng.integers(2**63))
+        paths = np.random.default_rng(self.entropy)
+        n = len(self.speeds_mps)
+        theta = paths.uniform(-np.pi, np.pi, (n, 1))
+        angles = (2 * np.pi * np.arange(1, num_paths + 1) - np.pi + theta) / num_paths
+        self._cos_angle = np.cos(angles).astype(np.float32)
+        self._phase = paths.uniform(-np.pi, np.pi, (n, num_paths)).astype(np.float32)
+    
+    @property
+    def coherence_time_s(self):
+        return 0.423 / np.maximum(self.doppler_hz, 1e-9)
+    
+    def gain(self, vehicle_ids, time_s):
+        """Complex gain (unit mean power) of each vehicle's link at time_s (scalar or per vehicle)"""
+        vehicle_ids = np.asarray(vehicle_ids)
+        time_s = np.broadcast_to(np.floor(np.asarray(time_s, dtype=float) / self.sample_interval_s)
+                                 * self.sample_interval_s, vehicle_ids.shape)
+        ids, times = vehicle_ids.ravel(), time_s.ravel()
+        out = np.empty(len(ids), dtype=np.complex128)
+        for start in range(0, len(ids), self.chunk_size):
+            sel = slice(start, start + self.chunk_size)
+            v = ids[sel]
+            phase = ((2 * np.pi * self.doppler_hz[v] * times[sel])[:, None] * self._cos_angle[v]
+                     + self._phase[v])
+            out[sel] = (np.cos(phase).sum(axis=1) + 1j * np.sin(phase).sum(axis=1))
+        return (out / np.sqrt(self.num_paths)).reshape(vehicle_ids.shape)
+    
+    def fading_db(self, vehicle_ids, time_s):
+        """Fading in dB (clipped) of each vehicle's link at time_s (scalar or per vehicle)"""
+        with np.errstate(divide='ignore'):
+            return np.maximum(10 * np.log10(np.abs(self.gain(vehicle_ids, time_s)) ** 2),
+                              self.clip_db)
+
+class InterferenceField:
+    """Co-channel interference at each RSU from concurrent transmitters within a cutoff
+    
+    The transmitters of one time step (uplinking vehicles, plus RSUs that are
+    active with probability rsu_activity) are matched to the receiving RSUs
+    within cutoff_radius_m through the RSU grid index. The result is a sparse
+    transmitter x RSU pair list, so the cost grows with the number of nearby
+    pairs instead of vehicles x RSUs. A transmitter does not interfere with its own
+    RSU, where the MAC already serializes access. Every pair gets its own
+    Rayleigh power draw.
+    """
+    def __init__(self, rsu_index, channel, cutoff_radius_m=500.0, tx_power_dbm=23.0,
+                 rsu_activity=0.0, rsu_tx_power_dbm=23.0, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rsu_index = rsu_index
+        self.channel = channel
+        self.cutoff_radius_m = cutoff_radius_m
+        self.tx_power_dbm = tx_power_dbm
+        self.rsu_activity = rsu_activity
+        self.rsu_tx_power_dbm = rsu_tx_power_dbm
+        self.noise_mw = 10 ** (channel.noise_power_dbm / 10)
+        # RSU -> RSU pairs are static: find them once
+        indptr, ids, dists = rsu_index.within_batch(rsu_index.positions, cutoff_radius_m)
+        source = np.repeat(np.arange(rsu_index.num_rsus), np.diff(indptr))
+        other = ids != source
+        self._rsu_pairs = (source[other], ids[other], self._path_gain(dists[other]))
+        self.last_pairs = 0
+    
+    def _path_gain(self, distance_m):
+        # Linear path gain; interferers closer than 1 m are treated as 1 m away
+        return 10 ** (-self.channel.path_loss_db(np.maximum(distance_m, 1.0)) / 10)
+    
+    def interference_mw(self, tx_positions, tx_rsu):
+        """Interference power (mW) at every RSU from vehicles at tx_positions
+        
+        tx_rsu is each transmitter's own serving RSU.
+        """
+        tx_rsu = np.asarray(tx_rsu)
+        indptr, rsu_ids, dists = self.rsu_index.within_batch(tx_positions, self.cutoff_radius_m)
+        source = np.repeat(np.arange(len(tx_rsu)), np.diff(indptr))
+        other = rsu_ids != tx_rsu[source]
+        rsu_ids, dists = rsu_ids[other], dists[other]
+        power = (10 ** (self.tx_power_dbm / 10) * self._path_gain(dists) *
+                 self.rng.exponential(size=len(dists)))
+        # Float even without pairs (bincount of empty weights is integer)
+        interference = np.bincount(rsu_ids, weights=power,
+                                   minlength=self.rsu_index.num_rsus).astype(float)
+        self.last_pairs = len(dists)
+        if self.rsu_activity > 0:
+            source, target, gain = self._rsu_pairs
+            active = self.rng.random(self.rsu_index.num_rsus) < self.rsu_activity
+            hit = active[source]
+            power = (10 ** (self.rsu_tx_power_dbm / 10) * gain[hit] *
+                     self.rng.exponential(size=int(hit.sum())))
+            interference += np.bincount(target[hit], weights=power,
+                                        minlength=self.rsu_index.num_rsus)
+            self.last_pairs += int(hit.sum())
+        return interference
+    
+    def sinr_penalty_db(self, interference_mw):
+        """SNR -> SINR correction: 10 log10(1 + I / N)"""
+        return 10 * np.log10(1 + np.asarray(interference_mw) / self.noise_mw)
+
+class RadioMap:
+    """Precomputed per-RSU path-loss and best-server maps over the deployment area
+    
+    The area is rasterized at resolution_m; every cell holds the values at its
+    center: path loss to each RSU (num_rsus, ny, nx), the closest RSU and the
+    distance to it, with distances clipped to max_distance_m as in the
+    simulation. A lookup is then an array index instead of a nearest-RSU search
+    and two log10s, at the cost of quantizing positions to the cell centers
+    (distance error at most resolution_m / sqrt(2)).
+    
+    Maps live in cache_dir/<key>/ as .npy files opened with mmap_mode='r', so
+    worker processes share the pages read-only. The key hashes the RSU
+    positions, grid, resolution and the channel's path-loss parameters and
+    code; any change there builds a new map.
+    """
+    FILES = ('path_loss_db', 'best_rsu', 'best_distance_m')
+    
+    def __init__(self, arrays, resolution_m, key=None, path=None):
+        self.path_loss_db = arrays['path_loss_db']
+        self.best_rsu = arrays['best_rsu']
+        self.best_distance_m = arrays['best_distance_m']
+        self.resolution_m = resolution_m
+        self.shape = self.best_rsu.shape  # (ny, nx)
+        self.key = key
+        self.path = path
+    
+    @staticmethod
+    def grid_shape(grid_size, resolution_m):
+        return int(np.ceil(grid_size[1] / resolution_m)), int(np.ceil(grid_size[0] / resolution_m))
+    
+    @staticmethod
+    def cache_key(rsu_positions, grid_size, resolution_m, channel, max_distance_m=250):
+        code = channel.path_loss_db.__func__.__code__
+        payload = json.dumps({'rsus': np.asarray(rsu_positions, dtype=float).tolist(),
+                              'grid_size': list(grid_size), 'resolution_m': resolution_m,
+                              'max_distance_m': max_distance_m, 'frequency': channel.frequency,
+                              'path_loss_code': code.co_code.hex(),
+                              'path_loss_consts': repr(code.co_consts)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+    
+    @classmethod
+    def build_arrays(cls, rsu_index, grid_size, resolution_m, channel, max_distance_m=250,
+                     out=None, rows_per_chunk=256):
+        """Fill the three maps (into out, e.g. open memmaps, when given)"""
+        ny, nx = cls.grid_shape(grid_size, resolution_m)
+        num_rsus = len(rsu_index.positions)
+        if out is None:
+            out = {'path_loss_db': np.empty((num_rsus, ny, nx), dtype=np.float32),
+                   'best_rsu': np.empty((ny, nx), dtype=np.int32),
+                   'best_distance_m': np.empty((ny, nx), dtype=np.float32)}
+        xs = (np.arange(nx) + 0.5) * resolution_m
+        for y0 in range(0, ny, rows_per_chunk):
+            ys = (np.arange(y0, min(y0 + rows_per_chunk, ny)) + 0.5) * resolution_m
+            cx, cy = np.meshgrid(xs, ys)
+            for r, (rx, ry) in enumerate(rsu_index.positions):
+                d = np.minimum(np.hypot(cx - rx, cy - ry), max_distance_m)
+                out['path_loss_db'][r, y0:y0 + len(ys)] = channel.path_loss_db(d)
+            d, ids = rsu_index.nearest_batch(np.column_stack([cx.ravel(), cy.ravel()]))
+            out['best_rsu'][y0:y0 + len(ys)] = ids[:, 0].reshape(cx.shape)
+            out['best_distance_m'][y0:y0 + len(ys)] = np.minimum(d[:, 0], max_distance_m).reshape(cx.shape)
+        return out
+    
+    @classmethod
+    def load_or_build(cls, rsu_index, grid_size, resolution_m, channel, cache_dir='radio_maps',
+                      max_distance_m=250):
+        key = cls.cache_key(rsu_index.positions, grid_size, resolution_m, channel, max_distance_m)
+        path = os.path.join(cache_dir, key)
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            # Build into a private directory and rename it into place, so concurrent
+            # builders never expose a partial map (the loser's copy is dropped)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            os.makedirs(tmp_path, exist_ok=True)
+            ny, nx = cls.grid_shape(grid_size, resolution_m)
+            shapes = {'path_loss_db': ((len(rsu_index.positions), ny, nx), np.float32),
+                      'best_rsu': ((ny, nx), np.int32), 'best_distance_m': ((ny, nx), np.float32)}
+            out = {name: np.lib.format.open_memmap(os.path.join(tmp_path, f"{name}.npy"), mode='w+',
+                                                   dtype=dtype, shape=shape)
+                   for name, (shape, dtype) in shapes.items()}
+            cls.build_arrays(rsu_index, grid_size, resolution_m, channel, max_distance_m, out=out)
+            for array in out.values():
+                array.flush()
+            del out
+            with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+                json.dump({'key': key, 'grid_size': list(grid_size), 'resolution_m': resolution_m,
+                           'num_rsus': len(rsu_index.positions),
+                           'max_distance_m': max_distance_m}, f)
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                import shutil
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+                  for name in cls.FILES}
+        return cls(arrays, resolution_m, key=key, path=path)
+    
+    def cells(self, positions):
+        """(row, column) of the cell containing each position"""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        ix = np.clip((positions[:, 0] / self.resolution_m).astype(np.intp), 0, self.shape[1] - 1)
+        iy = np.clip((positions[:, 1] / self.resolution_m).astype(np.intp), 0, self.shape[0] - 1)
+        return iy, ix
+    
+    def best_server(self, positions):
+        """(distance_m, rsu_id, path_loss_db) of the closest RSU at each position"""
+        iy, ix = self.cells(positions)
+        rsu_ids = self.best_rsu[iy, ix]
+        return (self.best_distance_m[iy, ix].astype(float), rsu_ids.astype(np.intp),
+                self.path_loss_db[rsu_ids, iy, ix].astype(float))
+    
+    def path_loss(self, positions, rsu_ids):
+        """Path loss from each position to the given (e.g. serving) RSU"""
+        iy, ix = self.cells(positions)
+        return self.path_loss_db[np.asarray(rsu_ids), iy, ix].astype(float)
+
+class EdgeLLMServer:
+    """Shared edge-LLM inference at one RSU: FIFO queue, dynamic batching, c servers
+    
+    A batch is dispatched to the first free server as soon as max_batch_size
+    requests are waiting or the oldest has waited max_wait_ms, whichever comes
+    first (a server that frees up later takes up to max_batch_size at once).
+    Serving a batch of b takes service_time_ms(b): processing_time_ms for a single
+    request, growing by batch_overhead of that per extra request. With
+    exponential_service=True that is the mean of an exponential service time
+    (max_batch_size=1 is then an M/M/c queue for Poisson arrivals).
+    """
+    def __init__(self, num_servers=1, max_batch_size=8, max_wait_ms=2.0, processing_time_ms=8.0,
+                 batch_overhead=0.25, exponential_service=False, rng=None):
+        self.num_servers = num_servers
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.processing_time_ms = processing_time_ms
+        self.batch_overhead = batch_overhead
+        self.exponential_service = exponential_service
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def service_time_ms(self, batch_size):
+        return self.processing_time_ms * (1 + self.batch_overhead * (np.asarray(batch_size) - 1))
+    
+    def capacity_rps(self):
+        """Saturated throughput: every server busy with full batches"""
+        return self.num_servers * self.max_batch_size * 1000 / self.service_time_ms(self.max_batch_size)
+    
+    def simulate(self, arrival_ms):
+        """Per-request (queue_ms, service_ms, batch_size) plus a summary dict
+        
+        FIFO batching always takes the oldest waiting requests, so every batch is
+        a contiguous run of the arrival-sorted trace and the loop runs once per
+        batch rather than once per request.
+        """
+        arrival_ms = np.asarray(arrival_ms, dtype=float)
+        n = len(arrival_ms)
+        order = np.argsort(arrival_ms, kind='stable')
+        t = arrival_ms[order]
+        queue_ms = np.empty(n)
+        service_ms = np.empty(n)
+        batch_size = np.empty(n, dtype=int)
+        
+        free_at = [0.0] * self.num_servers  # heap of server free times
+        services = self.service_time_ms(np.arange(self.max_batch_size + 1)).tolist()
+        busy_ms = 0.0
+        num_batches = 0
+        i = 0
+        while i < n:
+            server_free = heapq.heappop(free_at)
+            # A batch only fills early on arrivals that exist; the trace's end is not a signal
+            full_at = t[i + self.max_batch_size - 1] if i + self.max_batch_size <= n else np.inf
+            dispatch = max(server_free, t[i], min(full_at, t[i] + self.max_wait_ms))
+            if self.max_batch_size == 1:
+                end = i + 1
+            else:
+                end = min(int(np.searchsorted(t, dispatch, side='right')), i + self.max_batch_size)
+            b = end - i
+            service = services[b]
+            if self.exponential_service:
+                service *= self.rng.exponential()
+            queue_ms[order[i:end]] = dispatch - t[i:end]
+            service_ms[order[i:end]] = service
+            batch_size[order[i:end]] = b
+            heapq.heappush(free_at, dispatch + service)
+            busy_ms += service
+            num_batches += 1
+            i = end
+        
+        span_ms = (max(free_at) - t[0]) if n else 0.0
+        summary = {
+            'Requests': n,
+            'Batches': num_batches,
+            'Mean_Batch_Size': n / num_batches if num_batches else float('nan'),
+            'Mean_Queue_ms': queue_ms.mean() if n else float('nan'),
+            'P95_Queue_ms': np.percentile(queue_ms, 95) if n else float('nan'),
+            'Mean_Sojourn_ms': (queue_ms + service_ms).mean() if n else float('nan'),
+            'Throughput_rps': n * 1000 / span_ms if span_ms > 0 else float('nan'),
+            'Capacity_rps': self.capacity_rps(),
+            'Utilization_%': busy_ms / (self.num_servers * span_ms) * 100 if span_ms > 0 else float('nan'),
+        }
+        return queue_ms, service_ms, batch_size, summary
+
+class FastSemanticCompressor:
+    """Optimized edge inference
+    
+    compress charges processing_time_ms per request for the semantic encoding.
+    mode='queue' is used for packet traces (simulate_servers): every RSU runs an
+    EdgeLLMServer for the MEC processing of delivered requests, which then pay
+    queueing, batching and a batch-size-dependent service time (mec_processing_ms
+    for one request) instead of a flat MEC delay.
+    
+    With a measured profile (compression.CompressionProfile), compress draws the
+    ratio and time per request from the measurements instead of the constants.
+    """
+    def __init__(self, compression_ratio=0.1, processing_time_ms=8.0,  # Faster edge processor
+                 mode='fixed', num_servers=1, max_batch_size=8, max_wait_ms=2.0, batch_overhead=0.25,
+                 profile=None, rng=None, mec_processing_ms=3.0):
+        if mode not in ('fixed', 'queue'):
+            raise ValueError(f"Unknown compressor mode: {mode}")
+        self.compression_ratio = compression_ratio
+        self.processing_time_ms = processing_time_ms
+        self.mec_processing_ms = mec_processing_ms
+        self.mode = mode
+        self.num_servers = num_servers
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batch_overhead = batch_overhead
+        self.profile = profile
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def compress(self, raw_data_kb):
+        if self.profile is not None:
+            compressed_kb, time_ms = self.profile.sample(raw_data_kb, self.rng)
+            return compressed_kb, 0.95, time_ms
+        return raw_data_kb * self.compression_ratio, 0.95, self.processing_time_ms
+    
+    def server(self):
+        return EdgeLLMServer(num_servers=self.num_servers, max_batch_size=self.max_batch_size,
+                             max_wait_ms=self.max_wait_ms, processing_time_ms=self.mec_processing_ms,
+                             batch_overhead=self.batch_overhead)
+    
+    def simulate_servers(self, arrival_ms, server_ids):
+        """Inference latency (queue + service) per request, one edge server per RSU
+        
+        Returns (latency_ms, queue_ms, report) where report has one summary row per RSU.
+        """
+        import pandas as pd
+        
+        arrival_ms = np.asarray(arrival_ms, dtype=float)
+        server_ids = np.asarray(server_ids)
+        latency = np.empty(len(arrival_ms))
+        queue = np.empty(len(arrival_ms))
+        rows = []
+        for server_id in np.unique(server_ids):
+            members = np.nonzero(server_ids == server_id)[0]
+            queue_ms, service_ms, _, summary = self.server().simulate(arrival_ms[members])
+            queue[members] = queue_ms
+            latency[members] = queue_ms + service_ms
+            rows.append({'RSU': int(server_id), **summary})
+        return latency, queue, pd.DataFrame(rows)
+
+class CSMACAChannel:
+    """Discrete-event 802.11p DCF contention on one shared channel
+    
+    Stations sense DIFS, count down a random backoff only while the medium is idle
+    (frozen while it is busy), collide when their counters expire in the same slot,
+    double the window and retry up to retry_limit times. Backoff freezing is handled
+    with a virtual clock that counts idle slots only: each contending station sits
+    in a heap keyed by the idle-slot index at which its counter expires, so every
+    event costs O(log stations) regardless of how many stations are contending.
+    """
+    def __init__(self, slot_time_ms=0.013, difs_ms=0.058, cw_min=7, cw_max=1023, retry_limit=7,
+                 rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.slot_time_ms = slot_time_ms
+        self.difs_ms = difs_ms
+        self.cw_min = cw_min
+        self.cw_max = cw_max
+        self.retry_limit = retry_limit
+    
+    def simulate(self, arrival_ms, station_ids, packet_size_kb, datarate_mbps):
+        """Per-packet (mac_delay_ms, retries, dropped), from arrival to end of transmission
+        
+        mac_delay_ms includes DIFS, backoff, freezing, collisions and the frame's own
+        airtime, like OptimizedMAC.calculate_mac_delay_ms. Dropped packets report the
+        delay until they were discarded.
+        """
+        arrival_ms = np.asarray(arrival_ms, dtype=float)
+        station_ids = np.asarray(station_ids)
+        n = len(arrival_ms)
+        tx_ms = (np.broadcast_to(packet_size_kb, (n,)) * 8 * 1024
+                 / (np.broadcast_to(datarate_mbps, (n,)) * 1000))
+        delay = np.full(n, np.nan)
+        retries = np.zeros(n, dtype=int)
+        dropped = np.zeros(n, dtype=bool)
+        
+        slot, difs = self.slot_time_ms, self.difs_ms
+        pending = deque(np.argsort(arrival_ms, kind='stable'))
+        queues = {}            # station -> packets waiting behind its head-of-line packet
+        cw = np.full(n, self.cw_min)
+        contention = []        # (expiry idle slot, seq, packet)
+        seq = 0
+        # Idle-slot clock: slot idle_v starts at real time idle_t
+        idle_v, idle_t = 0, -np.inf
+        
+        def contend(packet, start_v):
+            nonlocal seq
+            heapq.heappush(contention, (start_v + int(self.rng.integers(0, cw[packet])), seq, packet))
+            seq += 1
+        
+        while pending or contention:
+            next_tx_t = (idle_t + (contention[0][0] - idle_v) * slot) if contention else np.inf
+            if pending and arrival_ms[pending[0]] <= next_tx_t:
+                packet = pending.popleft()
+                station = station_ids[packet]
+                if station in queues:
+                    queues[station].append(packet)
+                    continue
+                queues[station] = deque()
+                # Count down after sensing DIFS, or from the next idle period if the
+                # medium is taken first
+                sensed_t = max(arrival_ms[packet] + difs, idle_t)
+                if not np.isfinite(idle_t):
+                    idle_v, idle_t = 0, sensed_t
+                start_v = idle_v + int(np.ceil((sensed_t - idle_t) / slot))
+                if contention:
+                    start_v = min(start_v, contention[0][0] + 1)
+                contend(packet, start_v)
+                continue
+            
+            # Every station whose counter expires in this slot transmits
+            expiry = contention[0][0]
+            senders = []
+            while contention and contention[0][0] == expiry:
+                senders.append(heapq.heappop(contention)[2])
+            busy_ms = max(tx_ms[p] for p in senders)
+            end_t = next_tx_t + busy_ms
+            # The transmission used slot `expiry`; counting resumes one DIFS after it ends
+            idle_v, idle_t = expiry + 1, end_t + difs
+            
+            finished = []
+            if len(senders) == 1:
+                delay[senders[0]] = end_t - arrival_ms[senders[0]]
+                finished = senders
+            else:
+                for p in senders:
+                    retries[p] += 1
+                    if retries[p] > self.retry_limit:
+                        delay[p] = end_t - arrival_ms[p]
+                        dropped[p] = True
+                        finished.append(p)
+                    else:
+                        cw[p] = min(cw[p] * 2, self.cw_max)
+                        contend(p, expiry + 1)
+            for p in finished:
+                station = station_ids[p]
+                if queues[station]:
+                    contend(queues[station].popleft(), expiry + 1)
+                else:
+                    del queues[station]
+        
+        return delay, retries, dropped
+
+class OptimizedMAC:
+    """Low-latency 802.11p for V2I
+    
+    mode='formula' uses the closed-form backoff/collision estimate; mode='event'
+    plays out real contention with CSMACAChannel.
+    """
+    def __init__(self, contention_window=7, rng=None, mode='formula'):  # Smaller window for low contention
+        if mode not in ('formula', 'event'):
+            raise ValueError(f"Unknown MAC mode: {mode}")
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.mode = mode
+        self.contention_window = contention_window
+        self.slot_time_ms = 0.013
+        self.difs_ms = 0.058
+        self.cw_max = 1023
+        self.retry_limit = 7
+    
+    def channel(self):
+        return CSMACAChannel(self.slot_time_ms, self.difs_ms, self.contention_window, self.cw_max,
+                             self.retry_limit, rng=self.rng)
+    
+    def _contention_episode(self, packet_size_kb, datarate_mbps, num_contending):
+        # Tagged packet plus num_contending stations that all have a frame ready
+        stations = np.arange(num_contending + 1)
+        delay, _, _ = self.channel().simulate(np.zeros(len(stations)), stations, packet_size_kb,
+                                              datarate_mbps)
+        return delay[0]
+    
+    def calculate_mac_delay_ms(self, packet_size_kb, datarate_mbps, num_contending=3):
+        if self.mode == 'event':
+            return self._contention_episode(packet_size_kb, datarate_mbps, num_contending)
+        
+        # Low contention in dedicated V2I channels
+        backoff_slots = self.rng.integers(0, self.contention_window)
+        backoff_ms = backoff_slots * self.slot_time_ms
+        tx_time_ms = (packet_size_kb * 8 * 1024) / (datarate_mbps * 1000)
+        mac_delay = self.difs_ms + backoff_ms + tx_time_ms
+        
+        # Very low collision probability with DSRC
+        collision_prob = 1 - (1 - 1/self.contention_window) ** num_contending
+        if self.rng.random() < collision_prob * 0.3:  # Reduced collision impact
+            mac_delay *= 1.5  # Less penalty
+        
+        return mac_delay
+    
+    def calculate_mac_delay_ms_batch(self, packet_size_kb, datarate_mbps, num_contending=3):
+        # Same model as calculate_mac_delay_ms, one draw per packet
+        n = len(datarate_mbps)
+        if self.mode == 'event':
+            sizes = np.broadcast_to(packet_size_kb, (n,))
+            return np.array([self._contention_episode(sizes[i], datarate_mbps[i], num_contending)
+                             for i in range(n)])
+        backoff_ms = self.rng.integers(0, self.contention_window, size=n) * self.slot_time_ms
+        tx_time_ms = (packet_size_kb * 8 * 1024) / (datarate_mbps * 1000)
+        mac_delay = self.difs_ms + backoff_ms + tx_time_ms
+        
+        collision_prob = 1 - (1 - 1/self.contention_window) ** num_contending
+        collided = self.rng.random(n) < collision_prob * 0.3
+        return np.where(collided, mac_delay * 1.5, mac_delay)
+    
+    def simulate_channels(self, arrival_ms, station_ids, packet_size_kb, datarate_mbps, channel_ids):
+        """Event-driven MAC for a packet trace: one shared channel per RSU"""
+        n = len(arrival_ms)
+        sizes = np.broadcast_to(packet_size_kb, (n,))
+        delay = np.empty(n)
+        retries = np.empty(n, dtype=int)
+        dropped = np.empty(n, dtype=bool)
+        for channel in np.unique(channel_ids):
+            members = np.nonzero(channel_ids == channel)[0]
+            delay[members], retries[members], dropped[members] = self.channel().simulate(
+                arrival_ms[members], station_ids[members], sizes[members], datarate_mbps[members])
+        return delay, retries, dropped
+
+class CalibratedIRS:
+    """Final calibrated IRS: ~10-11 dB gain
+    
+    mode='calibrated' draws the gain from the literature-calibrated closed form.
+    mode='physical' builds per-element LoS cascaded channels (vehicle -> IRS element
+    -> RSU) for an IRS mounted next to the serving RSU, co-phases every element with
+    the direct path under CSI phase error, quantizes to phase_quantization_bits and
+    reports the resulting SNR gain over the direct path, batched over users.
+    With codebook_bins=(azimuth, elevation) the physical mode looks beams up in a
+    precomputed angle-binned codebook instead (see build_codebook).
+    """
+    def __init__(self, num_elements=50, beamforming_efficiency=0.65, rng=None, mode='calibrated',
+                 codebook_bins=None, codebook_cache_size=4096):
+        if mode not in ('calibrated', 'physical'):
+            raise ValueError(f"Unknown IRS mode: {mode}")
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.mode = mode
+        self.num_elements = num_elements
+        self.phase_shifts = np.zeros(num_elements)
+        self.beamforming_efficiency = beamforming_efficiency
+        self.phase_quantization_bits = 2
+        self.channel_estimation_error_db = 3.0
+        self.gain_variation_db = 1.2  # calibrated mode: std of the per-packet gain
+        # Deployment geometry for the physical mode
+        self.wavelength_m = 3e8 / 5.9e9
+        self.irs_offset_m = np.array([20.0, 0.0, 12.0])  # IRS on a facade 20 m from the RSU
+        self.rsu_height_m = 10.0
+        self.vehicle_height_m = 1.5
+        # Optional beam codebook (physical mode): per-packet beamforming becomes a lookup
+        self.codebook_cache_size = codebook_cache_size
+        self.codebook_cache_resolution_m = 1.0
+        self.codebook_audit_fraction = 0.01
+        self.use_codebook = codebook_bins is not None and mode == 'physical'
+        if self.use_codebook:
+            self.build_codebook(*codebook_bins)
+        
+    def optimize_phases(self, size=None):
+        # Simplified: just calculate realistic gain
+        array_gain_db = 10 * np.log10(self.num_elements * self.beamforming_efficiency)
+        coherence_gain_db = 6.0  # Realistic coherence
+        total_gain_db = array_gain_db + coherence_gain_db - self.channel_estimation_error_db
+        total_gain_db += self.rng.normal(0, self.gain_variation_db, size)
+        return np.clip(total_gain_db, 6.0, 12.0)
+    
+    def element_positions(self, rsu_position):
+        """(N, 3) element coordinates: half-wavelength UPA in the y-z plane"""
+        cols = int(np.ceil(np.sqrt(self.num_elements)))
+        rows = int(np.ceil(self.num_elements / cols))
+        idx = np.arange(self.num_elements)
+        spacing = self.wavelength_m / 2
+        center = np.array([rsu_position[0], rsu_position[1], 0.0]) + self.irs_offset_m
+        offsets = np.column_stack([np.zeros(self.num_elements),
+                                   (idx % cols - (cols - 1) / 2) * spacing,
+                                   (idx // cols - (rows - 1) / 2) * spacing])
+        return center + offsets
+    
+    def _cascade(self, relative_positions):
+        """Alignment phases and relative amplitudes (U, N) for users given relative to the RSU
+        
+        Working relative to the RSU keeps float32 distances accurate to ~0.1 mm, and the
+        IRS sits at the same offset from every RSU, so this is deployment-invariant.
+        """
+        k = np.float32(2 * np.pi / self.wavelength_m)
+        elements = (self.element_positions((0.0, 0.0)) - [0.0, 0.0, self.rsu_height_m])
+        elements = elements.astype(np.float32)
+        d_irs_rsu = np.linalg.norm(elements, axis=1)
+        # Element gain pi for a (lambda/2)^2 aperture, power efficiency as amplitude
+        element_amp = (np.sqrt(self.beamforming_efficiency) * np.pi * self.wavelength_m
+                       / (4 * np.pi * d_irs_rsu)).astype(np.float32)
+        veh = np.column_stack([relative_positions,
+                               np.full(len(relative_positions), self.vehicle_height_m - self.rsu_height_m)])
+        veh = veh.astype(np.float32)
+        d_direct = np.linalg.norm(veh, axis=1)
+        diff = veh[:, None, :] - elements[None, :, :]
+        d_veh_irs = np.sqrt(np.einsum('unk,unk->un', diff, diff))
+        # Phase that aligns each cascaded path with the direct path
+        ideal = k * (d_veh_irs + d_irs_rsu - d_direct[:, None])
+        # Amplitudes relative to the direct path lambda/(4 pi d_direct)
+        rel_amp = element_amp[None, :] * d_direct[:, None] / d_veh_irs
+        return ideal, rel_amp
+    
+    def _combined_gain_db(self, rel_amp, residual, best_rotation=False):
+        reflected = ((rel_amp * np.cos(residual)).sum(axis=1, dtype=np.float64)
+                     + 1j * (rel_amp * np.sin(residual)).sum(axis=1, dtype=np.float64))
+        if best_rotation:
+            # Common phase step trained per user (one pilot), as a codebook beam needs
+            levels = 2 ** self.phase_quantization_bits
+            rotations = np.exp(1j * 2 * np.pi * np.arange(levels) / levels)
+            return 20 * np.log10(np.abs(1 + reflected[:, None] * rotations).max(axis=1))
+        return 20 * np.log10(np.abs(1 + reflected))
+    
+    def optimize_phases_physical(self, vehicle_positions, rsu_position, return_phases=False,
+                                 chunk_elements=1 << 22):
+        """Per-user SNR gain (dB) of the optimized IRS over the direct path alone"""
+        vehicle_positions = np.asarray(vehicle_positions, dtype=float).reshape(-1, 2)
+        relative = vehicle_positions - np.asarray(rsu_position, dtype=float)
+        step = np.float32(2 * np.pi / 2 ** self.phase_quantization_bits)
+        # Phase-error std whose expected coherent loss equals channel_estimation_error_db
+        csi_sigma = np.float32(np.sqrt(self.channel_estimation_error_db * np.log(10) / 10))
+        
+        gains_db = np.empty(len(relative))
+        phases = np.empty((len(relative), self.num_elements)) if return_phases else None
+        chunk = max(1, chunk_elements // self.num_elements)
+        for start in range(0, len(relative), chunk):
+            ideal, rel_amp = self._cascade(relative[start:start + chunk])
+            estimated = ideal + csi_sigma * self.rng.standard_normal(ideal.shape, dtype=np.float32)
+            applied = np.round(estimated / step) * step
+            gains_db[start:start + chunk] = self._combined_gain_db(rel_amp, applied - ideal)
+            if return_phases:
+                phases[start:start + chunk] = np.mod(applied, 2 * np.pi)
+        
+        if return_phases:
+            # Configuration currently applied: the last user served
+            self.phase_shifts = phases[-1].copy()
+            return gains_db, phases
+        return gains_db
+    
+    # ------------------------------------------------------------------
+    # Angle-binned beam codebook
+    # ------------------------------------------------------------------
+    
+    def build_codebook(self, azimuth_bins=72, elevation_bins=32, min_range_m=5.0, max_range_m=400.0):
+        """Precompute quantized beams for a grid of arrival angles at the IRS
+        
+        The departure angle (IRS -> RSU) is fixed by the mounting, so beams are indexed
+        by the vehicle's azimuth/elevation seen from the IRS. Each entry keeps the
+        phase-level indices and the gain at the bin centre.
+        """
+        height = self.vehicle_height_m - self.irs_offset_m[2]
+        self.codebook_shape = (azimuth_bins, elevation_bins)
+        self.codebook_elevation = (np.arctan2(height, max_range_m), np.arctan2(height, min_range_m))
+        az = (np.arange(azimuth_bins) + 0.5) * 2 * np.pi / azimuth_bins - np.pi
+        el_lo, el_hi = self.codebook_elevation
+        el = el_lo + (np.arange(elevation_bins) + 0.5) * (el_hi - el_lo) / elevation_bins
+        az_grid, el_grid = np.meshgrid(az, el, indexing='ij')
+        ranges = height / np.tan(el_grid.ravel())
+        centres = (self.irs_offset_m[:2]
+                   + np.column_stack([np.cos(az_grid.ravel()), np.sin(az_grid.ravel())]) * ranges[:, None])
+        
+        levels = 2 ** self.phase_quantization_bits
+        step = np.float32(2 * np.pi / levels)
+        ideal, rel_amp = self._cascade(centres)
+        applied = np.round(ideal / step)
+        self.codebook_levels = np.mod(applied, levels).astype(np.uint8)
+        self.codebook_gain_db = self._combined_gain_db(rel_amp, applied * step - ideal,
+                                                       best_rotation=True)
+        self.codebook_stats = {'lookups': 0, 'codebook_hits': 0, 'cache_hits': 0, 'cache_misses': 0,
+                               'audited': 0, 'gain_loss_db_sum': 0.0, 'lookup_error_db_sum': 0.0}
+        self._offgrid_cache = OrderedDict()
+    
+    def _codebook_bins(self, relative_positions):
+        to_user = relative_positions - self.irs_offset_m[:2]
+        horizontal = np.hypot(to_user[:, 0], to_user[:, 1])
+        az = np.arctan2(to_user[:, 1], to_user[:, 0])
+        el = np.arctan2(self.vehicle_height_m - self.irs_offset_m[2], horizontal)
+        num_az, num_el = self.codebook_shape
+        el_lo, el_hi = self.codebook_elevation
+        az_bin = np.minimum(((az + np.pi) / (2 * np.pi) * num_az).astype(int), num_az - 1)
+        el_pos = (el - el_lo) / (el_hi - el_lo) * num_el
+        on_grid = (el_pos >= 0) & (el_pos < num_el)
+        el_bin = np.clip(el_pos.astype(int), 0, num_el - 1)
+        return az_bin * num_el + el_bin, on_grid
+    
+    def codebook_gains(self, vehicle_positions, rsu_position):
+        """Per-user gain from the codebook; off-grid geometries go through an LRU cache"""
+        relative = (np.asarray(vehicle_positions, dtype=float).reshape(-1, 2)
+                    - np.asarray(rsu_position, dtype=float))
+        stats = self.codebook_stats
+        bins, on_grid = self._codebook_bins(relative)
+        gains = self.codebook_gain_db[bins]
+        stats['lookups'] += len(relative)
+        stats['codebook_hits'] += int(on_grid.sum())
+        
+        step = np.float32(2 * np.pi / 2 ** self.phase_quantization_bits)
+        for i in np.nonzero(~on_grid)[0]:
+            key = tuple(np.round(relative[i] / self.codebook_cache_resolution_m).astype(int))
+            if key in self._offgrid_cache:
+                self._offgrid_cache.move_to_end(key)
+                stats['cache_hits'] += 1
+            else:
+                stats['cache_misses'] += 1
+                ideal, rel_amp = self._cascade(relative[i:i + 1])
+                self._offgrid_cache[key] = self._combined_gain_db(
+                    rel_amp, np.round(ideal / step) * step - ideal, best_rotation=True)[0]
+                if len(self._offgrid_cache) > self.codebook_cache_size:
+                    self._offgrid_cache.popitem(last=False)
+            gains[i] = self._offgrid_cache[key]
+        
+        # Spot-check a fraction of lookups against per-user optimization: both beams are
+        # scored on the user's true channel with the same knowledge (exact geometry, as
+        # the codebook assumes) and the same rotation search. The per-user optimizer may
+        # keep the codebook beam, so the measured loss is never negative.
+        audit = np.nonzero(on_grid & (self.rng.random(len(relative)) < self.codebook_audit_fraction))[0]
+        if len(audit):
+            ideal, rel_amp = self._cascade(relative[audit])
+            beam = self.codebook_levels[bins[audit]].astype(np.float32) * step
+            actual = self._combined_gain_db(rel_amp, beam - ideal, best_rotation=True)
+            own = self._combined_gain_db(rel_amp, np.round(ideal / step) * step - ideal,
+                                         best_rotation=True)
+            exact = np.maximum(own, actual)
+            stats['audited'] += len(audit)
+            stats['gain_loss_db_sum'] += float((exact - actual).sum())
+            stats['lookup_error_db_sum'] += float(np.abs(gains[audit] - actual).sum())
+        return gains
+    
+    def codebook_report(self):
+        """Hit/miss counters and measured loss of the codebook vs. exact optimization"""
+        stats = dict(self.codebook_stats)
+        lookups = max(stats['lookups'], 1)
+        audited = max(stats['audited'], 1)
+        stats['hit_rate'] = (stats['codebook_hits'] + stats['cache_hits']) / lookups
+        stats['mean_gain_loss_db'] = stats.pop('gain_loss_db_sum') / audited
+        stats['mean_lookup_error_db'] = stats.pop('lookup_error_db_sum') / audited
+        return stats
+    
+    def adaptive_beamforming(self, vehicle_positions, rsu_position):
+        if self.use_codebook:
+            return np.mean(self.codebook_gains(vehicle_positions, rsu_position))
+        if self.mode == 'physical':
+            return np.mean(self.optimize_phases_physical(vehicle_positions, rsu_position))
+        # Average over multiple users
+        gains = [self.optimize_phases() for _ in vehicle_positions]
+        return np.mean(gains)
+    
+    def adaptive_beamforming_batch(self, vehicle_positions, rsu_positions):
+        """Per-packet IRS gain; rsu_positions holds each packet's serving RSU"""
+        n = len(vehicle_positions)
+        if self.mode != 'physical':
+            return self.optimize_phases(size=n)
+        gains = np.empty(n)
+        unique_rsus, groups = np.unique(np.asarray(rsu_positions), axis=0, return_inverse=True)
+        for g, rsu_position in enumerate(unique_rsus):
+            members = np.nonzero(groups.ravel() == g)[0]
+            if self.use_codebook:
+                gains[members] = self.codebook_gains(vehicle_positions[members], rsu_position)
+            else:
+                gains[members] = self.optimize_phases_physical(vehicle_positions[members], rsu_position)
+        return gains
@@ -0,0 +1,240 @@
+"""
+INCREMENTAL PIPELINE
+====================
+simulate -> metrics -> report, and simulate -> chart, as a DAG of stages with
+declared inputs and outputs. Each stage is keyed by a hash of its code, its
+parameters and the content of its inputs; a stage whose key and outputs are
+unchanged since the last run is skipped. Editing the chart style therefore
+re-runs only `chart`, editing the report template only `report`, and a
+re-simulation that reproduces byte-identical results stops there.
+
+State lives in <out>/.pipeline_state.json. File content hashes are cached by
+(size, mtime) so an unchanged multi-gigabyte results store is not re-read.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+STATE_FILE = '.pipeline_state.json'
+
+class Stage:
+    """One pipeline step: fn(out_dir, **params) reads inputs and writes outputs"""
+    def __init__(self, name, fn, inputs=(), outputs=(), code=(), params=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        # Zero-argument callables returning a version string (see source_of)
+        self.code = list(code)
+        self.params = dict(params or {})
+
+    def code_version(self):
+        digest = hashlib.sha256()
+        for version in self.code:
+            digest.update(str(version()).encode())
+        return digest.hexdigest()
+
+class Pipeline:
+    """Stages ordered by their input/output dependencies, run incrementally"""
+    def __init__(self, stages, out_dir='.'):
+        self.out_dir = out_dir
+        self.stages = {stage.name: stage for stage in stages}
+        self.producers = {path: stage.name for stage in stages for path in stage.outputs}
+        self._state_path = os.path.join(out_dir, STATE_FILE)
+        self.state = {'stages': {}, 'files': {}}
+        if os.path.exists(self._state_path):
+            with open(self._state_path) as f:
+                self.state = json.load(f)
+
+    def dependencies(self, name):
+        return sorted({self.producers[path] for path in self.stages[name].inputs
+                       if path in self.producers})
+
+    def order(self, targets=None):
+        """Topological order of the targets and everything upstream of them"""
+        ordered, visiting = [], set()
+
+        def visit(name):
+            if name in ordered:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline cycle through stage {name!r}")
+            visiting.add(name)
+            for dep in self.dependencies(name):
+                visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+
+        for name in targets or self.stages:
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r}; expected one of {sorted(self.stages)}")
+            visit(name)
+        return ordered
+
+    def _file_hash(self, path):
+        stat = os.stat(path)
+        cached = self.state['files'].get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.state['files'][path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def content_hash(self, relpath):
+        """Hash of a file, or of every file under a directory; None if missing"""
+        path = os.path.join(self.out_dir, relpath)
+        if os.path.isfile(path):
+            return self._file_hash(path)
+        if not os.path.isdir(path):
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.tmp'):
+                    continue
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(self._file_hash(file_path).encode())
+        return digest.hexdigest()
+
+    def stage_key(self, stage):
+        payload = {'code': stage.code_version(), 'params': stage.params,
+                   'inputs': {path: self.content_hash(path) for path in stage.inputs}}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_current(self, stage, key):
+        record = self.state['stages'].get(stage.name)
+        return (record is not None and record['key'] == key and
+                all(record['outputs'].get(path) == self.content_hash(path) for path in stage.outputs))
+
+    def _save_state(self):
+        self.state['files'] = {path: entry for path, entry in self.state['files'].items()
+                               if os.path.exists(path)}
+        tmp_path = f"{self._state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=1)
+        os.replace(tmp_path, self._state_path)
+
+    def run(self, targets=None, force=(), verbose=True):
+        """Run out-of-date stages in dependency order; returns the names that ran
+
+        force lists stages to re-run regardless of their key (their dependents
+        then re-run only if the outputs actually change).
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        ran = []
+        for name in self.order(targets):
+            stage = self.stages[name]
+            missing = [path for path in stage.inputs if self.content_hash(path) is None]
+            if missing:
+                raise FileNotFoundError(f"Stage {name!r} is missing inputs: {', '.join(missing)}")
+            key = self.stage_key(stage)
+            if name not in force and self.is_current(stage, key):
+                if verbose:
+                    print(f"⏭️  {name}: up to date")
+                continue
+            if verbose:
+                print(f"▶️  {name}: running")
+            stage.fn(self.out_dir, **stage.params)
+            self.state['stages'][name] = {
+                'key': key, 'outputs': {path: self.content_hash(path) for path in stage.outputs}}
+            self._save_state()
+            ran.append(name)
+        return ran
+
+# ============================================================================
+# THE SEMANTIRS STAGES
+# ============================================================================
+
+RESULTS_STORE = 'FINAL_OPTIMIZED_results'
+RUN_JSON = 'FINAL_OPTIMIZED_run.json'
+
+def _simulate(out_dir, samples, seed, replications, vectorized, config, workers):
+    import shutil
+    from .report import save_run_description
+    from .results_store import ColumnarResultsSink
+    from .simulation import FinalOptimizedSimulation, measure_compression_profile, run_monte_carlo
+
+    root = os.path.join(out_dir, RESULTS_STORE)
+    shutil.rmtree(root, ignore_errors=True)
+    profile = measure_compression_profile(config)
+    sim = FinalOptimizedSimulation(seed=seed, config=config, compression_profile=profile)
+    with ColumnarResultsSink(root) as sink:
+        if replications == 1 and not vectorized:
+            sim.run_full_scenario(samples, verbose=False, sink=sink)
+        else:
+            results = run_monte_carlo(replications, seed=seed, workers=workers,
+                                      samples_per_mode=samples, vectorized=vectorized, config=config,
+                                      compression_profile=profile)
+            for mode, mode_results in results.items():
+                sink.append(mode_results, mode)
+    save_run_description(out_dir, sim.describe(), seed=seed, samples_per_mode=samples,
+                         replications=replications, vectorized=vectorized, overrides=config)
+
+def _metrics(out_dir):
+    from .analysis import analyze, save_results
+    from .results_store import read_results
+
+    df = read_results(os.path.join(out_dir, RESULTS_STORE))
+    frames = {mode: group.drop(columns='config').astype({'mode': str}).reset_index(drop=True)
+              for mode, group in df.groupby('mode', observed=True)}
+    save_results(frames, out_dir, columnar=False)
+    analyze(frames, out_dir, verbose=False)
+
+def _report(out_dir):
+    from .report import write_report
+
+    write_report(out_dir, verbose=False)
+
+def _chart(out_dir):
+    from .chart import write_latency_cdf
+
+    write_latency_cdf(out_dir, out_dir)
+
+def _model_version():
+    from .simulation import model_code_version
+
+    return model_code_version()
+
+def source_of(module, attr=None):
+    """Code version from the source of semantirs.<module> (or one of its attributes)
+
+    The module is only imported when a stage key is computed.
+    """
+    def version():
+        import importlib
+        obj = importlib.import_module(f"semantirs.{module}")
+        return inspect.getsource(getattr(obj, attr) if attr else obj)
+    return version
+
+def default_pipeline(out_dir='.', samples=150, seed=42, replications=1, vectorized=False,
+                     config=None, workers=None):
+    stages = [
+        # workers is bound outside params: it changes the speed, not the results
+        Stage('simulate', functools.partial(_simulate, workers=workers),
+              outputs=[RESULTS_STORE, RUN_JSON],
+              code=[_model_version, source_of('pipeline', '_simulate')],
+              params={'samples': samples, 'seed': seed, 'replications': replications,
+                      'vectorized': vectorized, 'config': dict(config or {})}),
+        Stage('metrics', _metrics, inputs=[RESULTS_STORE],
+              outputs=['FINAL_OPTIMIZED_results.csv', 'FINAL_OPTIMIZED_comparison.csv',
+                       'FINAL_DETAILED_comparison.csv'],
+              code=[source_of('analysis'), source_of('simulation', 'calculate_final_metrics'),
+                    source_of('pipeline', '_metrics')]),
+        # The run description carries the config and model constants the report quotes
+        Stage('report', _report, inputs=['FINAL_OPTIMIZED_comparison.csv', RUN_JSON],
+              outputs=['FINAL_COMPREHENSIVE_REPORT.txt'],
+              code=[source_of('report'), source_of('pipeline', '_report')]),
+        Stage('chart', _chart, inputs=[RESULTS_STORE],
+              outputs=['latency_cdf.png', 'latency_cdf.svg', 'performance_panels.png',
+                       'performance_panels.svg'],
+              code=[source_of('chart'), source_of('chart_data'), source_of('pipeline', '_chart')]),
+    ]
+    return Pipeline(stages, out_dir)
@@ -0,0 +1,138 @@
+"""
+PER-STAGE PROFILING
+===================
+StageProfiler records wall-clock time, call counts and (optionally) memory
+allocated per named stage, keyed by the full stack of enclosing stages. The
+disabled profiler hands out one shared no-op context, so instrumented code
+costs a method call and an empty `with` per stage when profiling is off.
+
+Results print as a breakdown table or export in the folded-stack format read by
+flamegraph.pl, speedscope and inferno (`stage;substage <self microseconds>`).
+"""
+
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+class _Stage:
+    """Reusable context manager for one stage name"""
+    __slots__ = ('profiler', 'name')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler._exit()
+
+class StageProfiler:
+    """Per-stage wall clock, call counts and allocations"""
+    enabled = True
+
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        # stack path -> [calls, total_s, net_alloc_bytes, peak_alloc_bytes]
+        self.stats = {}
+        self._stages = {}
+        self._stack = []   # [name, start_s, start_bytes, peak_bytes]
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def _enter(self, name):
+        start_bytes = peak_bytes = 0
+        if self.track_allocations:
+            start_bytes, peak = tracemalloc.get_traced_memory()
+            # Hand the parent its peak so far before resetting it for this stage
+            if self._stack:
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            tracemalloc.reset_peak()
+            peak_bytes = start_bytes
+        self._stack.append([name, time.perf_counter(), start_bytes, peak_bytes])
+
+    def _exit(self):
+        end = time.perf_counter()
+        path = tuple(frame[0] for frame in self._stack)
+        name, start, start_bytes, peak_bytes = self._stack.pop()
+        entry = self.stats.get(path)
+        if entry is None:
+            entry = self.stats[path] = [0, 0.0, 0, 0]
+        entry[0] += 1
+        entry[1] += end - start
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, peak_bytes)
+            entry[2] += current - start_bytes
+            entry[3] = max(entry[3], peak - start_bytes)
+            if self._stack:
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+
+    def self_times(self):
+        """Exclusive seconds per stack path (total minus direct children)"""
+        self_s = {path: entry[1] for path, entry in self.stats.items()}
+        for path, entry in self.stats.items():
+            if len(path) > 1 and path[:-1] in self_s:
+                self_s[path[:-1]] -= entry[1]
+        return self_s
+
+    def rows(self):
+        """Breakdown rows in call-tree order"""
+        self_s = self.self_times()
+        root_s = sum(entry[1] for path, entry in self.stats.items() if len(path) == 1) or 1.0
+        rows = []
+        for path in sorted(self.stats):
+            calls, total_s, net_bytes, peak_bytes = self.stats[path]
+            row = {'Stage': '  ' * (len(path) - 1) + path[-1], 'Calls': calls,
+                   'Total_ms': total_s * 1000, 'Self_ms': self_s[path] * 1000,
+                   'Per_Call_us': total_s / calls * 1e6, 'Share_%': total_s / root_s * 100}
+            if self.track_allocations:
+                row['Net_Alloc_KB'] = net_bytes / 1024
+                row['Peak_Alloc_KB'] = peak_bytes / 1024
+            rows.append(row)
+        return rows
+
+    def format_table(self):
+        rows = self.rows()
+        if not rows:
+            return "   (no stages recorded)"
+        width = max(len(row['Stage']) for row in rows) + 2
+        columns = [key for key in rows[0] if key != 'Stage']
+        lines = ['   ' + 'Stage'.ljust(width) + ''.join(f"{col:>15}" for col in columns)]
+        for row in rows:
+            cells = ''.join(f"{row[col]:>15}" if isinstance(row[col], int) else f"{row[col]:>15.2f}"
+                            for col in columns)
+            lines.append('   ' + row['Stage'].ljust(width) + cells)
+        return '\n'.join(lines)
+
+    def print_table(self):
+        print("\n📊 PER-STAGE PROFILE:")
+        print("="*70)
+        print(self.format_table())
+
+    def write_folded(self, path):
+        """Folded stacks with exclusive microseconds, one line per stack path"""
+        with open(path, 'w') as f:
+            for stack, self_s in sorted(self.self_times().items()):
+                f.write(f"{';'.join(stack)} {max(int(round(self_s * 1e6)), 0)}\n")
+        return path
+
+    def reset(self):
+        self.stats.clear()
+
+class _NullProfiler:
+    """Disabled profiler: every stage is the same no-op context"""
+    enabled = False
+    _stage = nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,199 @@
+"""
+COLUMNAR RESULTS STORE
+======================
+Fixed-schema, append-only binary column files partitioned by mode and
+configuration:
+
+    <root>/mode=<mode>/config=<config>/<column>.bin   raw little-endian values
+    <root>/mode=<mode>/config=<config>/_meta.json     schema + committed row count
+
+Writers stream bounded chunks while the simulation runs; readers memory-map
+only the columns they ask for.
+"""
+
+import json
+import os
+import numpy as np
+
+# One column per simulate_transmission result key ('mode' is the partition key)
+RESULT_SCHEMA = {
+    'vehicle_id': '<i8',
+    'raw_data_kb': '<f8',
+    'compressed_kb': '<f8',
+    'compression_time_ms': '<f8',
+    'distance_m': '<f8',
+    'irs_gain_db': '<f8',
+    'snr_db': '<f8',
+    'datarate_mbps': '<f8',
+    'mac_delay_ms': '<f8',
+    'tx_delay_ms': '<f8',
+    'prop_delay_ms': '<f8',
+    'processing_delay_ms': '<f8',
+    'handover_delay_ms': '<f8',
+    'total_latency_ms': '<f8',
+    'energy_consumption_mj': '<f8',
+    'packet_success': '|b1',
+}
+
+META_FILE = '_meta.json'
+
+def partition_path(root, mode, config='default'):
+    return os.path.join(root, f"mode={mode}", f"config={config}")
+
+def _read_meta(path):
+    with open(os.path.join(path, META_FILE)) as f:
+        return json.load(f)
+
+def _write_meta(path, meta):
+    tmp_path = os.path.join(path, f"{META_FILE}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(path, META_FILE))
+
+class ColumnarResultsSink:
+    """Buffers result columns per partition and appends them to disk in chunks
+
+    Memory is bounded by chunk_rows rows per open partition. Rows only become
+    visible to readers once the partition's _meta.json row count is updated,
+    so a crash never exposes a half-written chunk; reopening a partition
+    truncates anything past the committed count.
+    """
+    def __init__(self, root, schema=None, chunk_rows=65536):
+        self.root = root
+        self.schema = dict(schema or RESULT_SCHEMA)
+        self.chunk_rows = chunk_rows
+        self._buffers = {}
+        self._rows = {}
+
+    def _open_partition(self, key):
+        path = partition_path(self.root, *key)
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, META_FILE)):
+            meta = _read_meta(path)
+            if meta['columns'] != self.schema:
+                raise ValueError(f"Schema mismatch for existing partition {path}")
+            rows = meta['rows']
+        else:
+            rows = 0
+            _write_meta(path, {'columns': self.schema, 'rows': 0})
+        for name, dtype in self.schema.items():
+            with open(os.path.join(path, f"{name}.bin"), 'ab') as f:
+                f.truncate(rows * np.dtype(dtype).itemsize)
+        self._buffers[key] = []
+        self._rows[key] = rows
+
+    def append(self, columns, mode, config='default'):
+        """Add a batch of results: a dict of columns or a list of row dicts"""
+        key = (mode, str(config))
+        if key not in self._buffers:
+            self._open_partition(key)
+        if isinstance(columns, list):
+            columns = {name: [row[name] for row in columns] for name in self.schema}
+        n = len(np.atleast_1d(columns['total_latency_ms']))
+        chunk = {name: np.broadcast_to(np.asarray(columns[name], dtype=dtype), (n,))
+                 for name, dtype in self.schema.items()}
+        self._buffers[key].append(chunk)
+        if sum(len(c['total_latency_ms']) for c in self._buffers[key]) >= self.chunk_rows:
+            self._flush_partition(key)
+
+    def _flush_partition(self, key):
+        chunks = self._buffers[key]
+        if not chunks:
+            return
+        path = partition_path(self.root, *key)
+        rows = 0
+        for name in self.schema:
+            data = np.concatenate([c[name] for c in chunks])
+            rows = len(data)
+            with open(os.path.join(path, f"{name}.bin"), 'ab') as f:
+                f.write(np.ascontiguousarray(data).tobytes())
+        self._rows[key] += rows
+        _write_meta(path, {'columns': self.schema, 'rows': self._rows[key]})
+        self._buffers[key] = []
+
+    def flush(self):
+        for key in self._buffers:
+            self._flush_partition(key)
+
+    def close(self):
+        self.flush()
+
+    def state(self):
+        """Committed row count per partition, for checkpointing (flushes first)"""
+        self.flush()
+        return dict(self._rows)
+
+    def restore(self, state):
+        """Roll every partition back to the row counts of an earlier state()"""
+        self._buffers, self._rows = {}, {}
+        for mode, config, path in list_partitions(self.root):
+            meta = _read_meta(path)
+            _write_meta(path, {**meta, 'rows': min(meta['rows'], state.get((mode, config), 0))})
+        for key in state:
+            self._open_partition(key)
+
+    def rows_written(self):
+        return {key: self._rows[key] + sum(len(c['total_latency_ms']) for c in self._buffers[key])
+                for key in self._rows}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def list_partitions(root):
+    """(mode, config, path) for every partition under root"""
+    partitions = []
+    if not os.path.isdir(root):
+        return partitions
+    for mode_dir in sorted(os.listdir(root)):
+        if not mode_dir.startswith('mode='):
+            continue
+        for config_dir in sorted(os.listdir(os.path.join(root, mode_dir))):
+            path = os.path.join(root, mode_dir, config_dir)
+            if config_dir.startswith('config=') and os.path.exists(os.path.join(path, META_FILE)):
+                partitions.append((mode_dir[5:], config_dir[7:], path))
+    return partitions
+
+def open_columns(path, columns=None):
+    """Memory-map the committed rows of a partition's columns (no data is read)"""
+    meta = _read_meta(path)
+    names = list(meta['columns']) if columns is None else columns
+    out = {}
+    for name in names:
+        dtype = np.dtype(meta['columns'][name])
+        if meta['rows'] == 0:
+            out[name] = np.empty(0, dtype=dtype)
+        else:
+            out[name] = np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode='r',
+                                  shape=(meta['rows'],))
+    return out
+
+def read_results(root, columns=None, modes=None, configs=None):
+    """Load selected columns of selected partitions into a DataFrame
+
+    'mode' and 'config' may be requested as columns; they come from the partition
+    keys and are returned as categoricals.
+    """
+    import pandas as pd
+
+    wanted = None if columns is None else [c for c in columns if c not in ('mode', 'config')]
+    frames = []
+    for mode, config, path in list_partitions(root):
+        if (modes is not None and mode not in modes) or (configs is not None and config not in configs):
+            continue
+        data = {name: np.asarray(col) for name, col in open_columns(path, wanted).items()}
+        n = _read_meta(path)['rows']
+        if columns is None or 'mode' in columns:
+            data['mode'] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [mode])
+        if columns is None or 'config' in columns:
+            data['config'] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [config])
+        frames.append(pd.DataFrame(data))
+    if not frames:
+        return pd.DataFrame(columns=columns or list(RESULT_SCHEMA) + ['mode', 'config'])
+    df = pd.concat(frames, ignore_index=True)
+    for key in ('mode', 'config'):
+        if key in df:
+            df[key] = df[key].astype('category')
+    return df[columns] if columns is not None else df
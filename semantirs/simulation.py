@@ -0,0 +1,1028 @@
+"""
+FINAL OPTIMIZED SIMULATION ENGINE
+=================================
+FinalOptimizedSimulation plus the multi-core Monte Carlo runner and the cached
+parameter sweep. pandas is only imported by the functions that build DataFrames.
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import pickle
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .components import (CalibratedIRS, DopplerFading, FastSemanticCompressor, InterferenceField,
+                         OptimizedMAC, OptimizedMobilityModel, RadioMap, RealisticChannel,
+                         TimeSteppedMobility, Vehicle)
+from .compression import CompressionProfile, profile_backend
+from .profiling import NULL_PROFILER, StageProfiler
+from .streaming_stats import MOMENT_COLUMNS, MetricsAccumulator
+
+# ============================================================================
+# FINAL OPTIMIZED SIMULATION ENGINE
+# ============================================================================
+
+# Calibrated component parameters; any subset can be overridden per run or sweep point
+DEFAULT_CONFIG = {
+    'num_vehicles': 50,
+    'num_rsus': 15,
+    'grid_size': [2000, 2000],  # map extent in metres (x, y)
+    'rsu_index_cell_m': None,  # RSU grid-index cell size; None: about one RSU per cell
+    'num_elements': 50,
+    'beamforming_efficiency': 0.65,
+    'compression_ratio': 0.1,
+    'processing_time_ms': 8.0,
+    'contention_window': 7,
+    'irs_mode': 'calibrated',
+    'irs_codebook_bins': None,  # e.g. [72, 32] azimuth x elevation beams (physical mode)
+    'mac_mode': 'formula',  # 'event': CSMA/CA contention simulated per packet
+    'mec_mode': 'fixed',  # 'queue': shared, batched MEC server per RSU (run_mobile_scenario)
+    'mec_servers': 1,
+    'mec_max_batch': 8,
+    'mec_max_wait_ms': 2.0,
+    'radio_map_resolution_m': None,  # e.g. 5.0: path loss / best server looked up per map cell
+    'fading_model': 'iid',  # 'jakes': Doppler-correlated traces in time-stepped runs
+    'fading_sample_ms': 0.25,
+    'interference_cutoff_m': None,  # e.g. 500: SINR from concurrent transmitters in time-stepped runs
+    'rsu_activity': 0.0,  # probability an RSU transmits (downlink) in a time step
+    'compressor_backend': None,  # e.g. 'zlib', 'lzma', 'semantic': measured ratio/time (see compression)
+    'compressor_profile_samples': 32,
+    'compressor_workers': None,
+}
+
+# Fixed model constants (not part of the config); the report quotes them from
+# FinalOptimizedSimulation.describe and model_code_version hashes their values
+MEC_PROCESSING_MS = 3.0
+LLM_INFERENCE_ENERGY_MJ = 40
+IRS_CONTROL_ENERGY_MJ = 1.5
+CONTENDING_STATIONS = 3
+HANDOVER_DELAY_MS = 50.0
+
+def model_constants():
+    return {'mec_processing_ms': MEC_PROCESSING_MS, 'llm_inference_energy_mj': LLM_INFERENCE_ENERGY_MJ,
+            'irs_control_energy_mj': IRS_CONTROL_ENERGY_MJ, 'contending_stations': CONTENDING_STATIONS,
+            'handover_delay_ms': HANDOVER_DELAY_MS}
+
+def measure_compression_profile(config=None, sizes_kb=None, seed=0):
+    """Measure the configured compressor backend (None when there is none)
+    
+    The timings are wall-clock, so measure once and pass the profile to every
+    simulation (compression_profile=...) that must reproduce the same trace.
+    sizes_kb defaults to the fleet's sensor payload size.
+    """
+    cfg = {**DEFAULT_CONFIG, **(config or {})}
+    if not cfg['compressor_backend']:
+        return None
+    return profile_backend(cfg['compressor_backend'],
+                           [Vehicle.sensor_data_size] if sizes_kb is None else sizes_kb,
+                           samples=cfg['compressor_profile_samples'],
+                           workers=cfg['compressor_workers'], seed=seed)
+
+class FinalOptimizedSimulation:
+    """Realistic ITS latency + Literature-aligned IRS gain"""
+    
+    def __init__(self, seed=42, rng=None, config=None, profile=False, radio_map_dir='radio_maps',
+                 compression_profile=None):
+        unknown = set(config or {}) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"Unknown config parameters: {sorted(unknown)}")
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        cfg = self.config
+        # One Generator drives every component, so a run is fully determined by its seed
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.mobility = OptimizedMobilityModel(num_vehicles=cfg['num_vehicles'],
+                                               num_rsus=cfg['num_rsus'], grid_size=cfg['grid_size'],
+                                               rng=self.rng, rsu_index_cell_m=cfg['rsu_index_cell_m'])
+        self.channel = RealisticChannel(rng=self.rng)
+        self.irs = CalibratedIRS(num_elements=cfg['num_elements'],
+                                 beamforming_efficiency=cfg['beamforming_efficiency'],
+                                 mode=cfg['irs_mode'], codebook_bins=cfg['irs_codebook_bins'],
+                                 rng=self.rng)
+        # Measuring here would make same-seed runs differ in their timings; callers
+        # that need reproducible traces measure once and pass the profile in
+        if compression_profile is None and cfg['compressor_backend']:
+            compression_profile = measure_compression_profile(cfg, self.mobility.vehicles.sensor_data_kb)
+        self.compressor = FastSemanticCompressor(compression_ratio=cfg['compression_ratio'],
+                                                 processing_time_ms=cfg['processing_time_ms'],
+                                                 mode=cfg['mec_mode'], num_servers=cfg['mec_servers'],
+                                                 max_batch_size=cfg['mec_max_batch'],
+                                                 max_wait_ms=cfg['mec_max_wait_ms'],
+                                                 profile=compression_profile, rng=self.rng,
+                                                 mec_processing_ms=MEC_PROCESSING_MS)
+        self.mac = OptimizedMAC(contention_window=cfg['contention_window'], rng=self.rng,
+                                mode=cfg['mac_mode'])
+        # Memory-mapped path-loss / best-server maps, built once per deployment in radio_map_dir
+        self.radio_map = None
+        self._radio_map_rsu_version = self.mobility.rsus.version
+        if cfg['radio_map_resolution_m']:
+            self.radio_map = RadioMap.load_or_build(self.mobility.rsu_index, self.mobility.grid_size,
+                                                    cfg['radio_map_resolution_m'], self.channel,
+                                                    cache_dir=radio_map_dir)
+        self.fading = None
+        if cfg['fading_model'] == 'jakes':
+            self.fading = DopplerFading(self.mobility.vehicles.velocities,
+                                        carrier_hz=self.channel.frequency,
+                                        sample_interval_s=cfg['fading_sample_ms'] / 1000, rng=self.rng)
+        elif cfg['fading_model'] != 'iid':
+            raise ValueError(f"Unknown fading model: {cfg['fading_model']}")
+        self.interference = None
+        if cfg['interference_cutoff_m']:
+            self.interference = InterferenceField(self.mobility.rsu_index, self.channel,
+                                                  cutoff_radius_m=cfg['interference_cutoff_m'],
+                                                  rsu_activity=cfg['rsu_activity'], rng=self.rng)
+        # profile=True (or a StageProfiler) times every stage of simulate_transmission
+        if profile is True:
+            profile = StageProfiler()
+        self.profiler = profile or NULL_PROFILER
+    
+    def describe(self):
+        """Config and fixed model parameters of this run (what the report quotes)"""
+        profile = self.compressor.profile
+        return {
+            'config': dict(self.config),
+            'model': {**model_constants(),
+                      'irs_phase_bits': self.irs.phase_quantization_bits,
+                      'irs_csi_error_db': self.irs.channel_estimation_error_db,
+                      'irs_gain_variation_db': self.irs.gain_variation_db,
+                      'compression': profile.summary() if profile is not None else None},
+        }
+    
+    def _require_fixed_mec(self, method):
+        # The MEC queue is replayed from packet arrival times, which only time-stepped runs have
+        if self.compressor.mode == 'queue':
+            raise ValueError(f"mec_mode='queue' needs packet arrival times: use run_mobile_scenario, "
+                             f"not {method}")
+    
+    def simulate_transmission(self, vehicle, target, offload_mode='semantic_irs'):
+        self._require_fixed_mec('simulate_transmission')
+        prof = self.profiler
+        with prof.stage('result_build'):
+            result = {'vehicle_id': vehicle.id, 'mode': offload_mode}
+            
+            raw_data_kb = vehicle.sensor_data_size
+            result['raw_data_kb'] = raw_data_kb
+        
+        # Semantic compression
+        with prof.stage('compression'):
+            if 'semantic' in offload_mode:
+                compressed_kb, _, compress_time_ms = self.compressor.compress(raw_data_kb)
+                result['compressed_kb'] = compressed_kb
+                result['compression_time_ms'] = compress_time_ms
+                data_to_send_kb = compressed_kb
+            else:
+                data_to_send_kb = raw_data_kb
+                result['compressed_kb'] = raw_data_kb
+                result['compression_time_ms'] = 0
+        
+        # Find closest RSU (realistic deployment)
+        with prof.stage('rsu_search'):
+            path_loss_db = None
+            if self.radio_map is not None:
+                distances, ids, path_loss = self.radio_map.best_server(vehicle.position)
+                path_loss_db = path_loss[0]
+            else:
+                distances, ids = self.mobility.nearest_rsu(vehicle.position)
+            distance = distances[0]  # Use closest RSU
+            serving = self.mobility.rsus[ids[0]]
+            distance = min(distance, 250)  # Clip to realistic V2I range
+            result['distance_m'] = distance
+        
+        # IRS enhancement
+        with prof.stage('irs_gain'):
+            if 'irs' in offload_mode:
+                irs_gain_db = self.irs.adaptive_beamforming([vehicle.position], serving.position)
+                result['irs_gain_db'] = irs_gain_db
+            else:
+                irs_gain_db = 0
+                result['irs_gain_db'] = 0
+        
+        # Wireless channel
+        with prof.stage('channel'):
+            tx_power_dbm = 23
+            snr_db = self.channel.calculate_snr(tx_power_dbm, distance, irs_gain_db, path_loss_db)
+            datarate_mbps = self.channel.calculate_datarate_mbps(snr_db)
+            result['snr_db'] = snr_db
+            result['datarate_mbps'] = datarate_mbps
+        
+        # MAC delay (optimized)
+        with prof.stage('mac'):
+            mac_delay_ms = self.mac.calculate_mac_delay_ms(data_to_send_kb, datarate_mbps, 
+                                                            num_contending=CONTENDING_STATIONS)
+            result['mac_delay_ms'] = mac_delay_ms
+        
+        # Handover (rare in dense deployment)
+        with prof.stage('handover_rng'):
+            handover_delay_ms = HANDOVER_DELAY_MS if self.rng.random() < 0.05 else 0  # 5% probability
+        
+        with prof.stage('result_build'):
+            # Transmission delay
+            tx_delay_ms = (data_to_send_kb * 8 * 1024) / (datarate_mbps * 1000)
+            result['tx_delay_ms'] = tx_delay_ms
+            
+            # Propagation delay (negligible for short distances)
+            prop_delay_ms = (distance / 3e8) * 1000
+            result['prop_delay_ms'] = prop_delay_ms
+            
+            # Processing at RSU/MEC (optimized)
+            processing_delay_ms = MEC_PROCESSING_MS  # Fast MEC
+            result['processing_delay_ms'] = processing_delay_ms
+            result['handover_delay_ms'] = handover_delay_ms
+            
+            # Total latency
+            total_latency_ms = (result.get('compression_time_ms', 0) + mac_delay_ms + 
+                               tx_delay_ms + prop_delay_ms + processing_delay_ms + handover_delay_ms)
+            result['total_latency_ms'] = total_latency_ms
+            
+            # Energy
+            tx_energy_mj = (tx_delay_ms / 1000) * (10 ** (tx_power_dbm / 10))
+            compress_energy_mj = LLM_INFERENCE_ENERGY_MJ if 'semantic' in offload_mode else 0  # Optimized LLM
+            irs_energy_mj = IRS_CONTROL_ENERGY_MJ if 'irs' in offload_mode else 0
+            result['energy_consumption_mj'] = tx_energy_mj + compress_energy_mj + irs_energy_mj
+            
+            # Success (high SNR with IRS)
+            result['packet_success'] = snr_db > 3.0
+        
+        return result
+    
+    def simulate_batch(self, vehicle_ids=None, rsu_ids=None, offload_mode='semantic_irs', n=None,
+                       distance_m=None, handover=None, vehicle_positions=None, fading_db=None,
+                       interference_mw=None):
+        """Vectorized simulate_transmission: same model, one column per result key
+        
+        rsu_ids is each packet's serving RSU (default: the vehicle's closest RSU).
+        distance_m, handover (bool per packet) and vehicle_positions override the
+        static geometry and the 5% handover draw, e.g. with TimeSteppedMobility values;
+        fading_db replaces the independent fading draw (e.g. DopplerFading values), and
+        with interference_mw (at each packet's receiver) snr_db holds the SINR.
+        """
+        self._require_fixed_mec('simulate_batch')
+        return self._simulate_batch(vehicle_ids, rsu_ids, offload_mode, n, distance_m, handover,
+                                    vehicle_positions, fading_db, interference_mw)
+    
+    def _simulate_batch(self, vehicle_ids, rsu_ids, offload_mode, n, distance_m, handover,
+                        vehicle_positions, fading_db, interference_mw):
+        # simulate_batch without the MEC-mode check, for run_mobile_scenario
+        if vehicle_ids is None:
+            vehicle_ids = self.rng.integers(0, len(self.mobility.vehicles), size=n)
+        vehicle_ids = np.asarray(vehicle_ids)
+        n = len(vehicle_ids)
+        
+        # The closest RSU and its path loss are computed once per vehicle and reused
+        # until a vehicle or an RSU moves (fleet/deployment set_positions)
+        geometry = self.mobility.geometry_version
+        if getattr(self, '_geometry_version', None) != geometry:
+            if self.radio_map is not None and geometry[1] != self._radio_map_rsu_version:
+                raise ValueError("RSUs moved since the radio map was built; "
+                                 "create the simulation for the new deployment")
+            if self.radio_map is not None:
+                d, ids, self._vehicle_path_loss_db = self.radio_map.best_server(
+                    self.mobility.vehicle_positions)
+            else:
+                d, ids = self.mobility.rsu_index.nearest_batch(self.mobility.vehicle_positions)
+                d, ids = d[:, 0], ids[:, 0]
+                self._vehicle_path_loss_db = self.channel.path_loss_db(np.minimum(d, 250))
+            self._vehicle_distance_m = np.minimum(d, 250)
+            self._vehicle_rsu_id = ids
+            self._vehicle_data_kb = self.mobility.vehicles.sensor_data_kb
+            self._geometry_version = geometry
+        if rsu_ids is None:
+            rsu_ids = self._vehicle_rsu_id[vehicle_ids]
+        
+        result = {'vehicle_id': vehicle_ids, 'mode': offload_mode}
+        
+        raw_data_kb = self._vehicle_data_kb[vehicle_ids]
+        result['raw_data_kb'] = raw_data_kb
+        
+        # Semantic compression
+        if 'semantic' in offload_mode:
+            compressed_kb, _, compress_time_ms = self.compressor.compress(raw_data_kb)
+            data_to_send_kb = compressed_kb
+        else:
+            data_to_send_kb = raw_data_kb
+            compress_time_ms = 0
+        result['compressed_kb'] = data_to_send_kb
+        result['compression_time_ms'] = np.full(n, compress_time_ms, dtype=float)
+        
+        if distance_m is None:
+            distance = self._vehicle_distance_m[vehicle_ids]
+            path_loss_db = self._vehicle_path_loss_db[vehicle_ids]
+        else:
+            distance = np.minimum(distance_m, 250)
+            path_loss_db = None
+            if self.radio_map is not None and vehicle_positions is not None:
+                path_loss_db = self.radio_map.path_loss(vehicle_positions, rsu_ids)
+        result['distance_m'] = distance
+        
+        # IRS enhancement (one user per packet, as in simulate_transmission)
+        if 'irs' in offload_mode:
+            if vehicle_positions is None:
+                vehicle_positions = self.mobility.vehicle_positions[vehicle_ids]
+            irs_gain_db = self.irs.adaptive_beamforming_batch(
+                vehicle_positions, self.mobility.rsu_index.positions[rsu_ids])
+        else:
+            irs_gain_db = np.zeros(n)
+        result['irs_gain_db'] = irs_gain_db
+        
+        # Wireless channel
+        tx_power_dbm = 23
+        snr_db = self.channel.calculate_snr(tx_power_dbm, distance, irs_gain_db, path_loss_db,
+                                            fading_db)
+        if interference_mw is not None:
+            snr_db = snr_db - self.interference.sinr_penalty_db(interference_mw)
+        datarate_mbps = self.channel.calculate_datarate_mbps(snr_db)
+        result['snr_db'] = snr_db
+        result['datarate_mbps'] = datarate_mbps
+        
+        mac_delay_ms = self.mac.calculate_mac_delay_ms_batch(data_to_send_kb, datarate_mbps,
+                                                             num_contending=CONTENDING_STATIONS)
+        result['mac_delay_ms'] = mac_delay_ms
+        
+        tx_delay_ms = (data_to_send_kb * 8 * 1024) / (datarate_mbps * 1000)
+        result['tx_delay_ms'] = tx_delay_ms
+        
+        prop_delay_ms = (distance / 3e8) * 1000
+        result['prop_delay_ms'] = prop_delay_ms
+        
+        processing_delay_ms = np.full(n, MEC_PROCESSING_MS)
+        result['processing_delay_ms'] = processing_delay_ms
+        
+        if handover is None:
+            handover = self.rng.random(n) < 0.05
+        handover_delay_ms = np.where(handover, HANDOVER_DELAY_MS, 0.0)
+        result['handover_delay_ms'] = handover_delay_ms
+        
+        result['total_latency_ms'] = (result['compression_time_ms'] + mac_delay_ms + tx_delay_ms +
+                                      prop_delay_ms + processing_delay_ms + handover_delay_ms)
+        
+        # Energy
+        tx_energy_mj = (tx_delay_ms / 1000) * (10 ** (tx_power_dbm / 10))
+        compress_energy_mj = LLM_INFERENCE_ENERGY_MJ if 'semantic' in offload_mode else 0
+        irs_energy_mj = IRS_CONTROL_ENERGY_MJ if 'irs' in offload_mode else 0
+        result['energy_consumption_mj'] = tx_energy_mj + compress_energy_mj + irs_energy_mj
+        
+        result['packet_success'] = snr_db > 3.0
+        
+        return result
+    
+    def run_batch_scenario(self, samples_per_mode=150, sink=None, chunk_size=1_000_000,
+                           variance_reduction=None):
+        """Vectorized run_full_scenario; each mode's value is a dict of columns
+        
+        With a sink (results_store.ColumnarResultsSink) the columns are streamed to
+        it in chunks of chunk_size and nothing is kept in memory.
+        
+        variance_reduction='crn' evaluates all three modes on the same sampled
+        scenarios (common random numbers: same vehicles, fading, backoff, handover),
+        so sample i of every mode is paired. 'antithetic' additionally follows every
+        scenario with its mirrored twin (uniform u -> 1-u, normal z -> -z); samples
+        2k and 2k+1 then form an antithetic pair. See paired_difference_ci.
+        """
+        self._require_fixed_mec('run_batch_scenario')
+        modes = ['raw', 'semantic', 'semantic_irs']
+        if variance_reduction not in (None, 'crn', 'antithetic'):
+            raise ValueError(f"Unknown variance reduction: {variance_reduction}")
+        if variance_reduction is not None:
+            return self._run_paired_batches(samples_per_mode, sink, chunk_size, modes,
+                                            antithetic=variance_reduction == 'antithetic')
+        if sink is None:
+            return {mode: self.simulate_batch(offload_mode=mode, n=samples_per_mode) for mode in modes}
+        for mode in modes:
+            for start in range(0, samples_per_mode, chunk_size):
+                n = min(chunk_size, samples_per_mode - start)
+                sink.append(self.simulate_batch(offload_mode=mode, n=n), mode)
+        sink.flush()
+        return sink
+    
+    def _paired_batch(self, n, modes, antithetic):
+        """{mode: columns} for n scenarios shared by every mode"""
+        scenarios = n // 2 if antithetic else n
+        vehicle_ids = self.rng.integers(0, len(self.mobility.vehicles), size=scenarios)
+        # Streams 0-2 and 4 drive the components, stream 3 the handover draws
+        children = np.random.SeedSequence(int(self.rng.integers(2**63))).spawn(5)
+        components = (self.channel, self.mac, self.irs, self.compressor)
+        shared_rng = [component.rng for component in components]
+        batches = {mode: [] for mode in modes}
+        try:
+            for mirrored in ((False, True) if antithetic else (False,)):
+                for mode in modes:
+                    # Identical per-component streams for every mode
+                    streams = [AntitheticGenerator(child) if mirrored else np.random.default_rng(child)
+                               for child in children]
+                    for component, stream in zip(components, streams[:3] + streams[4:]):
+                        component.rng = stream
+                    batches[mode].append(self.simulate_batch(vehicle_ids, offload_mode=mode,
+                                                             handover=streams[3].random(scenarios) < 0.05))
+        finally:
+            for component, rng in zip(components, shared_rng):
+                component.rng = rng
+        
+        if not antithetic:
+            return {mode: batch[0] for mode, batch in batches.items()}
+        paired = {}
+        for mode, (base, mirror) in batches.items():
+            columns = {'mode': mode}
+            for key, values in base.items():
+                if key == 'mode':
+                    continue
+                interleaved = np.empty(2 * scenarios, dtype=np.result_type(values, mirror[key]))
+                interleaved[0::2], interleaved[1::2] = values, mirror[key]
+                columns[key] = interleaved
+            paired[mode] = columns
+        return paired
+    
+    def _run_paired_batches(self, samples_per_mode, sink, chunk_size, modes, antithetic):
+        if antithetic and (samples_per_mode % 2 or chunk_size < 2):
+            raise ValueError("Antithetic pairing needs an even samples_per_mode")
+        chunk_size -= chunk_size % 2 if antithetic else 0
+        chunks = {mode: [] for mode in modes}
+        for start in range(0, samples_per_mode, chunk_size):
+            batch = self._paired_batch(min(chunk_size, samples_per_mode - start), modes, antithetic)
+            for mode in modes:
+                if sink is not None:
+                    sink.append(batch[mode], mode)
+                else:
+                    chunks[mode].append(batch[mode])
+        if sink is not None:
+            sink.flush()
+            return sink
+        return {mode: {key: (np.concatenate([c[key] for c in chunks[mode]]) if key != 'mode' else mode)
+                       for key in chunks[mode][0]}
+                for mode in modes}
+    
+    def run_until_precision(self, targets, confidence=0.95, batch_size=10000, min_samples=None,
+                            max_samples_per_mode=2_000_000, sink=None, verbose=True):
+        """Simulate each mode in batches until every precision target is met
+        
+        targets maps a statistic to the largest acceptable CI half-width, e.g.
+        {'mean': 0.5, 'p95': 2.0} for +-0.5 ms on mean latency and +-2 ms on the
+        95th percentile ('mean:<column>' targets the mean of another result column).
+        After each batch the half-widths are recomputed at the given confidence:
+        normal CI for means, order-statistic CI read off the quantile sketch for
+        percentiles. A mode stops as soon as all its targets hold (and it has at
+        least min_samples, default two batches, which guards against stopping on an
+        early lucky batch) or when it reaches max_samples_per_mode. A percentile
+        that falls on a gap of the distribution (p95 against the 5% handover delay)
+        may never converge and runs to the cap.
+        
+        Returns the MetricsAccumulator; batches also go to sink when given, and the
+        per-mode stopping report is kept in self.last_precision_report.
+        """
+        from statistics import NormalDist
+        
+        self._require_fixed_mec('run_until_precision')
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        parsed = parse_precision_targets(targets)
+        min_samples = min_samples or 2 * batch_size
+        accumulator = MetricsAccumulator(relative_accuracy=0.002)
+        modes = ['raw', 'semantic', 'semantic_irs']
+        active = list(modes)
+        report = {}
+        while active:
+            for mode in list(active):
+                columns = self.simulate_batch(offload_mode=mode, n=batch_size)
+                accumulator.append(columns, mode)
+                if sink is not None:
+                    sink.append(columns, mode)
+                
+                metrics = accumulator.metrics[(mode, 'default')]
+                n = metrics.latency_sketch.count
+                widths = precision_half_widths(metrics, parsed, z)
+                met = n >= min_samples and all(widths[key] <= target for key, _, _, target in parsed)
+                if met or n >= max_samples_per_mode:
+                    active.remove(mode)
+                    report[mode] = {'Mode': mode, 'Samples': n, 'Targets_Met': met,
+                                    **{f"CI_{key}": widths[key] for key in widths}}
+                    if verbose:
+                        status = "✅ targets met" if met else "⚠️  sample cap reached"
+                        print(f"   {mode:<13} {status} after {n} samples: " +
+                              ", ".join(f"{key} ±{widths[key]:.3f}" for key in widths))
+        if sink is not None:
+            sink.flush()
+        self.last_precision_report = [report[mode] for mode in modes]
+        return accumulator
+    
+    def run_mobile_scenario(self, duration_s=10.0, tick_ms=10.0, packet_rate_hz=1.0,
+                            movement='road_grid', offload_mode='semantic_irs'):
+        """Time-stepped run: vehicles move every tick and transmit at packet_rate_hz
+        
+        Distances come from each sender's current serving RSU and the 50 ms handover
+        delay is charged to the first packet after a real serving-cell change. In
+        'event' MAC mode the whole trace is replayed through one CSMA/CA channel per
+        RSU, and in 'queue' MEC mode each delivered request then joins the serving
+        RSU's edge server at its arrival time (generation + compression + uplink),
+        replacing the flat MEC delay (per-RSU report in self.last_mec_report), so
+        both delays reflect the actual load from the other senders. With
+        fading_model='jakes' each packet's fading is read from its vehicle's
+        Doppler-correlated trace at the tick time, so closely spaced packets of a
+        vehicle see correlated (bursty) fades. With interference_cutoff_m set, the
+        senders of each tick interfere with each other's receivers (snr_db is SINR).
+        """
+        mobility = TimeSteppedMobility.from_model(self.mobility, movement=movement, rng=self.rng)
+        num_vehicles = len(self.mobility.vehicles)
+        dt_s = tick_ms / 1000
+        chunks, channel_ids = [], []
+        for _ in range(int(round(duration_s / dt_s))):
+            mobility.step(dt_s)
+            senders = np.nonzero(self.rng.random(num_vehicles) < packet_rate_hz * dt_s)[0]
+            if len(senders) == 0:
+                continue
+            fading_db = (self.fading.fading_db(senders, mobility.time_s)
+                         if self.fading is not None else None)
+            interference_mw = None
+            if self.interference is not None:
+                serving = mobility.serving_rsu[senders]
+                interference_mw = self.interference.interference_mw(mobility.positions[senders],
+                                                                    serving)[serving]
+            columns = self._simulate_batch(senders, mobility.serving_rsu[senders], offload_mode, None,
+                                           mobility.serving_distance_m(senders),
+                                           mobility.consume_handovers(senders),
+                                           mobility.positions[senders], fading_db, interference_mw)
+            columns['time_s'] = np.full(len(senders), mobility.time_s)
+            chunks.append(columns)
+            channel_ids.append(mobility.serving_rsu[senders])
+        
+        result = {key: np.concatenate([c[key] for c in chunks]) if chunks else np.empty(0)
+                  for key in (chunks[0] if chunks else {}) if key != 'mode'}
+        result['mode'] = offload_mode
+        self.last_mec_report = None
+        queue_mec = self.compressor.mode == 'queue'
+        if (queue_mec or self.mac.mode == 'event') and chunks:
+            # Packets are generated uniformly within their tick
+            generated_ms = (result['time_s'] - dt_s * self.rng.random(len(result['time_s']))) * 1000
+            channel_ids = np.concatenate(channel_ids)
+        delivered = np.ones(len(result.get('time_s', ())), dtype=bool)
+        if self.mac.mode == 'event' and chunks:
+            mac_delay_ms, _, dropped = self.mac.simulate_channels(
+                generated_ms + result['compression_time_ms'], result['vehicle_id'],
+                result['compressed_kb'], result['datarate_mbps'], channel_ids)
+            result['total_latency_ms'] += mac_delay_ms - result['mac_delay_ms']
+            result['mac_delay_ms'] = mac_delay_ms
+            result['packet_success'] &= ~dropped
+            delivered = ~dropped
+        if queue_mec and chunks:
+            # A request reaches the MEC server once it has been compressed and sent
+            # (everything but processing); queueing and batched service replace the
+            # flat MEC delay, and requests the MAC dropped never arrive
+            arrival_ms = generated_ms + result['total_latency_ms'] - result['processing_delay_ms']
+            mec_ms = np.zeros(len(arrival_ms))
+            mec_ms[delivered], _, self.last_mec_report = self.compressor.simulate_servers(
+                arrival_ms[delivered], channel_ids[delivered])
+            result['total_latency_ms'] += mec_ms - result['processing_delay_ms']
+            result['processing_delay_ms'] = mec_ms
+        self.last_mobility = mobility
+        return result
+    
+    def _save_checkpoint(self, path, samples_per_mode, position, results_by_mode, sink):
+        state = {
+            'config': self.config,
+            'samples_per_mode': samples_per_mode,
+            'position': position,
+            'rng_state': self.rng.bit_generator.state,
+            # The off-grid beam cache feeds later gains, so it is part of the run state
+            'irs_state': {key: getattr(self.irs, key) for key in ('_offgrid_cache', 'codebook_stats')
+                          if hasattr(self.irs, key)},
+            'compression_profile': self.compressor.profile,
+            'results': results_by_mode,
+            'sink_state': sink.state() if sink is not None else None,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    
+    def _load_checkpoint(self, path, samples_per_mode, sink):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state['config'] != self.config or state['samples_per_mode'] != samples_per_mode:
+            raise ValueError(f"Checkpoint {path} was written by a run with different settings")
+        if (state['sink_state'] is None) != (sink is None):
+            raise ValueError(f"Checkpoint {path} does not match the sink of this run")
+        self.rng.bit_generator.state = state['rng_state']
+        self.irs.__dict__.update(state['irs_state'])
+        # The rest of the run samples the measurements the first part used
+        self.compressor.profile = state['compression_profile']
+        if sink is not None:
+            sink.restore(state['sink_state'])
+        return state['position'], state['results']
+    
+    def run_full_scenario(self, samples_per_mode=150, verbose=True, sink=None, checkpoint=None,
+                          checkpoint_every=10000, resume=False):
+        """Per-packet run over every mode; results go to sink when one is given
+        
+        With checkpoint=<path>, the completed samples (or the sink's committed
+        state), the position in the run and the RNG state are saved every
+        checkpoint_every samples. resume=True continues from that file when it
+        exists and gives exactly the results of an uninterrupted run with the same
+        seed, config and samples_per_mode. The file is removed on completion.
+        """
+        self._require_fixed_mec('run_full_scenario')
+        if verbose:
+            print(f"\n{'='*70}")
+            print("RUNNING FINAL OPTIMIZED SIMULATION")
+            print(f"{'='*70}")
+        
+        modes = ['raw', 'semantic', 'semantic_irs']
+        results_by_mode = {mode: [] for mode in modes}
+        prof = self.profiler
+        start = (0, 0)
+        if checkpoint is not None and resume and os.path.exists(checkpoint):
+            start, results_by_mode = self._load_checkpoint(checkpoint, samples_per_mode, sink)
+            if verbose:
+                print(f"\n⏯️  Resuming from {checkpoint}: {modes[start[0]]} sample {start[1]}")
+        done = start[0] * samples_per_mode + start[1]
+        
+        for m, mode in enumerate(modes[start[0]:], start=start[0]):
+            if verbose:
+                print(f"\n🔄 Mode: {mode.upper()}")
+            first = start[1] if m == start[0] else 0
+            for i in range(first, samples_per_mode):  # More samples for better statistics
+                with prof.stage('sample_rng'):
+                    vehicle = self.mobility.vehicles[self.rng.integers(len(self.mobility.vehicles))]
+                    target = self.mobility.rsus[self.rng.integers(len(self.mobility.rsus))]
+                with prof.stage('simulate_transmission'):
+                    result = self.simulate_transmission(vehicle, target, mode)
+                results_by_mode[mode].append(result)
+                if sink is not None and len(results_by_mode[mode]) >= sink.chunk_rows:
+                    with prof.stage('sink'):
+                        sink.append(results_by_mode[mode], mode)
+                    results_by_mode[mode] = []
+                if verbose and (i+1) % 50 == 0:
+                    print(f"   Progress: {i+1}/{samples_per_mode}")
+                done += 1
+                if checkpoint is not None and done % checkpoint_every == 0:
+                    # Rows not yet handed to the sink travel in the checkpoint, so the
+                    # sink sees the same batches as in an uninterrupted run
+                    with prof.stage('checkpoint'):
+                        self._save_checkpoint(checkpoint, samples_per_mode, (m, i + 1),
+                                              results_by_mode, sink)
+            if sink is not None and results_by_mode[mode]:
+                with prof.stage('sink'):
+                    sink.append(results_by_mode[mode], mode)
+                results_by_mode[mode] = []
+        
+        if sink is not None:
+            with prof.stage('sink'):
+                sink.flush()
+        if checkpoint is not None and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        if verbose and prof.enabled:
+            prof.print_table()
+        return sink if sink is not None else results_by_mode
+
+# ============================================================================
+# MULTI-CORE MONTE CARLO RUNNER
+# ============================================================================
+
+def _run_replication(args):
+    # Each replication owns a fresh simulation driven by its own spawned stream
+    (replication, seed_seq, samples_per_mode, vectorized, config, summarize, variance_reduction,
+     compression_profile) = args
+    sim = FinalOptimizedSimulation(rng=np.random.default_rng(seed_seq), config=config,
+                                   compression_profile=compression_profile)
+    if summarize:
+        # Only the mergeable accumulator travels back to the parent process
+        if vectorized:
+            return sim.run_batch_scenario(samples_per_mode, sink=MetricsAccumulator(),
+                                          variance_reduction=variance_reduction)
+        return sim.run_full_scenario(samples_per_mode, verbose=False, sink=MetricsAccumulator())
+    if vectorized:
+        results = sim.run_batch_scenario(samples_per_mode, variance_reduction=variance_reduction)
+        for columns in results.values():
+            columns['replication'] = np.full(samples_per_mode, replication)
+    else:
+        results = sim.run_full_scenario(samples_per_mode, verbose=False)
+        for rows in results.values():
+            for row in rows:
+                row['replication'] = replication
+    return results
+
+def run_monte_carlo(num_replications, seed=42, workers=None, samples_per_mode=150,
+                    vectorized=False, config=None, summarize=False, variance_reduction=None,
+                    compression_profile=None):
+    """Run independent replications of the scenario on a process pool
+    
+    Replication i always uses child i of SeedSequence(seed), and results are merged
+    in replication order, so the output is bit-identical for any number of workers.
+    Returns the same {mode: results} structure as run_full_scenario (or, when
+    vectorized, run_batch_scenario) with an extra 'replication' field. With
+    summarize=True, workers stream into MetricsAccumulators instead and the merged
+    accumulator is returned, so no samples are held in memory. variance_reduction
+    ('crn' or 'antithetic', vectorized only) is passed to run_batch_scenario.
+    
+    With a compressor backend, every replication samples one compression_profile,
+    measured here if none is given (pass one to repeat a run exactly).
+    """
+    if variance_reduction is not None and not vectorized:
+        raise ValueError("variance_reduction requires vectorized=True")
+    if compression_profile is None:
+        compression_profile = measure_compression_profile(config)
+    children = np.random.SeedSequence(seed).spawn(num_replications)
+    tasks = [(i, child, samples_per_mode, vectorized, config, summarize, variance_reduction,
+              compression_profile) for i, child in enumerate(children)]
+    workers = workers or multiprocessing.cpu_count()
+    
+    if workers == 1:
+        replications = [_run_replication(task) for task in tasks]
+    else:
+        # Default start method: workers rebuild everything from their task tuple,
+        # so nothing depends on state inherited from the parent
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            replications = list(pool.map(_run_replication, tasks))
+    
+    modes = ['raw', 'semantic', 'semantic_irs']
+    if summarize:
+        merged = MetricsAccumulator()
+        for accumulator in replications:
+            merged.merge(accumulator)
+        return merged
+    if vectorized:
+        merged = {}
+        for mode in modes:
+            merged[mode] = {key: np.concatenate([np.atleast_1d(r[mode][key]) for r in replications])
+                            for key in replications[0][mode] if key != 'mode'}
+            merged[mode]['mode'] = mode
+        return merged
+    return {mode: [row for r in replications for row in r[mode]] for mode in modes}
+
+# ============================================================================
+# VARIANCE REDUCTION: COMMON RANDOM NUMBERS + ANTITHETIC VARIATES
+# ============================================================================
+
+class AntitheticGenerator:
+    """Mirror image of default_rng(seed): u -> 1-u, z -> -z, k -> low+high-1-k"""
+    def __init__(self, seed):
+        self._rng = np.random.default_rng(seed)
+    
+    def random(self, size=None, **kwargs):
+        return 1.0 - self._rng.random(size, **kwargs)
+    
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return low + high - self._rng.uniform(low, high, size)
+    
+    def integers(self, low, high=None, size=None, **kwargs):
+        if high is None:
+            low, high = 0, low
+        return low + high - 1 - self._rng.integers(low, high, size, **kwargs)
+    
+    def standard_normal(self, size=None, **kwargs):
+        return -self._rng.standard_normal(size, **kwargs)
+    
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return 2 * np.asarray(loc) - self._rng.normal(loc, scale, size)
+    
+    def __getattr__(self, name):
+        # Anything else (choice, bit_generator, ...) is drawn unmirrored
+        return getattr(self._rng, name)
+
+def paired_difference_ci(results, metric='total_latency_ms', baseline='raw',
+                         treatment='semantic_irs', confidence=0.95, antithetic=False):
+    """Mean and confidence half-width of treatment - baseline from a paired run
+    
+    results must come from run_batch_scenario(variance_reduction='crn' or
+    'antithetic'), so sample i of both modes saw the same scenario. With
+    antithetic=True, each (2k, 2k+1) pair is averaged first and the pair means
+    are treated as the independent observations.
+    """
+    from statistics import NormalDist
+    
+    diff = (np.asarray(results[treatment][metric], dtype=float)
+            - np.asarray(results[baseline][metric], dtype=float))
+    if antithetic:
+        diff = diff.reshape(-1, 2).mean(axis=1)
+    n = len(diff)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * diff.std(ddof=1) / np.sqrt(n) if n > 1 else float('nan')
+    return {'Metric': metric, 'Baseline': baseline, 'Treatment': treatment,
+            'Mean_Difference': diff.mean(), 'CI_Half_Width': half_width,
+            'Relative_Change_%': diff.mean() / np.mean(results[baseline][metric]) * 100,
+            'Independent_Samples': n}
+
+# ============================================================================
+# PARAMETER SWEEP WITH CONTENT-ADDRESSED RESULT CACHE
+# ============================================================================
+
+def parse_precision_targets(targets):
+    """[(key, 'mean' or quantile, column, half_width)] from {'mean': 0.5, 'p95': 2.0, ...}"""
+    parsed = []
+    for key, half_width in targets.items():
+        if not half_width > 0:
+            raise ValueError(f"Precision target {key!r} needs a positive half-width, got {half_width}")
+        if key == 'mean' or key.startswith('mean:'):
+            column = key[5:] or 'total_latency_ms'
+            if column not in MOMENT_COLUMNS:
+                raise ValueError(f"No running mean is kept for column {column!r}")
+            parsed.append((key, 'mean', column, half_width))
+        elif key.startswith('p') and key[1:].replace('.', '', 1).isdigit() and 0 < float(key[1:]) < 100:
+            parsed.append((key, float(key[1:]) / 100, 'total_latency_ms', half_width))
+        else:
+            raise ValueError(f"Unknown precision target {key!r}; use 'mean', 'mean:<column>' or 'p<NN>'")
+    return parsed
+
+def precision_half_widths(mode_metrics, parsed_targets, z):
+    """Current CI half-width of every target for one streaming_stats.ModeMetrics"""
+    widths = {}
+    for key, statistic, column, _ in parsed_targets:
+        moments = mode_metrics.moments[column]
+        if statistic == 'mean':
+            widths[key] = z * moments.std() / np.sqrt(moments.count) if moments.count > 1 else np.inf
+            continue
+        # Distribution-free CI: ranks n*q +- z*sqrt(n*q*(1-q)) of the sorted sample
+        sketch = mode_metrics.latency_sketch
+        spread = z * np.sqrt(statistic * (1 - statistic) / sketch.count) if sketch.count else 1.0
+        lower = sketch.quantile(max(statistic - spread, 0.0))
+        upper = sketch.quantile(min(statistic + spread, 1.0))
+        # Plus the sketch's own relative error, which the rank interval cannot see
+        widths[key] = (upper - lower) / 2 + sketch.relative_accuracy * abs(sketch.quantile(statistic))
+    return widths
+
+def calculate_final_metrics(df, mode_name):
+    return {
+        'Mode': mode_name,
+        'Mean_Latency_ms': df['total_latency_ms'].mean(),
+        'Median_Latency_ms': df['total_latency_ms'].median(),
+        '95th_Percentile_ms': df['total_latency_ms'].quantile(0.95),
+        'Std_Latency_ms': df['total_latency_ms'].std(),
+        'Mean_Energy_mJ': df['energy_consumption_mj'].mean(),
+        'Std_Energy_mJ': df['energy_consumption_mj'].std(),
+        'Mean_SNR_dB': df['snr_db'].mean(),
+        'Std_SNR_dB': df['snr_db'].std(),
+        'Mean_Datarate_Mbps': df['datarate_mbps'].mean(),
+        'Success_Rate_%': df['packet_success'].mean() * 100,
+        'Bandwidth_KB': df['compressed_kb'].mean(),
+        'Compression_%': (1 - df['compressed_kb'].mean()/df['raw_data_kb'].mean())*100,
+        'IRS_Gain_dB': df['irs_gain_db'].mean(),
+        'Mean_Distance_m': df['distance_m'].mean(),
+        'Samples': len(df),
+    }
+
+def _code_fingerprint(code, digest):
+    # Bytecode and constants, recursing into nested functions/comprehensions
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_fingerprint(const, digest)
+        elif isinstance(const, frozenset):
+            # Set literals: repr order depends on string hash randomization
+            digest.update(repr(sorted(const, key=repr)).encode())
+        else:
+            digest.update(repr(const).encode())
+
+def _class_members(cls):
+    """(functions, simple attributes) of a class; decorators are unwrapped"""
+    functions, attributes = [], []
+    for name, member in sorted(vars(cls).items()):
+        if isinstance(member, (classmethod, staticmethod)):
+            member = member.__func__
+        if isinstance(member, property):
+            functions += [f for f in (member.fget, member.fset, member.fdel) if f is not None]
+        elif isinstance(member, types.FunctionType):
+            functions.append(member)
+        elif not name.startswith('__') and isinstance(member, (bool, int, float, str, tuple)):
+            attributes.append((name, member))
+    return functions, attributes
+
+# Modules whose code determines simulated results and the metrics computed from them
+MODEL_MODULES = ('components', 'compression', 'streaming_stats', 'simulation')
+
+def model_code_version():
+    """Hash of the model's code: any change to a component invalidates cached results
+    
+    Covers every function and class defined in MODEL_MODULES (methods,
+    classmethods, staticmethods, properties and plain class attributes) plus
+    the fixed model constants.
+    """
+    import importlib
+    
+    digest = hashlib.sha256()
+    for module_name in MODEL_MODULES:
+        module = importlib.import_module(f".{module_name}", __package__)
+        for name, obj in sorted(vars(module).items()):
+            if getattr(obj, '__module__', None) != module.__name__:
+                continue
+            if isinstance(obj, types.FunctionType):
+                functions, attributes = [obj], []
+            elif isinstance(obj, type):
+                functions, attributes = _class_members(obj)
+            else:
+                continue
+            digest.update(f"{module_name}.{name}".encode())
+            for f in functions:
+                _code_fingerprint(f.__code__, digest)
+            digest.update(repr(attributes).encode())
+    digest.update(json.dumps(model_constants(), sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+def expand_sweep(grid=None, configs=None):
+    """Cartesian product of a {param: values} grid, plus any explicit config dicts"""
+    points = list(configs or [])
+    if grid:
+        names = sorted(grid)
+        points += [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    return points
+
+def sweep_key(config, seed, run_settings, code_version, profile_digest=None):
+    payload = {'config': {**DEFAULT_CONFIG, **config}, 'seed': seed,
+               'run': run_settings, 'code_version': code_version}
+    if profile_digest is not None:
+        payload['compression_profile'] = profile_digest
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=float).encode()).hexdigest()
+
+def _sweep_profile(config, cache_dir, profiles):
+    """One measured compression profile per backend setting, kept in cache_dir"""
+    cfg = {**DEFAULT_CONFIG, **config}
+    if not cfg['compressor_backend']:
+        return None
+    setting = {key: cfg[key] for key in ('compressor_backend', 'compressor_profile_samples',
+                                         'compressor_workers')}
+    name = hashlib.sha256(json.dumps(setting, sort_keys=True).encode()).hexdigest()[:16]
+    if name not in profiles:
+        path = os.path.join(cache_dir, f"compression-{name}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                profiles[name] = CompressionProfile.from_dict(json.load(f))
+        else:
+            profiles[name] = measure_compression_profile(cfg)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(profiles[name].to_dict(), f)
+            os.replace(tmp_path, path)
+    return profiles[name]
+
+def run_sweep(grid=None, configs=None, seed=42, samples_per_mode=150, num_replications=1,
+              workers=1, vectorized=True, cache_dir='sweep_cache', variance_reduction=None,
+              precision_targets=None):
+    """Run every configuration of a sweep, reusing cached metrics where available
+    
+    Each finished point is written to cache_dir/<hash>.json, keyed by the full config,
+    seed, run settings and model code version, so overlapping sweeps only compute the
+    new points. Compressor backends are measured once per setting and the profile is
+    kept next to the points; its digest is part of their key. Returns one row per
+    (configuration, mode); with variance_reduction the rows also carry the paired
+    latency difference vs. raw and its 95% CI.
+    
+    With precision_targets (see run_until_precision) each point is simulated until
+    its own CI targets are met instead of for a fixed samples_per_mode; the rows
+    then report the samples each mode needed.
+    """
+    import pandas as pd
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    code_version = model_code_version()
+    run_settings = {'samples_per_mode': samples_per_mode, 'num_replications': num_replications,
+                    'vectorized': vectorized}
+    if variance_reduction is not None:
+        run_settings['variance_reduction'] = variance_reduction
+    if precision_targets is not None:
+        run_settings = {'precision_targets': dict(precision_targets)}
+    points = expand_sweep(grid, configs)
+    rows = []
+    computed = 0
+    profiles = {}
+    for config in points:
+        profile = _sweep_profile(config, cache_dir, profiles)
+        key = sweep_key(config, seed, run_settings, code_version,
+                        profile.digest() if profile is not None else None)
+        path = os.path.join(cache_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                metrics = json.load(f)['metrics']
+        else:
+            if precision_targets is not None:
+                sim = FinalOptimizedSimulation(seed=seed, config=config, compression_profile=profile)
+                accumulator = sim.run_until_precision(precision_targets, verbose=False)
+                metrics = [{**accumulator.final_metrics(row['Mode']),
+                            **{k: v for k, v in row.items() if k != 'Mode'}}
+                           for row in sim.last_precision_report]
+            else:
+                results = run_monte_carlo(num_replications, seed=seed, workers=workers,
+                                          samples_per_mode=samples_per_mode, vectorized=vectorized,
+                                          config=config, variance_reduction=variance_reduction,
+                                          compression_profile=profile)
+                metrics = [calculate_final_metrics(pd.DataFrame(results[mode]), mode)
+                           for mode in results]
+                if variance_reduction is not None:
+                    # Paired latency change vs. raw (pairs stay aligned across replications)
+                    for m in metrics:
+                        ci = paired_difference_ci(results, treatment=m['Mode'],
+                                                  antithetic=variance_reduction == 'antithetic')
+                        m['Paired_Latency_Diff_ms'] = ci['Mean_Difference']
+                        m['Paired_Latency_CI_ms'] = ci['CI_Half_Width']
+            metrics = [{k: (v if isinstance(v, (str, bool)) else float(v)) for k, v in m.items()}
+                       for m in metrics]
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'config': {**DEFAULT_CONFIG, **config}, 'seed': seed,
+                           'run': run_settings, 'code_version': code_version,
+                           'compression_profile': profile.digest() if profile is not None else None,
+                           'metrics': metrics}, f, indent=1)
+            os.replace(tmp_path, path)
+            computed += 1
+        for m in metrics:
+            rows.append({**DEFAULT_CONFIG, **config, **m, 'cache_key': key[:12]})
+    print(f"   Sweep: {len(points)} points, {computed} computed, {len(points) - computed} cached")
+    return pd.DataFrame(rows)
@@ -0,0 +1,256 @@
+"""
+STREAMING, MERGEABLE RESULT STATISTICS
+======================================
+Online replacement for calculate_final_metrics that never holds the samples:
+
+- RunningMoments: Welford/Chan mean and variance; merging is exact.
+- QuantileSketch: log-bucketed (DDSketch-style) quantile sketch. Every reported
+  quantile is within relative_accuracy (default 1%) of the true sample at that
+  rank, and merging two sketches is exact (bucket counts add), so per-worker
+  sketches combine without any extra error.
+- MetricsAccumulator: per-mode accumulators with the same sink interface as
+  results_store.ColumnarResultsSink (append/flush/chunk_rows).
+"""
+
+import copy
+import math
+import numpy as np
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations, updated per batch"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        n = len(values)
+        if n == 0:
+            return
+        batch_mean = values.mean()
+        batch_m2 = ((values - batch_mean) ** 2).sum()
+        self._combine(n, batch_mean, batch_m2)
+
+    def _combine(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+        return self
+
+    def std(self, ddof=1):
+        # ddof=1 matches pandas Series.std()
+        return math.sqrt(self.m2 / (self.count - ddof)) if self.count > ddof else float('nan')
+
+class _BucketStore:
+    """Dense bucket counts for a contiguous range of log indices"""
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, indices, counts=None):
+        if len(indices) == 0:
+            return
+        lo, hi = int(indices.min()), int(indices.max())
+        if len(self.counts) == 0:
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+        elif lo < self.offset or hi >= self.offset + len(self.counts):
+            new_offset = min(lo, self.offset)
+            grown = np.zeros(max(hi, self.offset + len(self.counts) - 1) - new_offset + 1,
+                             dtype=np.int64)
+            grown[self.offset - new_offset:self.offset - new_offset + len(self.counts)] = self.counts
+            self.offset, self.counts = new_offset, grown
+        self.counts += np.bincount(indices - self.offset, weights=counts,
+                                   minlength=len(self.counts)).astype(np.int64)
+
+    def merge(self, other):
+        if len(other.counts):
+            self.add(np.arange(other.offset, other.offset + len(other.counts)), other.counts)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+class QuantileSketch:
+    """Mergeable quantile sketch with a relative-error guarantee"""
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.positive = _BucketStore()
+        self.negative = _BucketStore()
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        pos = values > self.min_value
+        neg = values < -self.min_value
+        self.positive.add(self._index(values[pos]))
+        self.negative.add(self._index(-values[neg]))
+        self.zero_count += int(len(values) - pos.sum() - neg.sum())
+        self.count += len(values)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def buckets(self, upper=False):
+        """(values, counts) of the non-empty buckets in ascending order
+
+        Buckets are reported by their representative value, or with upper=True by
+        their upper bound, where the cumulative count is the exact empirical CDF.
+        """
+        neg_index = self.negative.offset + np.arange(len(self.negative.counts))[::-1]
+        pos_index = self.positive.offset + np.arange(len(self.positive.counts))
+        if upper:
+            values = np.concatenate([-self.gamma ** (neg_index - 1.0), [self.min_value],
+                                     self.gamma ** pos_index.astype(float)])
+        else:
+            values = np.concatenate([-self._value(neg_index), [0.0], self._value(pos_index)])
+        counts = np.concatenate([self.negative.counts[::-1], [self.zero_count],
+                                 self.positive.counts])
+        keep = counts > 0
+        return values[keep], counts[keep]
+
+    def bucket_bounds(self):
+        """(lower, upper, counts) of the non-empty buckets in ascending order
+
+        Every value counted in a bucket lies in [lower, upper]; positive bucket i
+        holds (gamma**(i-1), gamma**i], negatives mirror that, and the zero bucket
+        holds [-min_value, min_value].
+        """
+        neg_index = (self.negative.offset + np.arange(len(self.negative.counts))[::-1]).astype(float)
+        pos_index = (self.positive.offset + np.arange(len(self.positive.counts))).astype(float)
+        lower = np.concatenate([-self.gamma ** neg_index, [-self.min_value],
+                                np.maximum(self.gamma ** (pos_index - 1), self.min_value)])
+        upper = np.concatenate([np.minimum(-self.gamma ** (neg_index - 1), -self.min_value),
+                                [self.min_value], self.gamma ** pos_index])
+        counts = np.concatenate([self.negative.counts[::-1], [self.zero_count],
+                                 self.positive.counts])
+        keep = counts > 0
+        return lower[keep], upper[keep], counts[keep]
+
+    def nearest_bound(self, values):
+        """Closest bucket boundary (in log scale) to each value; no bucket straddles one"""
+        values = np.asarray(values, dtype=float)
+        magnitudes = np.abs(values)
+        outside = magnitudes > self.min_value
+        index = np.rint(np.log(np.where(outside, magnitudes, 1.0)) / self.log_gamma)
+        bound = np.where(outside, np.maximum(self.gamma ** index, self.min_value), self.min_value)
+        return np.where(values < 0, -bound, bound)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        # Negatives in ascending value order are descending bucket index
+        neg_cum = np.cumsum(self.negative.counts[::-1])
+        if len(neg_cum) and rank < neg_cum[-1]:
+            i = int(np.searchsorted(neg_cum, rank, side='right'))
+            return -self._value(self.negative.offset + len(self.negative.counts) - 1 - i)
+        rank -= neg_cum[-1] if len(neg_cum) else 0
+        if rank < self.zero_count:
+            return 0.0
+        rank -= self.zero_count
+        pos_cum = np.cumsum(self.positive.counts)
+        i = min(int(np.searchsorted(pos_cum, rank, side='right')), len(pos_cum) - 1)
+        return self._value(self.positive.offset + i)
+
+# Result column -> accumulated moments (mirrors calculate_final_metrics)
+MOMENT_COLUMNS = ['total_latency_ms', 'energy_consumption_mj', 'snr_db', 'datarate_mbps',
+                  'packet_success', 'compressed_kb', 'raw_data_kb', 'irs_gain_db', 'distance_m']
+
+class ModeMetrics:
+    """Streaming equivalent of calculate_final_metrics for one mode"""
+    def __init__(self, relative_accuracy=0.01):
+        self.moments = {col: RunningMoments() for col in MOMENT_COLUMNS}
+        self.latency_sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, columns):
+        for col, moments in self.moments.items():
+            moments.update(columns[col])
+        self.latency_sketch.update(columns['total_latency_ms'])
+
+    def merge(self, other):
+        for col, moments in self.moments.items():
+            moments.merge(other.moments[col])
+        self.latency_sketch.merge(other.latency_sketch)
+        return self
+
+    def final_metrics(self, mode_name):
+        m = self.moments
+        latency = self.latency_sketch
+        return {
+            'Mode': mode_name,
+            'Mean_Latency_ms': m['total_latency_ms'].mean,
+            'Median_Latency_ms': latency.quantile(0.5),
+            '95th_Percentile_ms': latency.quantile(0.95),
+            '99th_Percentile_ms': latency.quantile(0.99),
+            'Std_Latency_ms': m['total_latency_ms'].std(),
+            'Mean_Energy_mJ': m['energy_consumption_mj'].mean,
+            'Std_Energy_mJ': m['energy_consumption_mj'].std(),
+            'Mean_SNR_dB': m['snr_db'].mean,
+            'Std_SNR_dB': m['snr_db'].std(),
+            'Mean_Datarate_Mbps': m['datarate_mbps'].mean,
+            'Success_Rate_%': m['packet_success'].mean * 100,
+            'Bandwidth_KB': m['compressed_kb'].mean,
+            'Compression_%': (1 - m['compressed_kb'].mean/m['raw_data_kb'].mean)*100,
+            'IRS_Gain_dB': m['irs_gain_db'].mean,
+            'Mean_Distance_m': m['distance_m'].mean,
+            'Samples': m['total_latency_ms'].count,
+        }
+
+class MetricsAccumulator:
+    """Sink that folds result batches into per-(mode, config) ModeMetrics"""
+    def __init__(self, relative_accuracy=0.01, chunk_rows=65536):
+        self.relative_accuracy = relative_accuracy
+        self.chunk_rows = chunk_rows
+        self.metrics = {}
+
+    def append(self, columns, mode, config='default'):
+        if isinstance(columns, list):
+            columns = {col: [row[col] for row in columns] for col in MOMENT_COLUMNS}
+        key = (mode, str(config))
+        if key not in self.metrics:
+            self.metrics[key] = ModeMetrics(self.relative_accuracy)
+        self.metrics[key].update(columns)
+
+    def flush(self):
+        pass
+
+    def merge(self, other):
+        for key, metrics in other.metrics.items():
+            if key in self.metrics:
+                self.metrics[key].merge(metrics)
+            else:
+                self.metrics[key] = copy.deepcopy(metrics)
+        return self
+
+    def state(self):
+        return copy.deepcopy(self.metrics)
+
+    def restore(self, state):
+        self.metrics = copy.deepcopy(state)
+
+    def final_metrics(self, mode, mode_name=None, config='default'):
+        return self.metrics[(mode, str(config))].final_metrics(mode_name or mode)
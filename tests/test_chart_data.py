@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from semantirs.chart_data import ChartSummary, bucket_cdf, downsample_cdf, histogram_edges
+from semantirs.simulation import FinalOptimizedSimulation
+from semantirs.streaming_stats import QuantileSketch
+
+def known_sample():
+    # Body, a point mass, negatives and a far tail behind a 40 ms gap (like handovers)
+    rng = np.random.default_rng(0)
+    return np.concatenate([rng.lognormal(3, 0.3, 95000), np.full(10000, 17.2241596),
+                           rng.normal(-5, 1, 3000), 100 + rng.exponential(5, 5000)])
+
+def sketch_of(values, relative_accuracy=0.005):
+    sketch = QuantileSketch(relative_accuracy)
+    for chunk in np.array_split(values, 7):
+        sketch.update(chunk)
+    return sketch
+
+def exact_cdf(values, x):
+    return np.searchsorted(np.sort(values), x, side='right') / len(values)
+
+def test_bucket_cdf_is_exact_at_bucket_bounds():
+    values = known_sample()
+    x, cdf = bucket_cdf(sketch_of(values))
+    assert np.all(np.diff(x) > 0)
+    np.testing.assert_allclose(cdf, exact_cdf(values, x), atol=1e-12)
+
+@pytest.mark.parametrize('bins', [10, 60, 400])
+def test_histogram_edges_give_exact_bin_fractions(bins):
+    values = known_sample()
+    sketch = sketch_of(values)
+    edges = histogram_edges(sketch, (np.quantile(values, 0.001), np.quantile(values, 0.999)), bins)
+    x, cdf = bucket_cdf(sketch)
+    expected, _ = np.histogram(values, bins=edges)
+    np.testing.assert_allclose(np.diff(np.interp(edges, x, cdf)), expected / len(values), atol=1e-12)
+    # Snapping moves an edge by at most half a bucket
+    even = np.linspace(edges[0], edges[-1], bins + 1)
+    assert len(edges) <= bins + 1
+    if len(edges) == bins + 1:
+        np.testing.assert_allclose(edges, even, rtol=sketch.gamma - 1, atol=np.diff(even)[0])
+
+@pytest.mark.parametrize('max_error', [0.001, 0.005, 0.02])
+def test_downsampled_cdf_error_bounds(max_error):
+    values = known_sample()
+    sketch = sketch_of(values)
+    x, cdf = downsample_cdf(*bucket_cdf(sketch), max_error)
+    assert len(x) <= 4 / max_error + 2
+    # Vertically within max_error of the empirical CDF, up to one bucket sideways
+    grid = np.sort(np.concatenate([values[::37], np.linspace(values.min(), values.max(), 5000)]))
+    drawn = np.interp(grid, x, cdf)
+    slack = (sketch.gamma - 1) * np.abs(grid)
+    assert np.all(drawn <= exact_cdf(values, grid + slack) + max_error + 1e-12)
+    assert np.all(drawn >= exact_cdf(values, grid - slack) - max_error - 1e-12)
+    # Quantiles never land inside the gap between the body and the tail
+    q = np.linspace(0.001, 0.999, 999)
+    quantiles = np.interp(q, cdf, x)
+    assert not np.any((quantiles > values[values < 90].max() * sketch.gamma) &
+                      (quantiles < values[values > 90].min() / sketch.gamma))
+
+def test_chart_summary_histogram_matches_samples():
+    results = FinalOptimizedSimulation(seed=1).run_batch_scenario(20000)
+    summary = ChartSummary()
+    for mode, columns in results.items():
+        summary.update(columns, mode)
+    for mode, columns in results.items():
+        for column in ('snr_db', 'total_latency_ms', 'energy_consumption_mj'):
+            sketch = summary.sketches[mode][column]
+            edges = histogram_edges(sketch, (sketch.quantile(0.001), sketch.quantile(0.999)), 60)
+            centers, density = summary.histogram(mode, column, 60)
+            expected, _ = np.histogram(columns[column], bins=edges)
+            np.testing.assert_allclose(centers, (edges[:-1] + edges[1:]) / 2)
+            np.testing.assert_allclose(density * np.diff(edges), expected / len(columns[column]),
+                                       atol=1e-12)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from semantirs.simulation import FinalOptimizedSimulation, measure_compression_profile
+from semantirs.streaming_stats import MetricsAccumulator
+
+MODES = ('raw', 'semantic', 'semantic_irs')
+CONFIGS = {
+    'default': {},
+    'stateful': {'mac_mode': 'event', 'irs_mode': 'physical', 'irs_codebook_bins': [72, 32]},
+}
+
+class Interrupted(Exception):
+    pass
+
+def interrupt_after(sim, calls):
+    simulate = sim.simulate_transmission
+    count = [0]
+
+    def interrupting(*args, **kwargs):
+        count[0] += 1
+        if count[0] > calls:
+            raise Interrupted
+        return simulate(*args, **kwargs)
+
+    sim.simulate_transmission = interrupting
+    return count
+
+def resumed_run(tmp_path, config, interrupt_at, sink_factory=None):
+    checkpoint = str(tmp_path / 'run.ckpt')
+    sim = FinalOptimizedSimulation(seed=21, config=config)
+    interrupt_after(sim, interrupt_at)
+    with pytest.raises(Interrupted):
+        sim.run_full_scenario(40, verbose=False, sink=sink_factory and sink_factory(),
+                              checkpoint=checkpoint, checkpoint_every=7)
+    sim = FinalOptimizedSimulation(seed=21, config=config)
+    calls = interrupt_after(sim, np.inf)
+    results = sim.run_full_scenario(40, verbose=False, sink=sink_factory and sink_factory(),
+                                    checkpoint=checkpoint, checkpoint_every=7, resume=True)
+    # Picks up from the last checkpoint at or before the interruption
+    assert calls[0] == 3 * 40 - interrupt_at // 7 * 7
+    return results
+
+@pytest.mark.parametrize('config', sorted(CONFIGS))
+@pytest.mark.parametrize('interrupt_at', [5, 45, 100])
+def test_resume_matches_uninterrupted_run(tmp_path, config, interrupt_at):
+    expected = FinalOptimizedSimulation(seed=21, config=CONFIGS[config]).run_full_scenario(
+        40, verbose=False)
+    assert resumed_run(tmp_path, CONFIGS[config], interrupt_at) == expected
+    assert not (tmp_path / 'run.ckpt').exists()
+
+@pytest.mark.parametrize('interrupt_at', [5, 45, 100])
+def test_resume_with_sink_matches_uninterrupted_run(tmp_path, interrupt_at):
+    sink = lambda: MetricsAccumulator(chunk_rows=6)
+    expected = FinalOptimizedSimulation(seed=21).run_full_scenario(40, verbose=False, sink=sink())
+    resumed = resumed_run(tmp_path, {}, interrupt_at, sink)
+    for mode in MODES:
+        assert resumed.final_metrics(mode) == expected.final_metrics(mode)
+
+def test_resume_rejects_other_settings(tmp_path):
+    checkpoint = str(tmp_path / 'run.ckpt')
+    sim = FinalOptimizedSimulation(seed=21)
+    interrupt_after(sim, 10)
+    with pytest.raises(Interrupted):
+        sim.run_full_scenario(40, verbose=False, checkpoint=checkpoint, checkpoint_every=7)
+    with pytest.raises(ValueError):
+        FinalOptimizedSimulation(seed=21).run_full_scenario(30, verbose=False, checkpoint=checkpoint,
+                                                           resume=True)
+
+def test_resume_keeps_the_measured_compression_profile(tmp_path):
+    config = {'compressor_backend': 'zlib', 'compressor_profile_samples': 4}
+    checkpoint = str(tmp_path / 'run.ckpt')
+    profile = measure_compression_profile(config)
+    expected = FinalOptimizedSimulation(seed=21, config=config, compression_profile=profile
+                                        ).run_full_scenario(40, verbose=False)
+    sim = FinalOptimizedSimulation(seed=21, config=config, compression_profile=profile)
+    interrupt_after(sim, 45)
+    with pytest.raises(Interrupted):
+        sim.run_full_scenario(40, verbose=False, checkpoint=checkpoint, checkpoint_every=7)
+    # A fresh measurement is replaced by the one the interrupted run used
+    sim = FinalOptimizedSimulation(seed=21, config=config)
+    assert sim.run_full_scenario(40, verbose=False, checkpoint=checkpoint, checkpoint_every=7,
+                                 resume=True) == expected
+    assert sim.compressor.profile.digest() == profile.digest()
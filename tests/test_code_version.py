@@ -0,0 +1,34 @@
+import numpy as np
+
+from semantirs.components import (DopplerFading, RadioMap, RealisticChannel, TimeSteppedMobility,
+                                  VehicleFleet)
+from semantirs.compression import ZlibBackend
+from semantirs.simulation import model_code_version
+from semantirs.streaming_stats import QuantileSketch
+
+def test_editing_a_classmethod_changes_the_version(monkeypatch):
+    before = model_code_version()
+
+    def uniform_fleet(cls, num_vehicles, grid_size, rng, speed_range=(10, 18)):
+        return cls(np.zeros((num_vehicles, 2)), np.full(num_vehicles, speed_range[0]))
+
+    monkeypatch.setattr(VehicleFleet, 'random', classmethod(uniform_fleet))
+    assert model_code_version() != before
+    monkeypatch.undo()
+    assert model_code_version() == before
+
+def test_other_decorated_members_and_class_constants_are_covered(monkeypatch):
+    before = model_code_version()
+    edits = [
+        (TimeSteppedMobility, 'from_model', classmethod(lambda cls, model, **kwargs: None)),
+        (RadioMap, 'build_arrays', classmethod(lambda cls, *args, **kwargs: None)),
+        (RealisticChannel, 'path_loss_db', staticmethod(lambda distance_m: 0.0)),
+        (DopplerFading, 'coherence_time_s', property(lambda self: 0.0)),
+        (QuantileSketch, 'quantile', lambda self, q: 0.0),
+        (ZlibBackend, 'name', 'zlib2'),
+    ]
+    for cls, name, value in edits:
+        monkeypatch.setattr(cls, name, value)
+        assert model_code_version() != before, f"{cls.__name__}.{name}"
+        monkeypatch.undo()
+    assert model_code_version() == before
@@ -0,0 +1,51 @@
+import numpy as np
+
+from semantirs.compression import CompressionProfile
+from semantirs.simulation import (FinalOptimizedSimulation, measure_compression_profile,
+                                  run_monte_carlo, run_sweep, sweep_key)
+
+CONFIG = {'compressor_backend': 'zlib', 'compressor_profile_samples': 4}
+
+def test_same_seed_and_profile_give_the_same_trace():
+    profile = measure_compression_profile(CONFIG)
+    runs = [FinalOptimizedSimulation(seed=6, config=CONFIG, compression_profile=profile)
+            for _ in range(2)]
+    assert runs[0].run_full_scenario(20, verbose=False) == runs[1].run_full_scenario(20, verbose=False)
+    first, second = (sim.run_batch_scenario(200) for sim in runs)
+    for mode in first:
+        np.testing.assert_array_equal(first[mode]['total_latency_ms'], second[mode]['total_latency_ms'])
+
+def test_measuring_does_not_consume_the_simulation_rng():
+    measured = FinalOptimizedSimulation(seed=6, config=CONFIG)
+    passed = FinalOptimizedSimulation(seed=6, config=CONFIG,
+                                      compression_profile=measure_compression_profile(CONFIG))
+    assert measured.rng.bit_generator.state == passed.rng.bit_generator.state
+    assert measured.compressor.profile.raw_kb.tolist() == passed.compressor.profile.raw_kb.tolist()
+
+def test_profile_round_trips_with_its_digest():
+    profile = measure_compression_profile(CONFIG)
+    restored = CompressionProfile.from_dict(profile.to_dict())
+    assert restored.digest() == profile.digest()
+    assert restored.summary() == profile.summary()
+    assert measure_compression_profile({}) is None
+
+def test_monte_carlo_shares_one_profile_across_workers():
+    profile = measure_compression_profile(CONFIG)
+    serial, pooled = (run_monte_carlo(3, seed=2, workers=workers, samples_per_mode=20,
+                                      vectorized=True, config=CONFIG, compression_profile=profile)
+                      for workers in (1, 2))
+    for mode in serial:
+        np.testing.assert_array_equal(serial[mode]['total_latency_ms'],
+                                      pooled[mode]['total_latency_ms'])
+
+def test_sweep_key_and_cache_follow_the_profile(tmp_path):
+    first = run_sweep(configs=[CONFIG], samples_per_mode=20, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob('compression-*.json'))) == 1
+    # The kept profile is reused, so the point is served from the cache
+    second = run_sweep(configs=[CONFIG], samples_per_mode=20, cache_dir=str(tmp_path))
+    assert second['cache_key'].tolist() == first['cache_key'].tolist()
+    assert second['Mean_Latency_ms'].tolist() == first['Mean_Latency_ms'].tolist()
+    a, b = measure_compression_profile(CONFIG), measure_compression_profile(CONFIG)
+    b.times_ms = b.times_ms + 1
+    assert (sweep_key(CONFIG, 42, {}, 'v', a.digest()) != sweep_key(CONFIG, 42, {}, 'v', b.digest()))
+    assert sweep_key({}, 42, {}, 'v') == sweep_key({}, 42, {}, 'v', None)
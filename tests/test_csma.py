@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from semantirs.components import CSMACAChannel
+
+def poisson_trace(rate_hz, stations, duration_ms=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    n = rng.poisson(rate_hz * stations * duration_ms / 1000)
+    return np.sort(rng.random(n) * duration_ms), rng.integers(0, stations, n)
+
+def collision_probability(retries, dropped):
+    """Share of transmission attempts that collided"""
+    collided = retries.sum()
+    attempts = len(retries) + collided - dropped.sum()  # a dropped packet's last collision ends it
+    return collided / attempts
+
+def test_single_station_never_collides():
+    channel = CSMACAChannel(rng=np.random.default_rng(1))
+    arrival, stations = poisson_trace(50, 1)
+    delay, retries, dropped = channel.simulate(arrival, stations, 10.0, 80.0)
+    assert not retries.any() and not dropped.any()
+    tx_ms = 10 * 8 * 1024 / 80e3
+    # Queued behind its own earlier frames, a packet still waits at least DIFS + airtime
+    assert np.all(delay >= channel.difs_ms + tx_ms - 1e-9)
+    first = delay[0] - channel.difs_ms - tx_ms
+    assert 0 <= first <= (channel.cw_min - 1) * channel.slot_time_ms + 1e-9
+
+def test_collision_probability_rises_with_offered_load():
+    # 20 stations sending 10 KB frames at 80 Mbps (about 1 ms of airtime each),
+    # from light load up to about 75% channel occupancy
+    probabilities, delays = [], []
+    for rate_hz in [2, 5, 10, 20, 35]:
+        arrival, stations = poisson_trace(rate_hz, 20)
+        delay, retries, dropped = CSMACAChannel(rng=np.random.default_rng(1)).simulate(
+            arrival, stations, 10.0, 80.0)
+        probabilities.append(collision_probability(retries, dropped))
+        delays.append(delay.mean())
+    assert np.all(np.diff(probabilities) > 0)
+    assert np.all(np.diff(delays) > 0)
+    assert probabilities[0] < 0.01 < 0.05 < probabilities[-1]
+
+def test_saturated_collision_probability_rises_with_stations():
+    # Past saturation the load is set by the number of backlogged stations
+    probabilities = []
+    for stations in [2, 5, 10, 20, 40]:
+        arrival, ids = poisson_trace(2000 / stations, stations, duration_ms=5000)
+        _, retries, dropped = CSMACAChannel(rng=np.random.default_rng(1)).simulate(
+            arrival, ids, 10.0, 80.0)
+        probabilities.append(collision_probability(retries, dropped))
+    assert np.all(np.diff(probabilities) > 0)
+
+@pytest.mark.parametrize('cw_min', [7, 31])
+def test_two_saturated_stations_match_the_slot_collision_rate(cw_min):
+    # Without window doubling, each round a fresh counter uniform over cw_min slots
+    # lands on the other station's residual with probability p = 1/cw_min; a collided
+    # round costs two attempts, so 2p / (1 + p) = 2 / (cw_min + 1) of attempts collide
+    channel = CSMACAChannel(cw_min=cw_min, cw_max=cw_min, retry_limit=100,
+                            rng=np.random.default_rng(2))
+    arrival, ids = np.zeros(20000), np.arange(20000) % 2
+    _, retries, dropped = channel.simulate(arrival, ids, 10.0, 80.0)
+    assert not dropped.any()
+    assert collision_probability(retries, dropped) == pytest.approx(2 / (cw_min + 1), rel=0.06)
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from semantirs.emulation import emulate_offload
+from semantirs.simulation import FinalOptimizedSimulation
+
+@pytest.mark.parametrize('offload_mode, arrival_rate_hz', [('semantic_irs', None), ('semantic', 200.0),
+                                                           ('raw', None)])
+def test_loopback_latency_is_at_least_the_modelled_transmit_time(offload_mode, arrival_rate_hz):
+    sim = FinalOptimizedSimulation(seed=4)
+    trace, summary = emulate_offload(sim, offload_mode=offload_mode, n=30,
+                                     arrival_rate_hz=arrival_rate_hz, verbose=False)
+    measured = trace['measured_latency_ms']
+    assert summary['Packets'] == 30 and not np.isnan(measured).any()
+    # The payload is paced at the packet's datarate, so sending alone takes its airtime
+    payload_bytes = np.maximum(np.rint(trace['compressed_kb'] * 1024), 1)
+    airtime_ms = payload_bytes * 8 / (trace['datarate_mbps'] * 1e3)
+    modelled = (trace['compression_time_ms'] + trace['handover_delay_ms'] + trace['mac_delay_ms']
+                + trace['prop_delay_ms'] + airtime_ms + trace['processing_delay_ms'])
+    assert np.all(measured >= modelled - 1e-3)
+    np.testing.assert_allclose(modelled, trace['total_latency_ms'], atol=1e-3)
+    assert summary['Mean_Overhead_ms'] >= -1e-3
@@ -0,0 +1,60 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from semantirs.components import DopplerFading
+from semantirs.simulation import FinalOptimizedSimulation
+
+def bessel_j0(x):
+    theta = np.linspace(0, np.pi, 4001)
+    return np.trapezoid(np.cos(x * np.sin(theta)), theta) / np.pi
+
+@pytest.mark.parametrize('speed_mps', [5.0, 14.0, 30.0])
+def test_autocorrelation_follows_j0(speed_mps):
+    fading = DopplerFading(np.full(20000, speed_mps), rng=np.random.default_rng(1))
+    ids = np.arange(20000)
+    dt = fading.sample_interval_s
+    t0 = 1200.5 * dt
+    h0 = fading.gain(ids, t0)
+    assert np.mean(np.abs(h0) ** 2) == pytest.approx(1, abs=0.03)
+    for lag in (1, 2, 4, 8, 16, 40):
+        r = np.mean(h0 * np.conj(fading.gain(ids, t0 + lag * dt)))
+        assert r.real == pytest.approx(bessel_j0(2 * np.pi * fading.doppler_hz[0] * lag * dt), abs=0.03)
+        assert abs(r.imag) < 0.03
+
+def test_power_is_close_to_exponential():
+    fading = DopplerFading(np.full(50000, 14.0), rng=np.random.default_rng(2))
+    power = np.abs(fading.gain(np.arange(50000), 0.5)) ** 2
+    for x in (0.1, 0.5, 1.0, 2.0):
+        assert np.mean(power <= x) == pytest.approx(1 - np.exp(-x), abs=0.02)
+
+def test_queries_are_deterministic_and_order_free():
+    fading = DopplerFading(np.linspace(10, 18, 100), rng=np.random.default_rng(3))
+    ids = np.array([7, 3, 99, 7])
+    times = np.array([0.1, 2.0, 0.4, 0.1])
+    together = fading.fading_db(ids, times)
+    alone = [fading.fading_db([i], t)[0] for i, t in zip(ids, times)]
+    np.testing.assert_array_equal(together, alone)
+    assert together[0] == together[3]
+    assert np.all(together >= fading.clip_db)
+
+def test_memory_follows_queries_not_fleet_times_trace():
+    # Regression bound: the FFT-block version held ~2 GB for 10k vehicles
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    try:
+        fading = DopplerFading(rng.uniform(10, 18, 100000), rng=rng)
+        for tick in range(10):
+            fading.fading_db(rng.integers(0, 100000, 10000), 0.01 * tick)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert fading._cos_angle.dtype == np.float32
+    assert peak < 60e6
+
+def test_mobile_run_with_jakes_fading_is_seeded():
+    config = {'fading_model': 'jakes', 'num_vehicles': 200}
+    first, second = (FinalOptimizedSimulation(seed=4, config=config).run_mobile_scenario(duration_s=1)
+                     for _ in range(2))
+    np.testing.assert_array_equal(first['snr_db'], second['snr_db'])
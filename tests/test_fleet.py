@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from semantirs.components import (OptimizedMobilityModel, RSUDeployment, VehicleFleet,
+                                  VehicleType)
+
+def fleet():
+    return VehicleFleet([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]], [10.0, 12.0, 14.0],
+                        sensor_data_kb=[100.0, 200.0, 300.0])
+
+def test_vehicle_views_read_through_to_the_arrays():
+    vehicles = fleet()
+    view = vehicles[1]
+    assert view.position is not vehicles.positions
+    assert np.shares_memory(view.position, vehicles.positions)
+    assert (view.velocity, view.sensor_data_size, view.type) == (12.0, 200.0, VehicleType.CAV)
+    vehicles.velocities[1] = 20.0
+    vehicles.sensor_data_kb[1] = 50.0
+    vehicles.set_positions([[7.0, 8.0]], [1])
+    assert (view.velocity, view.sensor_data_size) == (20.0, 50.0)
+    assert view.position.tolist() == [7.0, 8.0]
+    assert [v.id for v in vehicles] == [0, 1, 2]
+    assert vehicles[-1].id == 2
+    with pytest.raises(IndexError):
+        vehicles[3]
+
+def test_vehicle_views_write_through_to_the_arrays():
+    vehicles = fleet()
+    view = vehicles[2]
+    position = view.position
+    view.position = [9.0, 9.5]
+    # The fleet array changed in place: earlier reads of it see the move
+    assert vehicles.positions[2].tolist() == position.tolist() == [9.0, 9.5]
+    assert vehicles.positions[:2].tolist() == [[0.0, 1.0], [2.0, 3.0]]
+    assert vehicles.version == 1
+    vehicles[0].position = np.array([1.5, 1.5])
+    assert vehicles.version == 2 and vehicles.positions[0].tolist() == [1.5, 1.5]
+
+def test_positions_only_change_through_set_positions():
+    vehicles = fleet()
+    with pytest.raises(ValueError):
+        vehicles.positions[0] = [5.0, 5.0]
+    with pytest.raises(ValueError):
+        vehicles[0].position[0] = 5.0
+    assert vehicles.version == 0 and vehicles.positions[0].tolist() == [0.0, 1.0]
+
+def test_rsu_moves_reach_views_and_invalidate_the_index():
+    model = OptimizedMobilityModel(num_vehicles=5, num_rsus=4, grid_size=(1000, 1000),
+                                   rng=np.random.default_rng(0))
+    view = model.rsus[3]
+    index = model.rsu_index
+    assert model.rsu_index is index
+    before = model.geometry_version
+    model.rsus.set_positions([[10.0, 10.0]], [3])
+    assert view.position.tolist() == [10.0, 10.0]
+    assert model.geometry_version != before
+    assert model.rsu_index is not index
+    assert model.nearest_rsu(np.array([0.0, 0.0]))[1][0] == 3
+    model.vehicles[0].position = [500.0, 500.0]
+    assert model.vehicle_positions[0].tolist() == [500.0, 500.0]
+    assert model.geometry_version == (1, 1)
+
+def test_rsu_views_follow_the_deployment_arrays():
+    deployment = RSUDeployment([[0.0, 0.0], [100.0, 0.0]], coverage_radius=[300.0, 250.0])
+    view = deployment[1]
+    deployment.coverage_radius[1] = 400.0
+    assert view.coverage_radius == 400.0
+    assert [rsu.id for rsu in deployment] == [0, 1]
+    with pytest.raises(ValueError):
+        view.position[0] = 1.0
+
+def test_fleet_arrays_are_owned_and_writable():
+    speeds = np.array([10.0, 12.0])
+    codes = np.zeros(2, dtype=np.uint8)
+    vehicles = VehicleFleet(np.zeros((2, 2)), speeds, type_codes=codes)
+    random = VehicleFleet.random(4, (100, 100), np.random.default_rng(0))
+    for store in (vehicles, random):
+        assert all(getattr(store, name).flags.writeable for name in VehicleFleet.FIELDS[1:])
+    vehicles.velocities[0] = 30.0
+    assert speeds[0] == 10.0 and not np.shares_memory(vehicles.type_codes, codes)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from semantirs.components import InterferenceField, RealisticChannel, RSUGridIndex
+
+class UnitFading:
+    """Stands in for the field's rng: every Rayleigh power draw is 1"""
+    def exponential(self, size=None):
+        return np.ones(size)
+    
+    def random(self, size=None):
+        return np.zeros(size)
+
+def field(rsu_positions, cutoff_radius_m=500.0, rsu_activity=0.0):
+    index = RSUGridIndex(np.asarray(rsu_positions, dtype=float))
+    interference = InterferenceField(index, RealisticChannel(rng=np.random.default_rng(0)),
+                                     cutoff_radius_m=cutoff_radius_m, rsu_activity=rsu_activity)
+    interference.rng = UnitFading()
+    return interference
+
+def received_mw(interference, distance_m, tx_power_dbm=23.0):
+    return 10 ** ((tx_power_dbm - interference.channel.path_loss_db(max(distance_m, 1.0))) / 10)
+
+def test_interference_is_zero_beyond_the_cutoff():
+    interference = field([[0, 0], [1000, 0], [1400, 0]])
+    # Served by RSU 1: RSU 2 is 450 m away, RSU 0 is 950 m away
+    result = interference.interference_mw(np.array([[950.0, 0.0]]), [1])
+    assert result[0] == 0.0 and result[1] == 0.0
+    assert result[2] == pytest.approx(received_mw(interference, 450.0), rel=1e-12)
+    assert interference.last_pairs == 1
+    # Every RSU out of reach of a vehicle other than its own: no interference at all
+    assert not interference.interference_mw(np.array([[10.0, 0.0]]), [0]).any()
+    assert interference.last_pairs == 0
+    assert not interference.sinr_penalty_db(np.zeros(3)).any()
+
+def test_interference_matches_brute_force_within_the_cutoff():
+    rng = np.random.default_rng(1)
+    # The last RSU stands apart from the vehicles
+    rsus = np.vstack([rng.random((30, 2)) * 3000, [[3500.0, 3500.0]]])
+    interference = field(rsus, cutoff_radius_m=200.0)
+    vehicles = rng.random((200, 2)) * 3000
+    serving = np.linalg.norm(vehicles[:, None] - rsus[None], axis=2).argmin(axis=1)
+    result = interference.interference_mw(vehicles, serving)
+    
+    expected = np.zeros(len(rsus))
+    for vehicle, own in zip(vehicles, serving):
+        for rsu, position in enumerate(rsus):
+            distance = np.linalg.norm(vehicle - position)
+            if rsu != own and distance <= 200.0:
+                expected[rsu] += received_mw(interference, distance)
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+    far = np.linalg.norm(vehicles[:, None] - rsus[None], axis=2).min(axis=0) > 200.0
+    assert far.any() and not result[far].any()
+
+def test_active_rsus_only_reach_rsus_within_the_cutoff():
+    interference = field([[0, 0], [300, 0], [900, 0]], rsu_activity=1.0)
+    result = interference.interference_mw(np.empty((0, 2)), np.empty(0, dtype=int))
+    np.testing.assert_allclose(result, [received_mw(interference, 300.0)] * 2 + [0.0])
+    assert interference.last_pairs == 2
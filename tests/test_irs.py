@@ -0,0 +1,79 @@
+import numpy as np
+
+from semantirs.components import CalibratedIRS
+
+def codebook_irs(seed=0):
+    irs = CalibratedIRS(mode='physical', codebook_bins=(72, 32), rng=np.random.default_rng(seed))
+    irs.codebook_audit_fraction = 1.0
+    return irs
+
+def test_codebook_audit_loss_is_never_negative():
+    irs = codebook_irs()
+    rng = np.random.default_rng(1)
+    rsu = np.array([500.0, 500.0])
+    for _ in range(20):
+        # One user per call, so each audited loss shows up on its own
+        before = irs.codebook_stats['gain_loss_db_sum']
+        irs.codebook_gains(rsu + rng.uniform(-250, 250, (1, 2)), rsu)
+        assert irs.codebook_stats['gain_loss_db_sum'] >= before
+    irs.codebook_gains(rsu + rng.uniform(-250, 250, (3000, 2)), rsu)
+    report = irs.codebook_report()
+    assert report['audited'] > 2500
+    assert 0 <= report['mean_gain_loss_db'] < 0.5
+
+def direct_and_cascaded(irs, vehicle_positions, rsu_position):
+    """Float64 channel coefficients: direct path (U,) and per-element cascades (U, N)"""
+    k = 2 * np.pi / irs.wavelength_m
+    rsu = np.array([*rsu_position, irs.rsu_height_m])
+    vehicles = np.column_stack([vehicle_positions, np.full(len(vehicle_positions), irs.vehicle_height_m)])
+    elements = irs.element_positions(rsu_position)
+    d_direct = np.linalg.norm(vehicles - rsu, axis=1)
+    d_irs_rsu = np.linalg.norm(elements - rsu, axis=1)
+    d_veh_irs = np.linalg.norm(vehicles[:, None] - elements[None], axis=2)
+    direct = np.exp(-1j * k * d_direct) / d_direct
+    cascaded = (np.sqrt(irs.beamforming_efficiency) * irs.wavelength_m / (4 * d_irs_rsu)
+                * np.exp(-1j * k * (d_veh_irs + d_irs_rsu)) / d_veh_irs)
+    return direct, cascaded
+
+def gain_db(direct, cascaded, phases):
+    return 20 * np.log10(np.abs(direct + (cascaded * np.exp(1j * phases)).sum(axis=1)) / np.abs(direct))
+
+def perfect_csi_irs(bits):
+    irs = CalibratedIRS(num_elements=256, mode='physical', rng=np.random.default_rng(0))
+    irs.channel_estimation_error_db = 0.0
+    irs.phase_quantization_bits = bits
+    return irs
+
+def test_phase_alignment_maximizes_the_cascaded_gain():
+    irs = perfect_csi_irs(bits=16)
+    rng = np.random.default_rng(2)
+    rsu = (800.0, 600.0)
+    vehicles = np.array(rsu) + rng.uniform(-100, 100, (50, 2))
+    gains, phases = irs.optimize_phases_physical(vehicles, rsu, return_phases=True)
+    direct, cascaded = direct_and_cascaded(irs, vehicles, rsu)
+    # The applied phases give the reported gain on an independently built channel
+    aligned = gain_db(direct, cascaded, phases)
+    np.testing.assert_allclose(aligned, gains, atol=1e-3)
+    assert gains.min() > 0.5
+    # Co-phasing reaches the triangle-inequality bound |h_d| + sum |h_n|
+    bound = 20 * np.log10(1 + np.abs(cascaded).sum(axis=1) / np.abs(direct))
+    np.testing.assert_allclose(gains, bound, atol=1e-3)
+    for _ in range(20):
+        assert np.all(gain_db(direct, cascaded, rng.uniform(0, 2 * np.pi, phases.shape)) < aligned)
+    # Detuning any one element lowers the gain
+    for n in range(0, 256, 17):
+        detuned = phases.copy()
+        detuned[:, n] += 0.5
+        assert np.all(gain_db(direct, cascaded, detuned) < aligned)
+
+def test_quantized_alignment_keeps_the_coherent_bound():
+    irs = perfect_csi_irs(bits=2)
+    rng = np.random.default_rng(3)
+    rsu = (0.0, 0.0)
+    vehicles = rng.uniform(-300, 300, (200, 2))
+    gains = irs.optimize_phases_physical(vehicles, rsu)
+    direct, cascaded = direct_and_cascaded(irs, vehicles, rsu)
+    # 2-bit phases leave each path within pi/4 of the direct one
+    relative = np.abs(cascaded).sum(axis=1) / np.abs(direct)
+    assert np.all(gains >= 20 * np.log10(1 + np.cos(np.pi / 4) * relative) - 1e-3)
+    assert np.all(gains <= 20 * np.log10(1 + relative) + 1e-3)
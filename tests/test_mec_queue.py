@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+import pytest
+
+from semantirs.components import EdgeLLMServer
+from semantirs.simulation import MEC_PROCESSING_MS, FinalOptimizedSimulation
+
+def erlang_c_wait_ms(arrival_rps, service_ms, servers):
+    offered = arrival_rps * service_ms / 1000
+    rho = offered / servers
+    tail = offered ** servers / math.factorial(servers) / (1 - rho)
+    waiting = tail / (sum(offered ** k / math.factorial(k) for k in range(servers)) + tail)
+    return waiting / (servers * 1000 / service_ms - arrival_rps) * 1000
+
+def poisson_arrivals_ms(rate_rps, n, seed):
+    return np.cumsum(np.random.default_rng(seed).exponential(1000 / rate_rps, n))
+
+@pytest.mark.parametrize('servers, utilization', [(1, 0.5), (2, 0.7), (4, 0.8)])
+def test_batch_size_one_matches_erlang_c(servers, utilization):
+    service_ms = 8.0
+    rate = utilization * servers * 1000 / service_ms
+    server = EdgeLLMServer(num_servers=servers, max_batch_size=1, max_wait_ms=0.0,
+                           processing_time_ms=service_ms, exponential_service=True,
+                           rng=np.random.default_rng(100 + servers))
+    queue_ms, service, _, _ = server.simulate(poisson_arrivals_ms(rate, 200000, servers))
+    assert queue_ms.mean() == pytest.approx(erlang_c_wait_ms(rate, service_ms, servers), rel=0.06)
+    assert service.mean() == pytest.approx(service_ms, rel=0.02)
+
+def test_deterministic_service_matches_pollaczek_khinchine():
+    service_ms, rate = 8.0, 75.0
+    rho = rate * service_ms / 1000
+    server = EdgeLLMServer(max_batch_size=1, max_wait_ms=0.0, processing_time_ms=service_ms)
+    queue_ms, _, _, _ = server.simulate(poisson_arrivals_ms(rate, 200000, 7))
+    assert queue_ms.mean() == pytest.approx(rho * service_ms / (2 * (1 - rho)), rel=0.05)
+
+def test_tail_batch_does_not_see_past_the_trace():
+    server = EdgeLLMServer(max_batch_size=8, max_wait_ms=2.0, processing_time_ms=3.0)
+    queue_ms, _, batch_size, _ = server.simulate([0.0, 0.5])
+    np.testing.assert_allclose(queue_ms, [2.0, 1.5])
+    np.testing.assert_array_equal(batch_size, [2, 2])
+    # A full batch still leaves as soon as it fills
+    queue_ms, _, _, _ = server.simulate(np.arange(8) * 0.1)
+    np.testing.assert_allclose(queue_ms, 0.7 - np.arange(8) * 0.1, atol=1e-12)
+
+def mobile_run(mec_mode, **config):
+    sim = FinalOptimizedSimulation(seed=5, config={'num_vehicles': 300, 'mec_mode': mec_mode,
+                                                   **config})
+    return sim, sim.run_mobile_scenario(duration_s=2, packet_rate_hz=20)
+
+def test_idle_queue_charges_the_mec_delay_once():
+    _, fixed = mobile_run('fixed')
+    _, queued = mobile_run('queue', mec_servers=1000, mec_max_batch=1, mec_max_wait_ms=0.0)
+    np.testing.assert_allclose(queued['processing_delay_ms'], MEC_PROCESSING_MS)
+    np.testing.assert_allclose(queued['total_latency_ms'], fixed['total_latency_ms'])
+
+def test_requests_join_the_queue_after_their_uplink(monkeypatch):
+    sim = FinalOptimizedSimulation(seed=5, config={'num_vehicles': 300, 'mec_mode': 'queue',
+                                                   'mac_mode': 'event'})
+    arrivals = []
+    simulate_servers = sim.compressor.simulate_servers
+
+    def recording(arrival_ms, server_ids):
+        arrivals.append(arrival_ms)
+        return simulate_servers(arrival_ms, server_ids)
+
+    monkeypatch.setattr(sim.compressor, 'simulate_servers', recording)
+    result = sim.run_mobile_scenario(duration_s=2, packet_rate_hz=20, tick_ms=10.0)
+    earliest_generation_ms = result['time_s'] * 1000 - 10.0
+    uplink_ms = result['compression_time_ms'] + result['mac_delay_ms'] + result['tx_delay_ms']
+    served = result['processing_delay_ms'] > 0
+    assert np.all(arrivals[0] >= (earliest_generation_ms + uplink_ms)[served])
+    assert np.all(result['processing_delay_ms'][served] >= MEC_PROCESSING_MS)
+    # Requests the MAC dropped never reach the server
+    assert sim.last_mec_report['Requests'].sum() == served.sum() < len(served)
+
+@pytest.mark.parametrize('run', [
+    lambda sim: sim.run_full_scenario(5, verbose=False),
+    lambda sim: sim.run_batch_scenario(5),
+    lambda sim: sim.simulate_batch(n=5),
+    lambda sim: sim.run_until_precision({'mean': 1.0}, verbose=False),
+])
+def test_static_runs_reject_the_mec_queue(run):
+    with pytest.raises(ValueError, match='run_mobile_scenario'):
+        run(FinalOptimizedSimulation(seed=1, config={'mec_mode': 'queue'}))
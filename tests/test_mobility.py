@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from semantirs.components import RSUGridIndex, TimeSteppedMobility
+
+def two_cell_road(x, hysteresis_m=20.0):
+    """One vehicle on the road y=0 between RSUs at x=0 and x=200, driving +x at 10 m/s"""
+    index = RSUGridIndex(np.array([[0.0, 0.0], [200.0, 0.0]]))
+    mobility = TimeSteppedMobility([[x, 0.0]], [10.0], index, grid_size=(1000, 1000),
+                                   turn_prob=0.0, handover_hysteresis_m=hysteresis_m,
+                                   rng=np.random.default_rng(1))
+    # Seed 1 puts the vehicle on an x road, so x is not snapped onto a cross street
+    assert mobility.positions[0, 0] == x and mobility.directions[0, 0] != 0
+    mobility.directions[:] = [[1.0, 0.0]]
+    return mobility
+
+def drive(mobility, ticks, dt_s=0.1):
+    """Serving RSU and handover flag after each tick"""
+    trace = []
+    for _ in range(ticks):
+        changed = mobility.step(dt_s)
+        trace.append((mobility.positions[0, 0], mobility.serving_rsu[0], len(changed)))
+    return trace
+
+@pytest.mark.parametrize('hysteresis_m', [0.0, 20.0, 60.0])
+def test_handover_happens_past_the_hysteresis_point(hysteresis_m):
+    mobility = two_cell_road(10.0, hysteresis_m)
+    trace = drive(mobility, 180)
+    # RSU 1 takes over once it is closer by more than the hysteresis: x - (200 - x) > h
+    switch = 100 + hysteresis_m / 2
+    for x, serving, _ in trace:
+        assert serving == (1 if x > switch + 1e-9 else 0)
+    assert sum(changed for _, _, changed in trace) == mobility.handover_count == 1
+    assert mobility.consume_handovers(np.array([0])).tolist() == [True]
+    assert mobility.consume_handovers(np.array([0])).tolist() == [False]
+
+def test_hysteresis_band_prevents_ping_pong():
+    mobility = two_cell_road(95.0)
+    for _ in range(10):
+        drive(mobility, 10)  # to x=105, still inside the 90-110 band
+        mobility.directions[:] = [[-1.0, 0.0]]
+        drive(mobility, 10)
+        mobility.directions[:] = [[1.0, 0.0]]
+    assert mobility.handover_count == 0
+    drive(mobility, 16)  # x=111: past the band
+    mobility.directions[:] = [[-1.0, 0.0]]
+    trace = drive(mobility, 30)
+    # Heading back, RSU 0 only returns once it is 20 m closer: x < 90
+    assert [serving for x, serving, _ in trace if x >= 90 - 1e-9] == [1] * 21
+    assert [serving for x, serving, _ in trace if x < 90 - 1e-9] == [0] * 9
+    assert mobility.handover_count == 2
+
+@pytest.mark.parametrize('movement', ['road_grid', 'random_waypoint'])
+def test_margin_skipping_matches_checking_every_vehicle_every_tick(movement):
+    rng = np.random.default_rng(3)
+    rsus = rng.random((40, 2)) * 2000
+    index = RSUGridIndex(rsus)
+    mobility = TimeSteppedMobility(rng.random((300, 2)) * 2000, rng.uniform(5, 30, 300), index,
+                                   movement=movement, rng=np.random.default_rng(4))
+    serving = mobility.serving_rsu.copy()
+    rows = np.arange(300)
+    for _ in range(300):
+        changed = mobility.step(0.1)
+        distances = np.linalg.norm(mobility.positions[:, None] - rsus[None], axis=2)
+        nearest = distances.argmin(axis=1)
+        switch = distances[rows, serving] - distances[rows, nearest] > mobility.handover_hysteresis_m
+        serving[switch] = nearest[switch]
+        np.testing.assert_array_equal(mobility.serving_rsu, serving)
+        np.testing.assert_array_equal(np.sort(changed), np.nonzero(switch)[0])
+    assert mobility.handover_count > 0
+    assert mobility.recheck_count < 300 * 300
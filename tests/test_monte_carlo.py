@@ -0,0 +1,51 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from semantirs.simulation import _run_replication, measure_compression_profile, run_monte_carlo
+
+MODES = ('raw', 'semantic', 'semantic_irs')
+
+def assert_results_equal(a, b):
+    assert a.keys() == b.keys()
+    for mode in a:
+        if isinstance(a[mode], dict):
+            assert a[mode].keys() == b[mode].keys()
+            for key in a[mode]:
+                np.testing.assert_array_equal(a[mode][key], b[mode][key], err_msg=f"{mode}.{key}")
+        else:
+            assert a[mode] == b[mode]
+
+def test_monte_carlo_is_seeded():
+    a = run_monte_carlo(3, seed=11, workers=1, samples_per_mode=20, vectorized=True)
+    b = run_monte_carlo(3, seed=11, workers=1, samples_per_mode=20, vectorized=True)
+    c = run_monte_carlo(3, seed=12, workers=1, samples_per_mode=20, vectorized=True)
+    assert_results_equal(a, b)
+    assert not np.array_equal(a['raw']['total_latency_ms'], c['raw']['total_latency_ms'])
+
+@pytest.mark.parametrize('vectorized', [True, False])
+def test_monte_carlo_bit_identical_across_worker_counts(vectorized):
+    serial = run_monte_carlo(4, seed=5, workers=1, samples_per_mode=15, vectorized=vectorized)
+    for workers in (2, 3):
+        assert_results_equal(serial, run_monte_carlo(4, seed=5, workers=workers, samples_per_mode=15,
+                                                     vectorized=vectorized))
+
+def test_summarized_monte_carlo_bit_identical_across_worker_counts():
+    serial = run_monte_carlo(4, seed=5, workers=1, samples_per_mode=50, vectorized=True,
+                             summarize=True)
+    pooled = run_monte_carlo(4, seed=5, workers=2, samples_per_mode=50, vectorized=True,
+                             summarize=True)
+    for mode in MODES:
+        assert serial.final_metrics(mode) == pooled.final_metrics(mode)
+
+def test_replication_worker_is_spawn_safe():
+    # A spawned worker starts from a fresh interpreter: the task alone must
+    # reproduce the replication
+    config = {'num_vehicles': 20, 'compressor_backend': 'zlib', 'compressor_profile_samples': 4}
+    task = (0, np.random.SeedSequence(9).spawn(1)[0], 10, True, config, False, None,
+            measure_compression_profile(config))
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        spawned = pool.submit(_run_replication, task).result()
+    assert_results_equal(_run_replication(task), spawned)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from semantirs.cli import _parse_targets
+from semantirs.simulation import FinalOptimizedSimulation
+
+class RecordingSink:
+    def __init__(self):
+        self.batches = {}
+
+    def append(self, columns, mode):
+        self.batches.setdefault(mode, []).append(columns['total_latency_ms'])
+
+    def flush(self):
+        pass
+
+def mean_half_width(latencies, z=1.959963984540054):
+    return z * np.std(latencies, ddof=1) / np.sqrt(len(latencies))
+
+def test_run_stops_once_the_half_width_is_reached():
+    sim = FinalOptimizedSimulation(seed=5)
+    sink = RecordingSink()
+    sim.run_until_precision({'mean': 1.5}, batch_size=200, sink=sink, verbose=False)
+    for row in sim.last_precision_report:
+        batches = sink.batches[row['Mode']]
+        assert row['Targets_Met'] and row['Samples'] == 200 * len(batches)
+        assert row['CI_mean'] <= 1.5
+        assert row['CI_mean'] == pytest.approx(mean_half_width(np.concatenate(batches)))
+        # One batch earlier the target was still open (or the two-batch minimum not reached)
+        if len(batches) > 2:
+            assert mean_half_width(np.concatenate(batches[:-1])) > 1.5
+    assert max(row['Samples'] for row in sim.last_precision_report) > 400
+
+def test_run_respects_max_samples_per_mode():
+    sim = FinalOptimizedSimulation(seed=5)
+    accumulator = sim.run_until_precision({'mean': 1e-6, 'p95': 1e-6}, batch_size=100,
+                                          max_samples_per_mode=300, verbose=False)
+    for row in sim.last_precision_report:
+        assert (row['Samples'], row['Targets_Met']) == (300, False)
+        assert accumulator.metrics[(row['Mode'], 'default')].latency_sketch.count == 300
+
+def test_parse_targets_accepts_stat_half_width_pairs():
+    assert _parse_targets(['mean=0.5', 'p95=2', 'mean:energy_consumption_mj=0.1']) == {
+        'mean': 0.5, 'p95': 2.0, 'mean:energy_consumption_mj': 0.1}
+    assert _parse_targets(None) == {}
+
+@pytest.mark.parametrize('pair', ['p95', 'p95=', 'p95=abc', '=2', 'median=1', 'p100=1', 'p95=0',
+                                  'mean=-1', 'mean=nan', 'mean:no_such_column=1'])
+def test_parse_targets_rejects_malformed_targets(pair):
+    with pytest.raises(SystemExit, match='--target'):
+        _parse_targets([pair])
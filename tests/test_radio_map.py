@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from semantirs.components import RadioMap, RealisticChannel, RSUGridIndex
+
+GRID = (1000, 600)
+
+def deployment(seed=0, num_rsus=12):
+    rng = np.random.default_rng(seed)
+    return RSUGridIndex(rng.random((num_rsus, 2)) * GRID), RealisticChannel(rng=rng)
+
+def cell_centers(resolution_m, rng, n=2000):
+    ny, nx = RadioMap.grid_shape(GRID, resolution_m)
+    return (np.column_stack([rng.integers(0, nx, n), rng.integers(0, ny, n)]) + 0.5) * resolution_m
+
+@pytest.mark.parametrize('resolution_m', [5.0, 7.0])
+def test_memmap_map_equals_direct_path_loss_at_cell_centers(tmp_path, resolution_m):
+    index, channel = deployment()
+    radio_map = RadioMap.load_or_build(index, GRID, resolution_m, channel, cache_dir=str(tmp_path))
+    assert all(isinstance(getattr(radio_map, name), np.memmap) for name in RadioMap.FILES)
+    
+    points = cell_centers(resolution_m, np.random.default_rng(1))
+    distances = np.linalg.norm(points[:, None] - index.positions[None], axis=2)
+    nearest = distances.min(axis=1)
+    clipped = np.minimum(distances, 250)
+    
+    best_d, best_rsu, best_loss = radio_map.best_server(points)
+    np.testing.assert_allclose(best_d, np.minimum(nearest, 250), rtol=1e-6)
+    np.testing.assert_allclose(distances[np.arange(len(points)), best_rsu], nearest, rtol=1e-9)
+    np.testing.assert_allclose(best_loss, channel.path_loss_db(np.minimum(nearest, 250)), atol=1e-4)
+    for rsu in range(len(index.positions)):
+        np.testing.assert_allclose(radio_map.path_loss(points, np.full(len(points), rsu)),
+                                   channel.path_loss_db(clipped[:, rsu]), atol=1e-4)
+
+def test_off_center_lookups_stay_within_half_a_cell_diagonal(tmp_path):
+    index, channel = deployment()
+    radio_map = RadioMap.load_or_build(index, GRID, 5.0, channel, cache_dir=str(tmp_path))
+    points = np.random.default_rng(2).random((5000, 2)) * GRID
+    exact = np.linalg.norm(points[:, None] - index.positions[None], axis=2).min(axis=1)
+    best_d, _, _ = radio_map.best_server(points)
+    near = exact < 250 - 5.0
+    assert np.all(np.abs(best_d[near] - exact[near]) <= 5.0 / np.sqrt(2) + 1e-4)
+
+def test_cached_map_is_reused_and_keyed_on_its_inputs(tmp_path, monkeypatch):
+    index, channel = deployment()
+    built = RadioMap.load_or_build(index, GRID, 5.0, channel, cache_dir=str(tmp_path))
+    
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("cached map was rebuilt")
+    
+    monkeypatch.setattr(RadioMap, 'build_arrays', no_rebuild)
+    reused = RadioMap.load_or_build(index, GRID, 5.0, channel, cache_dir=str(tmp_path))
+    assert reused.path == built.path
+    np.testing.assert_array_equal(reused.path_loss_db, built.path_loss_db)
+    moved, _ = deployment(seed=1)
+    assert RadioMap.cache_key(index.positions, GRID, 10.0, channel) != built.key
+    assert RadioMap.cache_key(moved.positions, GRID, 5.0, channel) != built.key
+    assert RadioMap.cache_key(index.positions, (1000, 700), 5.0, channel) != built.key
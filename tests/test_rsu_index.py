@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from semantirs.components import RSUGridIndex
+from semantirs.simulation import FinalOptimizedSimulation
+
+LAYOUTS = {
+    'uniform': lambda rng, n: rng.random((n, 2)) * 2000,
+    'collinear_x': lambda rng, n: np.column_stack([rng.random(n) * 2000, np.full(n, 5.0)]),
+    'collinear_y': lambda rng, n: np.column_stack([np.full(n, 3.0), rng.random(n) * 1e4]),
+    'stacked': lambda rng, n: np.round(rng.random((n, 2)) * 4) * 500,
+}
+
+def brute_force(rsus, points, k):
+    full = np.linalg.norm(points[:, None] - rsus[None], axis=2)
+    return full, np.sort(full, axis=1)[:, :min(k, len(rsus))]
+
+@pytest.mark.parametrize('layout', sorted(LAYOUTS))
+def test_nearest_matches_brute_force(layout):
+    rng = np.random.default_rng(0)
+    for trial in range(20):
+        rsus = LAYOUTS[layout](rng, int(rng.integers(1, 60)))
+        index = RSUGridIndex(rsus)
+        points = rng.uniform(-5e4, 5e4, (100, 2)) if trial % 2 else rng.random((100, 2)) * 2000
+        k = int(rng.integers(1, 5))
+        full, expected = brute_force(rsus, points, k)
+        d, ids = index.nearest_batch(points, k)
+        np.testing.assert_allclose(d, expected)
+        np.testing.assert_allclose(np.take_along_axis(full, ids, 1), d)
+        for j in range(0, len(points), 17):
+            ds, ids_j = index.nearest(points[j], k)
+            np.testing.assert_allclose(ds, d[j])
+            np.testing.assert_array_equal(ids_j, ids[j])
+        indptr, within_ids, _ = index.within_batch(points, 700.0)
+        for j in range(0, len(points), 13):
+            assert (set(within_ids[indptr[j]:indptr[j + 1]]) ==
+                    set(np.nonzero(full[j] <= 700.0)[0]))
+
+def test_far_queries_against_collinear_rsus_stay_local():
+    # 2000 RSUs on one line at 1 m cells, queried from 1000 km away: only the
+    # cells next to each query's column may be visited
+    rsus = np.column_stack([np.arange(2000.0), np.zeros(2000)])
+    index = RSUGridIndex(rsus)
+    points = np.column_stack([np.random.default_rng(1).random(5000) * 2000, np.full(5000, 1e6)])
+    visited = []
+    candidates = index._candidates
+
+    def counting_candidates(*args):
+        pairs = candidates(*args)
+        visited.append(len(pairs[0]))
+        return pairs
+
+    index._candidates = counting_candidates
+    d, _ = index.nearest_batch(points, 3)
+    assert sum(visited) < 50 * len(points)
+    _, expected = brute_force(rsus, points[:200], 3)
+    np.testing.assert_allclose(d[:200], expected)
+
+def test_grid_size_and_index_cell_from_config():
+    sim = FinalOptimizedSimulation(seed=1, config={'grid_size': [8000, 500], 'rsu_index_cell_m': 50.0})
+    assert sim.mobility.rsu_index.cell_size == 50.0
+    positions = sim.mobility.vehicle_positions
+    assert positions[:, 0].max() > 2000 and positions[:, 1].max() <= 500
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from semantirs.simulation import FinalOptimizedSimulation
+
+def assert_columns_equal(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        np.testing.assert_array_equal(a[key], b[key], err_msg=key)
+
+def test_simulate_batch_is_seeded():
+    a = FinalOptimizedSimulation(seed=7).simulate_batch(n=500, offload_mode='semantic_irs')
+    b = FinalOptimizedSimulation(seed=7).simulate_batch(n=500, offload_mode='semantic_irs')
+    assert_columns_equal(a, b)
+
+def test_simulate_batch_follows_moved_vehicles():
+    sim = FinalOptimizedSimulation(seed=3)
+    ids = np.arange(len(sim.mobility.vehicles))
+    sim.simulate_batch(ids, offload_mode='raw')
+    # Put vehicle i 5 m off RSU i+1
+    target = sim.mobility.rsu_positions[(ids + 1) % len(sim.mobility.rsus)] + 5.0
+    sim.mobility.vehicles.set_positions(target)
+    moved = sim.simulate_batch(ids, offload_mode='raw')
+    d, _ = sim.mobility.rsu_index.nearest_batch(target)
+    np.testing.assert_allclose(moved['distance_m'], np.minimum(d[:, 0], 250))
+
+def test_simulate_batch_follows_moved_rsus():
+    sim = FinalOptimizedSimulation(seed=3)
+    ids = np.arange(len(sim.mobility.vehicles))
+    before = sim.simulate_batch(ids, offload_mode='raw')['distance_m']
+    # RSU i moves to 1 m from vehicle i
+    sim.mobility.rsus.set_positions(sim.mobility.vehicle_positions[:len(sim.mobility.rsus)] + (1.0, 0.0))
+    after = sim.simulate_batch(ids, offload_mode='raw')['distance_m']
+    np.testing.assert_allclose(after[:len(sim.mobility.rsus)], 1.0)
+    assert not np.array_equal(before, after)
+
+def test_fleet_positions_are_read_only():
+    sim = FinalOptimizedSimulation(seed=3)
+    with pytest.raises(ValueError):
+        sim.mobility.vehicle_positions[0] = (0.0, 0.0)
+    sim.mobility.vehicles[0].position = (1.0, 2.0)
+    np.testing.assert_array_equal(sim.mobility.vehicle_positions[0], (1.0, 2.0))
+    assert sim.mobility.vehicles.version == 1
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from semantirs.streaming_stats import RunningMoments, QuantileSketch
+
+QUANTILES = np.concatenate([[0.0, 0.001, 0.01], np.linspace(0.05, 0.95, 19), [0.99, 0.999, 1.0]])
+
+def mixed_sample(seed, n=20000):
+    rng = np.random.default_rng(seed)
+    return np.concatenate([rng.lognormal(3, 1.0, n), -rng.lognormal(0, 2.0, n // 4),
+                           np.zeros(n // 20), rng.pareto(1.5, n // 10) * 1e4])
+
+def sketch_of(chunks, relative_accuracy):
+    sketch = QuantileSketch(relative_accuracy)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch
+
+def state(sketch):
+    return (sketch.count, sketch.zero_count,
+            sketch.positive.offset, sketch.positive.counts.tolist(),
+            sketch.negative.offset, sketch.negative.counts.tolist())
+
+@pytest.mark.parametrize('relative_accuracy', [0.001, 0.01, 0.05])
+def test_quantiles_are_within_the_relative_accuracy(relative_accuracy):
+    values = mixed_sample(0)
+    sketch = sketch_of(np.array_split(np.random.default_rng(1).permutation(values), 9),
+                       relative_accuracy)
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        exact = ordered[int(np.floor(q * (len(values) - 1)))]
+        assert abs(sketch.quantile(q) - exact) <= relative_accuracy * abs(exact) * (1 + 1e-12)
+
+def test_merge_is_associative_and_exact():
+    a, b, c = (mixed_sample(seed, n) for seed, n in [(2, 5000), (3, 20000), (4, 700)])
+    left = sketch_of([a], 0.01).merge(sketch_of([b], 0.01)).merge(sketch_of([c], 0.01))
+    right = sketch_of([a], 0.01).merge(sketch_of([b], 0.01).merge(sketch_of([c], 0.01)))
+    swapped = sketch_of([c], 0.01).merge(sketch_of([a], 0.01)).merge(sketch_of([b], 0.01))
+    whole = sketch_of([np.concatenate([a, b, c])], 0.01)
+    assert state(left) == state(right) == state(swapped) == state(whole)
+    assert [left.quantile(q) for q in QUANTILES] == [whole.quantile(q) for q in QUANTILES]
+
+def test_merge_rejects_a_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+def test_running_moments_merge_in_any_grouping():
+    values = mixed_sample(5)
+    parts = np.array_split(values, 5)
+    def moments(chunks):
+        result = RunningMoments()
+        for chunk in chunks:
+            result.update(chunk)
+        return result
+    left = moments(parts[:2]).merge(moments(parts[2:4])).merge(moments(parts[4:]))
+    right = moments(parts[:1]).merge(moments(parts[1:3]).merge(moments(parts[3:])))
+    for merged in (left, right):
+        assert merged.count == len(values)
+        assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert merged.std() == pytest.approx(values.std(ddof=1), rel=1e-10)
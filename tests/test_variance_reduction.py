@@ -0,0 +1,60 @@
+import numpy as np
+
+from semantirs.compression import CompressionProfile
+from semantirs.simulation import FinalOptimizedSimulation, paired_difference_ci, run_monte_carlo
+
+SCENARIO_COLUMNS = ('vehicle_id', 'raw_data_kb', 'distance_m', 'prop_delay_ms', 'handover_delay_ms')
+
+def test_crn_pairs_share_scenarios():
+    results = FinalOptimizedSimulation(seed=3).run_batch_scenario(500, variance_reduction='crn')
+    for mode in ('semantic', 'semantic_irs'):
+        for key in SCENARIO_COLUMNS:
+            np.testing.assert_array_equal(results[mode][key], results['raw'][key], err_msg=key)
+    # Without IRS the two modes see the same channel draws
+    np.testing.assert_array_equal(results['semantic']['snr_db'], results['raw']['snr_db'])
+
+def test_antithetic_pairs_share_vehicles():
+    results = FinalOptimizedSimulation(seed=3).run_batch_scenario(500, variance_reduction='antithetic')
+    vehicles = results['raw']['vehicle_id']
+    np.testing.assert_array_equal(vehicles[0::2], vehicles[1::2])
+    ci = paired_difference_ci(results, antithetic=True)
+    assert ci['Independent_Samples'] == 250
+
+def test_crn_narrows_the_difference_interval():
+    paired = FinalOptimizedSimulation(seed=4).run_batch_scenario(4000, variance_reduction='crn')
+    independent = FinalOptimizedSimulation(seed=4).run_batch_scenario(4000)
+    assert (paired_difference_ci(paired)['CI_Half_Width'] <
+            paired_difference_ci(independent)['CI_Half_Width'])
+
+def test_crn_monte_carlo_keeps_pairs_across_workers():
+    serial = run_monte_carlo(3, seed=8, workers=1, samples_per_mode=30, vectorized=True,
+                             variance_reduction='crn')
+    pooled = run_monte_carlo(3, seed=8, workers=2, samples_per_mode=30, vectorized=True,
+                             variance_reduction='crn')
+    for mode in serial:
+        np.testing.assert_array_equal(pooled[mode]['vehicle_id'], serial['raw']['vehicle_id'])
+        np.testing.assert_array_equal(pooled[mode]['total_latency_ms'],
+                                      serial[mode]['total_latency_ms'])
+
+def measured_config():
+    # Ratios and times 0..31 make a mirrored profile draw k -> 31-k visible
+    profile = CompressionProfile('zlib', np.full(32, 1000.0), np.arange(32) / 100, np.arange(32.0))
+    return {'compressor_backend': 'zlib'}, profile
+
+def test_crn_shares_compressor_draws():
+    config, profile = measured_config()
+    results = FinalOptimizedSimulation(seed=3, config=config, compression_profile=profile
+                                       ).run_batch_scenario(500, variance_reduction='crn')
+    for key in ('compressed_kb', 'compression_time_ms'):
+        assert np.unique(results['semantic'][key]).size > 1
+        np.testing.assert_array_equal(results['semantic'][key], results['semantic_irs'][key])
+
+def test_antithetic_mirrors_compressor_draws():
+    config, profile = measured_config()
+    results = FinalOptimizedSimulation(seed=3, config=config, compression_profile=profile
+                                       ).run_batch_scenario(500, variance_reduction='antithetic')
+    for mode in ('semantic', 'semantic_irs'):
+        time_ms = results[mode]['compression_time_ms']
+        np.testing.assert_allclose(time_ms[0::2] + time_ms[1::2], 31.0)
+    np.testing.assert_array_equal(results['semantic']['compressed_kb'],
+                                  results['semantic_irs']['compressed_kb'])